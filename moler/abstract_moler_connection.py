@@ -29,9 +29,21 @@ def identity_transformation(data):
     return data
 
 
+def _encode_sent_data(data):
+    return data.encode('utf-8')
+
+
+def _encode_received_data(data):
+    return data.encode(encoding='utf-8', errors="replace")
+
+
 class AbstractMolerConnection(object):
     """Connection API required by ConnectionObservers."""
 
+    # Logging metadata of data path - created once, not for every chunk of data.
+    _sent_data_log_extra = {'transfer_direction': '>', 'encoder': _encode_sent_data}
+    _received_data_log_extra = {'transfer_direction': '<', 'encoder': _encode_received_data}
+
     def __init__(self, how2send=None, encoder=identity_transformation, decoder=identity_transformation,
                  name=None, newline='\n', logger_name=""):
         """
@@ -131,8 +143,7 @@ class AbstractMolerConnection(object):
             length = len(data)
             msg = "*" * length
 
-        self._log_data(msg=msg, level=logging.INFO,
-                       extra={'transfer_direction': '>', 'encoder': lambda data: data.encode('utf-8')})
+        self._log_data(msg=msg, level=logging.INFO, extra=self._sent_data_log_extra)
         self._log(level=logging.INFO,
                   msg=AbstractMolerConnection._strip_data(msg),
                   extra={
@@ -142,8 +153,7 @@ class AbstractMolerConnection(object):
                   levels_to_go_up=levels_to_go_up)
 
         encoded_msg = self.encode(msg)
-        self._log_data(msg=encoded_msg, level=RAW_DATA,
-                       extra={'transfer_direction': '>', 'encoder': lambda data: data.encode('utf-8')})
+        self._log_data(msg=encoded_msg, level=RAW_DATA, extra=self._sent_data_log_extra)
 
         encoded_data = self.encode(data)
         self.how2send(encoded_data)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Event awaiter for asyncio code (Python 3 only)
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import asyncio
+
+from moler.event_awaiter import EventAwaiter
+
+
+class AsyncioEventAwaiter(object):
+
+    @staticmethod
+    async def wait_for_all(timeout, events):
+        """
+        Wait for all events are done or timeout occurs. Doesn't block events loop.
+        :param timeout: time in seconds
+        :param events: list of events to check
+        :return: True if all events are done, False otherwise
+        """
+        return await AsyncioEventAwaiter._wait_for(timeout=timeout, events=events, all_needed=True)
+
+    @staticmethod
+    async def wait_for_any(timeout, events):
+        """
+        Wait for any event is done or timeout occurs. Doesn't block events loop.
+        :param timeout: time in seconds
+        :param events: list of events to check
+        :return: True if any event is done, False otherwise
+        """
+        return await AsyncioEventAwaiter._wait_for(timeout=timeout, events=events, all_needed=False)
+
+    @staticmethod
+    async def _wait_for(timeout, events, all_needed):
+        """
+        Wait till events are done. Done callbacks of events (called from any thread) wake up awaiting coroutine.
+
+        :param timeout: time in seconds
+        :param events: list of events to check
+        :param all_needed: True if all events have to be done, False if any
+        :return: True if all (or any) events are done, False otherwise
+        """
+        if EventAwaiter.is_decided(events, all_needed):
+            return True
+        loop = asyncio.get_event_loop()
+        decided = loop.create_future()
+
+        def _set_decided():
+            if not decided.done():
+                decided.set_result(True)
+
+        def _event_done(event):
+            if EventAwaiter.is_decided(events, all_needed):
+                loop.call_soon_threadsafe(_set_decided)
+
+        for event in events:
+            event.add_done_callback(_event_done)
+        try:
+            await asyncio.wait_for(decided, timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for event in events:
+                event.remove_done_callback(_event_done)
+        return EventAwaiter.is_decided(events, all_needed)
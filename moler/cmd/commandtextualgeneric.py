@@ -8,6 +8,7 @@ __copyright__ = 'Copyright (C) 2018-2020, Nokia'
 __email__ = 'marcin.usielski@nokia.com, michal.ernst@nokia.com'
 
 import abc
+import collections
 import logging
 import re
 
@@ -15,8 +16,15 @@ import six
 
 from moler.cmd import RegexHelper
 from moler.command import Command
+from moler.exceptions import WrongUsage
+from moler.util.line_splitter import split_into_lines
 from threading import Lock
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # For python 2
+
 r_default_prompt = r'^[^<]*[$%#>~]\s*$'  # When user provides no prompt
 
 
@@ -76,9 +84,115 @@ class CommandTextualGeneric(Command):
         self.break_exec_only_full_line = True  # Set True to consider only full lines to match _break_exec_regex or
         # False to consider also chunks.
 
+        self._streaming = False  # If True then records are passed to callback/iterator and not all are stored.
+        # Do not set directly, use enable_streaming.
+        self._stream_callback = None  # Callable called with every record in streaming mode.
+        self._stream_keep_last = None  # Number of recent records kept in every container of current_ret.
+        self._stream_queue = None  # Queue of records for iterator returned by records().
+        self._stream_keys = dict()  # id of dict container -> deque of keys of records stored in it.
+        self._min_records_kept = 0  # Command may need some last records to parse next lines.
+        self._pending_record = None  # Record (or (key, record)) stored but not published yet - next lines may
+        # complete it.
+        self.streamed_records = 0  # Number of records parsed in streaming mode.
+
         if not self._newline_chars:
             self._newline_chars = CommandTextualGeneric._default_newline_chars
 
+    def enable_streaming(self, callback=None, keep_last=0, iterable=False):
+        """
+        Switch command into streaming mode. Records parsed by command are passed to callback and/or iterator (see
+        records()) as they arrive. Only keep_last recent records are stored in result so memory used by long-running
+        command (like tcpdump or cat of big file) doesn't grow. Call before command is started.
+
+        :param callback: callable taking one parameter - record parsed from output (or tuple (key, record) if command
+         stores records in dict, like packets of tcpdump). None if not used.
+        :param keep_last: number of recent records kept in every container of result. None to keep all records.
+        :param iterable: True if records will be taken by iterator returned by records().
+        :return: None
+        """
+        self._streaming = True
+        self._stream_callback = callback
+        self._stream_keep_last = keep_last
+        if iterable:
+            self._stream_queue = queue.Queue()
+
+    def records(self, poll_period=0.1):
+        """
+        Iterator over records parsed by command in streaming mode. Iteration ends when command is done and all
+        records are taken. Records are buffered till taken so iterate while command is running. Records stored by
+        command in dict are given as tuples (key, record).
+
+        :param poll_period: how often (in seconds) iterator checks if command is done.
+        :return: generator of records.
+        """
+        if self._stream_queue is None:
+            raise WrongUsage("Call enable_streaming(iterable=True) for '{}' before command starts.".format(self))
+        while True:
+            try:
+                yield self._stream_queue.get(timeout=poll_period)
+            except queue.Empty:
+                if self.done() and self._stream_queue.empty():
+                    return
+
+    def _add_record(self, container, record, key=None, complete=True):
+        """
+        Adds record parsed from output to container from current_ret. In streaming mode record is passed to
+        callback/iterator and container keeps only recent records.
+
+        :param container: list or dict from current_ret.
+        :param record: record parsed from output.
+        :param key: key of record if container is dict, None if container is list.
+        :param complete: False if next lines of output may fill record - then it is passed to callback/iterator
+         when next record is added or command is done.
+        :return: None
+        """
+        self._publish_pending_record()
+        if key is None:
+            container.append(record)
+        else:
+            container[key] = record
+        if not self._streaming:
+            return
+        self.streamed_records += 1
+        if self._stream_keep_last is not None:
+            keep_last = max(self._stream_keep_last, self._min_records_kept)
+            if key is None:
+                if len(container) > keep_last:
+                    del container[:len(container) - keep_last]
+            else:
+                keys = self._stream_keys.setdefault(id(container), collections.deque())
+                keys.append(key)
+                while len(keys) > keep_last:
+                    container.pop(keys.popleft(), None)
+        published = record if key is None else (key, record)
+        if complete:
+            self._publish_record(published)
+        else:
+            self._pending_record = published
+
+    def _publish_pending_record(self):
+        """
+        Passes record waiting for completion to callback/iterator.
+
+        :return: None
+        """
+        if self._pending_record is not None:
+            record = self._pending_record
+            self._pending_record = None
+            self._publish_record(record)
+
+    def _publish_record(self, record):
+        """
+        Passes record to callback/iterator in streaming mode.
+
+        :param record: record parsed from output or tuple (key, record) for record stored in dict.
+        :return: None
+        """
+        if self._stream_queue is not None:
+            self._stream_queue.put(record)
+        if self._stream_callback is not None:
+            self._stream_callback(record)
+
     @property
     def break_exec_regex(self):
         """
@@ -174,6 +288,7 @@ class CommandTextualGeneric(Command):
                 self._stored_exception = None
                 super(CommandTextualGeneric, self)._set_exception_without_done(exception=exception)
             if value and not self._is_done:
+                self._publish_pending_record()
                 self.on_done()
                 if self._stored_exception or self.cancelled():
                     self.on_failure()
@@ -214,11 +329,25 @@ class CommandTextualGeneric(Command):
          datatime.datetime instance.
         :return: None.
         """
+        self.lines_received(lines=split_into_lines(data=data, newline_chars=self._newline_chars),
+                            recv_time=recv_time)
+
+    def lines_received(self, lines, recv_time):
+        """
+        Called with data already split into lines. Lines of data received on connection are split only once
+        and shared by all observers of connection.
+
+        :param lines: tuple of (chunk, line, is_full_line) as returned by moler.util.line_splitter.split_into_lines.
+        :param recv_time: time stamp with the moment when the data was read from connection.  Time is given as
+         datatime.datetime instance.
+        :return: None.
+        """
         self._last_recv_time_data_read_from_connection = recv_time
         try:
-            lines = data.splitlines(True)
-            for current_chunk in lines:
-                line, is_full_line = self._update_from_cached_incomplete_line(current_chunk=current_chunk)
+            for current_chunk, chunk_line, chunk_is_full_line in lines:
+                line, is_full_line = self._update_from_cached_incomplete_line(current_chunk=current_chunk,
+                                                                              line=chunk_line,
+                                                                              is_full_line=chunk_is_full_line)
                 if self._cmd_output_started:
                     self._process_line_from_command(line=line, current_chunk=current_chunk, is_full_line=is_full_line)
                 else:
@@ -255,14 +384,23 @@ class CommandTextualGeneric(Command):
         if self._concatenate_before_command_starts and not self._cmd_output_started and is_full_line:
             self._last_not_full_line = line
 
-    def _update_from_cached_incomplete_line(self, current_chunk):
+    def _update_from_cached_incomplete_line(self, current_chunk, line=None, is_full_line=None):
         """
         Concatenates (if necessary) previous chunk(s) of line and current.
 
         :param current_chunk: line from connection (full line or incomplete one).
+        :param line: current_chunk without newline char(s) or None if not known yet.
+        :param is_full_line: True if current_chunk has newline char(s), False if not, None if not known yet.
         :return: Concatenated (if necessary) line from connection without newline char(s). Flag: True if line had
          newline char(s), False otherwise.
         """
+        if is_full_line is not None:
+            if self._last_not_full_line is not None:
+                line = "{}{}".format(self._last_not_full_line, line)
+                self._last_not_full_line = None
+            if not is_full_line:
+                self._last_not_full_line = line
+            return line, is_full_line
         line = current_chunk
         if self._last_not_full_line is not None:
             line = "{}{}".format(self._last_not_full_line, line)
@@ -438,7 +576,7 @@ class CommandTextualGeneric(Command):
         :return: True if current_ret has collected any data. Otherwise False.
         """
         is_ret = False
-        if self.current_ret:
+        if self.current_ret or self.streamed_records:
             is_ret = True
         return is_ret
 
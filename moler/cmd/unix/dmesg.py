@@ -32,7 +32,7 @@ class Dmesg(GenericUnixCommand):
 
     def _parse_line(self, line):
         if not line == "":
-            self.current_ret["LINES"].append(line)
+            self._add_record(container=self.current_ret["LINES"], record=line)
         raise ParsingDone
 
 
@@ -92,7 +92,7 @@ class Find(GenericUnixCommand):
         :param line: Line from device
         :return: None but raises ParsingDone
         """
-        self.current_ret['RESULT'].append(line)
+        self._add_record(container=self.current_ret['RESULT'], record=line)
         raise ParsingDone()
 
 
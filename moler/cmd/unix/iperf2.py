@@ -22,6 +22,8 @@ __email__ = 'grzegorz.latuszek@nokia.com'
 
 
 import re
+from array import array
+from collections import OrderedDict
 from moler.cmd.unix.genericunix import GenericUnixCommand
 from moler.util.converterhelper import ConverterHelper
 from moler.exceptions import CommandFailure
@@ -29,6 +31,212 @@ from moler.exceptions import ParsingDone
 from moler.publisher import Publisher
 
 
+class Iperf2Records(object):
+    """
+    Records of one iperf connection stored in columns instead of list of dicts.
+
+    Long runs (like -P 32 -t 86400 -i 1) produce millions of records. Here every metric is kept inside
+    array('d') and every text (like 'Transfer Raw': '1.17 MBytes') as index into table of distinct texts.
+    Record dict is built only when it is requested (by indexing or iterating) so object behaves like list of
+    records and compares equal to such list.
+    """
+
+    _numbers = ('Transfer', 'Bandwidth')
+    _texts = ('Transfer Raw', 'Bandwidth Raw', 'Jitter', 'Lost_Datagrams_ratio')
+    _keys = frozenset(('Interval', 'Lost_vs_Total_Datagrams') + _numbers + _texts)
+
+    def __init__(self, records=None):
+        """
+        Create storage of records.
+
+        :param records: iterable of record dicts to store at start.
+        """
+        self._starts = array('d')
+        self._ends = array('d')
+        self._numbers_columns = dict((key, array('d')) for key in Iperf2Records._numbers)
+        self._lost = array('d')
+        self._total = array('d')
+        self._texts_columns = dict((key, array('I')) for key in Iperf2Records._texts)
+        self._strings = [None]  # index 0 means record without such key
+        self._strings_indexes = dict()
+        self._other_values = dict()  # absolute position -> dict of values not fitting into columns
+        self._first_position = 0  # absolute position of first stored record (older ones may be deleted)
+        if records:
+            for record in records:
+                self.append(record)
+
+    def append(self, record):
+        """
+        Add record at the end.
+
+        :param record: dict with iperf record.
+        :return: None
+        """
+        nan = float('nan')
+        start, end = record['Interval']
+        self._starts.append(start)
+        self._ends.append(end)
+        for key in Iperf2Records._numbers:
+            self._numbers_columns[key].append(record.get(key, nan))
+        lost, total = record.get('Lost_vs_Total_Datagrams', (nan, nan))
+        self._lost.append(lost)
+        self._total.append(total)
+        for key in Iperf2Records._texts:
+            self._texts_columns[key].append(self._string_index(record.get(key)))
+        position = self._first_position + len(self._starts) - 1
+        other_values = dict((key, value) for key, value in record.items() if key not in Iperf2Records._keys)
+        if other_values:
+            self._other_values[position] = other_values
+
+    def to_list(self):
+        """
+        :return: list of record dicts.
+        """
+        return [self._record(index) for index in range(len(self))]
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(record_index) for record_index in range(*index.indices(len(self)))]
+        return self._record(self._check_index(index))
+
+    def __delitem__(self, index):
+        if not isinstance(index, slice):
+            index = self._check_index(index)
+            index = slice(index, index + 1)
+        start, stop, step = index.indices(len(self))
+        if step == 1 and start == 0:
+            for column in self._columns():
+                del column[:stop]
+            self._first_position += stop
+            for position in [pos for pos in self._other_values if pos < self._first_position]:
+                del self._other_values[position]
+        else:
+            records = self.to_list()
+            del records[index]
+            self.__init__(records=records)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._record(index)
+
+    def __eq__(self, other):
+        if isinstance(other, Iperf2Records):
+            other = other.to_list()
+        return self.to_list() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_list())
+
+    def _record(self, index):
+        record = {'Interval': (self._starts[index], self._ends[index])}
+        for key, column in self._numbers_columns.items():
+            value = self._number(column[index])
+            if value is not None:
+                record[key] = value
+        lost = self._number(self._lost[index])
+        if lost is not None:
+            record['Lost_vs_Total_Datagrams'] = (lost, self._number(self._total[index]))
+        for key, column in self._texts_columns.items():
+            if column[index]:
+                record[key] = self._strings[column[index]]
+        record.update(self._other_values.get(self._first_position + index, dict()))
+        return record
+
+    def _check_index(self, index):
+        size = len(self)
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError("Iperf2Records index out of range")
+        return index
+
+    def _string_index(self, text):
+        if text is None:
+            return 0
+        index = self._strings_indexes.get(text)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(text)
+            self._strings_indexes[text] = index
+        return index
+
+    @staticmethod
+    def _number(value):
+        if value != value:  # NaN marks missing value
+            return None
+        return int(value)
+
+    def _columns(self):
+        return [self._starts, self._ends, self._lost, self._total] + list(self._numbers_columns.values()) + list(
+            self._texts_columns.values())
+
+
+class _IntervalSummary(object):
+    """
+    Summary of one interval of parallel (multiport) iperf connections.
+
+    Records of ports are collected as their lines are parsed, so summary record is built without searching
+    records of ports. Port reporting the same interval again replaces its previous record.
+    """
+
+    def __init__(self, interval, udp):
+        """
+        :param interval: tuple (start, end) of interval.
+        :param udp: True if records contain datagrams statistics.
+        """
+        self.interval = interval
+        self.udp = udp
+        self._records = OrderedDict()  # connection name -> last record of interval
+
+    @property
+    def connections_count(self):
+        """
+        :return: number of connections which records were added.
+        """
+        return len(self._records)
+
+    def add(self, connection_name, iperf_record):
+        """
+        Add record of port to summary.
+
+        :param connection_name: name of connection of record.
+        :param iperf_record: record of interval.
+        :return: None
+        """
+        self._records[connection_name] = iperf_record
+
+    def record(self):
+        """
+        :return: summary record of interval.
+        """
+        records = list(self._records.values())
+        raw_transfers = [iperf_record['Transfer Raw'].split() for iperf_record in records]  # '122 KBytes'
+        raw_bandwidths = [iperf_record['Bandwidth Raw'].split() for iperf_record in records]  # '1000 Kbits/sec'
+        sum_record = {
+            'Interval': self.interval,
+            'Transfer': sum(iperf_record['Transfer'] for iperf_record in records),
+            'Transfer Raw': '{} {}'.format(sum(float(value) for value, _ in raw_transfers), raw_transfers[0][1]),
+            'Bandwidth': sum(iperf_record['Bandwidth'] for iperf_record in records),
+            'Bandwidth Raw': '{} {}'.format(sum(float(value) for value, _ in raw_bandwidths), raw_bandwidths[0][1]),
+        }
+        if self.udp:
+            jitters = [iperf_record['Jitter'].split() for iperf_record in records]  # 'Jitter': '0.821 ms'
+            lost_datagrams = sum(iperf_record['Lost_vs_Total_Datagrams'][0] for iperf_record in records)
+            total_datagrams = sum(iperf_record['Lost_vs_Total_Datagrams'][1] for iperf_record in records)
+            sum_record['Jitter'] = '{} {}'.format(max(float(value) for value, _ in jitters), jitters[0][1])
+            sum_record['Lost_vs_Total_Datagrams'] = (lost_datagrams, total_datagrams)
+            sum_record['Lost_Datagrams_ratio'] = '{:.2f}%'.format(lost_datagrams * 100 / total_datagrams)
+        return sum_record
+
+
 class Iperf2(GenericUnixCommand, Publisher):
     """
     Run iperf command, return its statistics and report.
@@ -64,7 +272,7 @@ class Iperf2(GenericUnixCommand, Publisher):
       ("192.168.0.10", "5016@192.168.0.12"): {'report': {<report dict here>}}
 
     """
-    def __init__(self, connection, options, prompt=None, newline_chars=None, runner=None):
+    def __init__(self, connection, options, prompt=None, newline_chars=None, runner=None, columnar=False):
         """
         Create iperf2 command
 
@@ -73,19 +281,24 @@ class Iperf2(GenericUnixCommand, Publisher):
         :param prompt: prompt (regexp) where iperf starts from, if None - default prompt regexp used
         :param newline_chars: expected newline characters of iperf output
         :param runner: runner used for command
+        :param columnar: if True then records of connections are stored as Iperf2Records (compact columns)
+         instead of lists of dicts
         """
         super(Iperf2, self).__init__(connection=connection, prompt=prompt, newline_chars=newline_chars, runner=runner)
         self.port, self.options = self._validate_options(options)
         self.current_ret['CONNECTIONS'] = dict()
         self.current_ret['INFO'] = list()
+        self._min_records_kept = 1  # Report is taken from last record of connection.
 
         # private values
         self._connection_dict = dict()
         self._same_host_connections = dict()
+        self._multiport_summaries = dict()  # (client host, interval) -> _IntervalSummary of ports reported so far
         self._converter_helper = ConverterHelper()
         self._got_server_report_hdr = False
         self._got_server_report = False
         self._stopping_server = False
+        self._columnar = columnar
 
     def __str__(self):
         str_base_value = super(Iperf2, self).__str__()
@@ -340,7 +553,7 @@ class Iperf2(GenericUnixCommand, Publisher):
             normalized_iperf_record = self._normalize_to_bytes(iperf_record)
             self._update_current_ret(connection_name, normalized_iperf_record)
             if self._need_add_multiport_summary_record_of_interval(connection_name, normalized_iperf_record):
-                self._calculate_multiport_summary_record_of_interval(connection_name)
+                self._add_to_multiport_summary_record_of_interval(connection_name, normalized_iperf_record)
             self._parse_final_record(connection_name)
             if self.protocol == 'udp' and self._got_server_report_hdr:
                 self._got_server_report = True
@@ -360,95 +573,54 @@ class Iperf2(GenericUnixCommand, Publisher):
         return iperf_record
 
     def _update_current_ret(self, connection_name, info_dict):
-        if connection_name in self.current_ret['CONNECTIONS']:
-            self.current_ret['CONNECTIONS'][connection_name].append(info_dict)
-        else:
-            connection_dict = {connection_name: [info_dict]}
-            self.current_ret['CONNECTIONS'].update(connection_dict)
-
-    def _all_multiport_records_of_interval(self, connection_name):
-        client, server = connection_name
-        client_port, client_host = client.split("@")
-        last_interval = self.current_ret['CONNECTIONS'][connection_name][-1]['Interval']
-        for conn_name in self._same_host_connections[client_host]:
-            if conn_name not in self.current_ret['CONNECTIONS']:
-                return False
-            if not self._get_last_record_of_interval(conn_name, last_interval):
-                return False
-        return True
-
-    def _get_last_record_of_interval(self, connection_name, interval):
-        last_rec = self.current_ret['CONNECTIONS'][connection_name][-1]
-        if last_rec['Interval'] == interval:
-            return last_rec
-        if len(self.current_ret['CONNECTIONS'][connection_name]) > 1:
-            pre_last_rec = self.current_ret['CONNECTIONS'][connection_name][-2]
-            if pre_last_rec['Interval'] == interval:
-                return pre_last_rec
-        return None
+        if connection_name not in self.current_ret['CONNECTIONS']:
+            self.current_ret['CONNECTIONS'][connection_name] = Iperf2Records() if self._columnar else list()
+        self._add_record(container=self.current_ret['CONNECTIONS'][connection_name], record=info_dict)
 
     def _need_add_multiport_summary_record_of_interval(self, connection_name, last_iperf_record):
         if not self.server:
             return False
         if not self.parallel_client:
             return False
+        if connection_name[0].startswith('multiport'):
+            return False  # it is summary itself
         if self._is_final_record(last_iperf_record):
             return False
-        if not self._all_multiport_records_of_interval(connection_name):
-            return False
         return True
 
-    def _calculate_multiport_summary_record_of_interval(self, connection_name):
+    def _add_to_multiport_summary_record_of_interval(self, connection_name, iperf_record):
         client, server = connection_name
         client_port, client_host = client.split("@")
-        connections = self._same_host_connections[client_host]
-
-        interval = self.current_ret['CONNECTIONS'][connection_name][-1]['Interval']
-        if interval == (4.0, 5.0):
-            pass
-        transfers = [self._get_last_record_of_interval(conn, interval)['Transfer'] for conn in connections]
-        raw_transfers = [self._get_last_record_of_interval(conn, interval)['Transfer Raw'] for conn in connections]
-        bandwidths = [self._get_last_record_of_interval(conn, interval)['Bandwidth'] for conn in connections]
-        raw_bandwidths = [self._get_last_record_of_interval(conn, interval)['Bandwidth Raw'] for conn in connections]
-        if self.protocol == 'udp':
-            jitters = [self._get_last_record_of_interval(conn, interval)['Jitter'] for conn in connections]
-            ltds = [self._get_last_record_of_interval(conn, interval)['Lost_vs_Total_Datagrams'] for conn in connections]
-
-            jitter_unit = jitters[0].split()[1]  # 'Jitter': '0.821 ms'
-            jitter_values = [float(jit.split()[0]) for jit in jitters]
-
-            lost_datagrams = sum([lost for lost, _ in ltds])
-            total_datagrams = sum([total for _, total in ltds])
-
-        raw_transfer_unit = raw_transfers[0].split()[1]  # 'Transfer Raw': '122 KBytes',
-        raw_transfer_values = [float(raw_trf.split()[0]) for raw_trf in raw_transfers]
-
-        raw_bandwidth_unit = raw_bandwidths[0].split()[1]  # 'Bandwidth Raw': '1000 Kbits/sec'
-        raw_bandwidth_values = [float(raw_bw.split()[0]) for raw_bw in raw_bandwidths]
-
-        sum_record = {
-            'Interval': interval,
-            'Transfer': sum(transfers),
-            'Transfer Raw': '{} {}'.format(sum(raw_transfer_values), raw_transfer_unit),
-            'Bandwidth': sum(bandwidths),
-            'Bandwidth Raw': '{} {}'.format(sum(raw_bandwidth_values), raw_bandwidth_unit),
-        }
-        if self.protocol == 'udp':
-            sum_record['Jitter'] = '{} {}'.format(max(jitter_values), jitter_unit)
-            sum_record['Lost_vs_Total_Datagrams'] = (lost_datagrams, total_datagrams)
-            sum_record['Lost_Datagrams_ratio'] = '{:.2f}%'.format(lost_datagrams * 100 / total_datagrams)
+        summary_key = (client_host, iperf_record['Interval'])
+        summary = self._multiport_summaries.get(summary_key)
+        if summary is None:
+            summary = _IntervalSummary(interval=iperf_record['Interval'], udp=self.protocol == 'udp')
+            self._multiport_summaries[summary_key] = summary
+        summary.add(connection_name, iperf_record)
+        if summary.connections_count < len(self._same_host_connections[client_host]):
+            return
+        # ports which didn't report older intervals (disconnected ones) won't report them anymore
+        self._drop_multiport_summaries(client_host, till_end_of_interval=iperf_record['Interval'][1])
+        sum_record = summary.record()
 
         from_client = 'multiport@{}'.format(client_host)
         sum_connection_name = (from_client, server)
         self._update_current_ret(sum_connection_name, sum_record)
         self.notify_subscribers(from_client=from_client, to_server=server, data_record=sum_record)
 
+    def _drop_multiport_summaries(self, client_host, till_end_of_interval=None):
+        for summary_key in list(self._multiport_summaries):
+            host, (_, end) = summary_key
+            if (host == client_host) and ((till_end_of_interval is None) or (end <= till_end_of_interval)):
+                del self._multiport_summaries[summary_key]
+
     def _parse_final_record(self, connection_name):
         if self.parallel_client and ('multiport' not in connection_name[0]):
             return  # for parallel we take report / publish stats only from summary records
         last_record = self.current_ret['CONNECTIONS'][connection_name][-1]
         if self._is_final_record(last_record):
             client_host, client_port, server_host, server_port = self._split_connection_name(connection_name)
+            self._drop_multiport_summaries(client_host)
             from_client, to_server = client_host, "{}@{}".format(server_port, server_host)
             result_connection = (from_client, to_server)
             self.current_ret['CONNECTIONS'][result_connection] = {'report': last_record}
@@ -38,6 +38,7 @@ class Ls(GenericUnixCommand):
         super(Ls, self).__init__(connection=connection, prompt=prompt, newline_chars=newline_chars, runner=runner)
         self._converter_helper = ConverterHelper()
         self.current_ret["files"] = dict()
+        self._files_without_size_bytes = list()  # sizes of files are converted all at once
         # Parameters defined by calling the command
         self.options = options
         self.path = path
@@ -97,6 +98,16 @@ class Ls(GenericUnixCommand):
                 pass
         return super(Ls, self).on_new_line(line, is_full_line)
 
+    def on_done(self):
+        """
+        Callback called by framework when command is just about to finish (on prompt, timeout or cancel).
+        Sizes of files parsed so far are put into result.
+
+        :return: None
+        """
+        self._convert_sizes_of_files()
+        super(Ls, self).on_done()
+
     def _parse_files_list(self, line):
         """
         Parses list of files.
@@ -161,13 +172,24 @@ class Ls(GenericUnixCommand):
         self.current_ret["files"][filename]["owner"] = self._regex_helper.group(3)
         self.current_ret["files"][filename]["group"] = self._regex_helper.group(4)
         self.current_ret["files"][filename]["size_raw"] = self._regex_helper.group(5)
-        self.current_ret["files"][filename]["size_bytes"] = \
-            self._converter_helper.to_bytes(self._regex_helper.group(5))[0]
+        self._files_without_size_bytes.append(self.current_ret["files"][filename])
         self.current_ret["files"][filename]["date"] = self._regex_helper.group(6)
         self.current_ret["files"][filename]["name"] = self._regex_helper.group(7)
         if islink:
             self.current_ret["files"][filename]["link"] = self._regex_helper.group(8)
 
+    def _convert_sizes_of_files(self):
+        """
+        Converts raw sizes of all files parsed so far to bytes in one call (units like K or M repeat a lot).
+
+        :return: None.
+        """
+        files, self._files_without_size_bytes = self._files_without_size_bytes, list()
+        if files:
+            sizes_bytes = self._converter_helper.to_bytes_list([file_dict["size_raw"] for file_dict in files])
+            for file_dict, size_bytes in zip(files, sizes_bytes):
+                file_dict["size_bytes"] = size_bytes
+
     def _get_types(self, requested_type):
         """
         Method to return only object of specific type.
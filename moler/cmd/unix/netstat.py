@@ -5,8 +5,8 @@ __email__ = 'mateusz.m.szczurek@nokia.com, michal.ernst@nokia.com'
 
 import re
 
+from moler.parser.line_rules import LineRule, LineRules
 from moler.cmd.unix.genericunix import GenericUnixCommand
-from moler.exceptions import ParsingDone
 from moler.helpers import convert_to_number
 
 
@@ -48,198 +48,196 @@ class Netstat(GenericUnixCommand):
         :param is_full_line: True if line had new line chars, False otherwise
         :return: None
         """
-        try:
-            if is_full_line:
-                self._parse_active(line)
-                self._parse_headers_unix(line)
-                self._parse_headers_internet(line)
-                self._parse_interface(line)
-                self._parse_groups(line)
-                self._parse_routing_table(line)
-                self._parse_statistics(line)
-        except ParsingDone:
-            pass  # line has been fully parsed by one of above parse-methods
+        if is_full_line:
+            Netstat._line_rules.dispatch(self, line)
         return super(Netstat, self).on_new_line(line, is_full_line)
 
     # Active UNIX domain sockets (w/o servers)
     _re_active = re.compile(r"Active\s*(?P<ACTIVE>.*) \s*\((w/o servers|servers and established)\)")
 
-    def _parse_active(self, line):
+    def _parse_active(self, line, match):
         """
         Parse active connections or sockets in line. Set self._active to current type of connection.
 
         :param line: Line to process.
-        :return: None but raises ParsingDone if line has the information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if self._regex_helper.search_compiled(Netstat._re_active, line):
-            self._active = self._regex_helper.group("ACTIVE")
-            raise ParsingDone
+        self._active = match.group("ACTIVE")
+        if self._active == "UNIX domain sockets" and "UNIX_SOCKETS" not in self.current_ret:
+            self.current_ret['UNIX_SOCKETS'] = list()
+        elif self._active == "Internet connections" and "INTERNET_CONNECTIONS" not in self.current_ret:
+            self.current_ret['INTERNET_CONNECTIONS'] = list()
 
     # unix  2      [ ]         DGRAM                    15382    /var/cache/samba/msg/950
     _re_header_unix = re.compile(
         r"(?P<PROTO>\S*)\s+(?P<REFCNT>\d*)\s+(?P<FLAGS>\[.*\])\s+(?P<TYPE>[A-Z]*)\s+(?P<STATE>[A-Z]*)?\s+(?P<INODE>\d*)"
         r"\s*(?P<PID>\d+/\S+|-)?\s+(?P<PATH>\S*)")
 
-    def _parse_headers_unix(self, line):
+    def _parse_headers_unix(self, line, match):
         """
-        Check if parsed type of connection is a UNIX domain socket. If yes then parse corresponding values in line.
-        Append those values to UNIX_SOCKETS list.
+        Parse values of UNIX domain socket in line. Append those values to UNIX_SOCKETS list.
 
         :param line: Line to process.
-        :return: None but raises ParsingDone if line has the information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if self._active == "UNIX domain sockets":
-            if "UNIX_SOCKETS" not in self.current_ret:
-                self.current_ret['UNIX_SOCKETS'] = list()
-            if self._regex_helper.search_compiled(Netstat._re_header_unix, line):
-                _ret_dict = {
-                    "proto": self._regex_helper.group("PROTO"),
-                    "refcnt": convert_to_number(self._regex_helper.group("REFCNT")),
-                    "flags": self._regex_helper.group("FLAGS"),
-                    "type": self._regex_helper.group("TYPE"),
-                    "state": self._regex_helper.group("STATE"),
-                    "i-node": convert_to_number(self._regex_helper.group("INODE")),
-                    "path": self._regex_helper.group("PATH")
-                }
-                if self._regex_helper.group("PID"):
-                    _ret_dict.update({"pid/program name": self._regex_helper.group("PID")})
-                self.current_ret['UNIX_SOCKETS'].append(_ret_dict)
-                raise ParsingDone
+        _ret_dict = {
+            "proto": match.group("PROTO"),
+            "refcnt": convert_to_number(match.group("REFCNT")),
+            "flags": match.group("FLAGS"),
+            "type": match.group("TYPE"),
+            "state": match.group("STATE"),
+            "i-node": convert_to_number(match.group("INODE")),
+            "path": match.group("PATH")
+        }
+        if match.group("PID"):
+            _ret_dict.update({"pid/program name": match.group("PID")})
+        self.current_ret['UNIX_SOCKETS'].append(_ret_dict)
 
     # tcp6       1      0 localhost:34256         localhost:ipp           CLOSE_WAIT
     _re_header_internet = re.compile(
         r"(?P<PROTO>\S+)\s{1,10}(?P<RECVQ>\d+)?\s*(?P<SENDQ>\d+)?\s*(?P<LADDRESS>\S+:\S+)\s+(?P<FADDRESS>\S+:\S+)"
         r"?\s+(?P<STATE>\S+)\s*(?P<PID>\d+/\S+|-)?")
 
-    def _parse_headers_internet(self, line):
+    def _parse_headers_internet(self, line, match):
         """
-        Check if parsed type of connection is an internet type. If yes then parse corresponding values in line.
-        Append those values to INTERNET_CONNECTIONS list.
+        Parse values of internet connection in line. Append those values to INTERNET_CONNECTIONS list.
 
         :param line: Line to process.
-        :return: None but raises ParsingDone if line has the information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if self._active == "Internet connections":
-            if "INTERNET_CONNECTIONS" not in self.current_ret:
-                self.current_ret['INTERNET_CONNECTIONS'] = list()
-            if self._regex_helper.search_compiled(Netstat._re_header_internet, line):
-                _ret_dict = {
-                    "proto": self._regex_helper.group("PROTO"),
-                    "recv-q": convert_to_number(self._regex_helper.group("RECVQ")),
-                    "send-q": convert_to_number(self._regex_helper.group("SENDQ")),
-                    "local address": self._regex_helper.group("LADDRESS"),
-                    "foreign address": self._regex_helper.group("FADDRESS"),
-                    "state": self._regex_helper.group("STATE")
-                }
-                if self._regex_helper.group("PID"):
-                    _ret_dict.update({"pid/program name": self._regex_helper.group("PID")})
-                self.current_ret['INTERNET_CONNECTIONS'].append(_ret_dict)
-                raise ParsingDone
+        _ret_dict = {
+            "proto": match.group("PROTO"),
+            "recv-q": convert_to_number(match.group("RECVQ")),
+            "send-q": convert_to_number(match.group("SENDQ")),
+            "local address": match.group("LADDRESS"),
+            "foreign address": match.group("FADDRESS"),
+            "state": match.group("STATE")
+        }
+        if match.group("PID"):
+            _ret_dict.update({"pid/program name": match.group("PID")})
+        self.current_ret['INTERNET_CONNECTIONS'].append(_ret_dict)
 
     # lo              1      all-systems.mcast.net
     _re_groups = re.compile(r"(?P<INTERFACE>\S*)\s+(?P<REFCNT>\d*)\s+(?P<GROUP>\S*$)")
 
-    def _parse_groups(self, line):
+    def _parse_groups(self, line, match):
         """
-        Check if -g paramter is in use. If yes then parse corresponding values in line.
-        Append those values to GROUP list.
+        Parse values of group membership in line (-g parameter). Append those values to GROUP list.
 
         :param line: Line to process.
-        :return: None but raises ParsingDone if line has the information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if "g" in self.options and self._regex_helper.search_compiled(Netstat._re_groups, line):
-            if "GROUP" not in self.current_ret:
-                self.current_ret['GROUP'] = list()
-            _ret_dict = {
-                "interface": self._regex_helper.group("INTERFACE"),
-                "refcnt": convert_to_number(self._regex_helper.group("REFCNT")),
-                "group": self._regex_helper.group("GROUP")
-            }
-            self.current_ret['GROUP'].append(_ret_dict)
-            raise ParsingDone
+        if "GROUP" not in self.current_ret:
+            self.current_ret['GROUP'] = list()
+        _ret_dict = {
+            "interface": match.group("INTERFACE"),
+            "refcnt": convert_to_number(match.group("REFCNT")),
+            "group": match.group("GROUP")
+        }
+        self.current_ret['GROUP'].append(_ret_dict)
 
     # eth0       1500 0    178226      0      0 0          1417      0      0      0 BMRU
     _re_interface = re.compile(
         r"(?P<INTERFACE>\S*)\s+(?P<MTU>\d*)\s+(?P<MET>\d*)\s+(?P<RXOK>\d*)\s+(?P<RXERR>\d*)\s+(?P<RXDRP>\d*)"
         r"\s+(?P<RXOVR>\d*)\s+(?P<TXOK>\d*)\s+(?P<TXERR>\d*)\s+(?P<TXDRP>\d*)\s+(?P<TXOVR>\d*)\s+(?P<FLG>\S*)")
 
-    def _parse_interface(self, line):
+    def _parse_interface(self, line, match):
         """
-        Check if -i paramter is in use. If yes then parse corresponding values in line.
-        Append those values to INTERFACE list.
+        Parse values of interface in line (-i parameter). Append those values to INTERFACE list.
 
         :param line: Line to process.
-        :return: None but raises ParsingDone if line has the information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if "i" in self.options and self._regex_helper.search_compiled(Netstat._re_interface, line):
-            if "INTERFACE" not in self.current_ret:
-                self.current_ret['INTERFACE'] = list()
-            _ret_dict = {
-                "iface": self._regex_helper.group("INTERFACE"),
-                "mtu": convert_to_number(self._regex_helper.group("MTU")),
-                "met": convert_to_number(self._regex_helper.group("MET")),
-                "rx-ok": convert_to_number(self._regex_helper.group("RXOK")),
-                "rx-err": convert_to_number(self._regex_helper.group("RXERR")),
-                "rx-drp": convert_to_number(self._regex_helper.group("RXDRP")),
-                "rx-ovr": convert_to_number(self._regex_helper.group("RXOVR")),
-                "tx-ok": convert_to_number(self._regex_helper.group("TXOK")),
-                "tx-err": convert_to_number(self._regex_helper.group("TXERR")),
-                "tx-drp": convert_to_number(self._regex_helper.group("TXDRP")),
-                "tx-ovr": convert_to_number(self._regex_helper.group("TXOVR")),
-                "flg": self._regex_helper.group("FLG")
-            }
-            self.current_ret['INTERFACE'].append(_ret_dict)
-            raise ParsingDone
+        if "INTERFACE" not in self.current_ret:
+            self.current_ret['INTERFACE'] = list()
+        _ret_dict = {
+            "iface": match.group("INTERFACE"),
+            "mtu": convert_to_number(match.group("MTU")),
+            "met": convert_to_number(match.group("MET")),
+            "rx-ok": convert_to_number(match.group("RXOK")),
+            "rx-err": convert_to_number(match.group("RXERR")),
+            "rx-drp": convert_to_number(match.group("RXDRP")),
+            "rx-ovr": convert_to_number(match.group("RXOVR")),
+            "tx-ok": convert_to_number(match.group("TXOK")),
+            "tx-err": convert_to_number(match.group("TXERR")),
+            "tx-drp": convert_to_number(match.group("TXDRP")),
+            "tx-ovr": convert_to_number(match.group("TXOVR")),
+            "flg": match.group("FLG")
+        }
+        self.current_ret['INTERFACE'].append(_ret_dict)
 
     # default         123.123.123.123  0.0.0.0         UG        0 0          0 eth0
     _re_routing_table = re.compile(
         r"(?P<DESTINATION>\S*)\s+(?P<GATEWAY>\S*)\s+(?P<GENMASK>\S*)\s+(?P<FLAGS>[A-Z]*)\s+(?P<MSS>\d*)"
         r"\s+(?P<WINDOW>\d*)\s+(?P<IRTT>\d*)\s+(?P<INTERFACE>\S*)$")
 
-    def _parse_routing_table(self, line):
+    def _parse_routing_table(self, line, match):
         """
-        Check if -r paramter is in use. If yes then parse corresponding values in line.
-        Append those values to GROUP list.
+        Parse values of route in line (-r parameter). Append those values to ROUTING_TABLE list.
 
         :param line: Line to process.
-        :return: None but raises ParsingDone if line has the information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if "r" in self.options and self._regex_helper.search_compiled(Netstat._re_routing_table, line):
-            if "ROUTING_TABLE" not in self.current_ret:
-                self.current_ret['ROUTING_TABLE'] = list()
-            _ret_dict = {
-                "destination": self._regex_helper.group("DESTINATION"),
-                "gateway": self._regex_helper.group("GATEWAY"),
-                "genmask": self._regex_helper.group("GENMASK"),
-                "flags": self._regex_helper.group("FLAGS"),
-                "mss": convert_to_number(self._regex_helper.group("MSS")),
-                "window": convert_to_number(self._regex_helper.group("WINDOW")),
-                "irtt": convert_to_number(self._regex_helper.group("IRTT")),
-                "iface": self._regex_helper.group("INTERFACE")
-            }
-            self.current_ret['ROUTING_TABLE'].append(_ret_dict)
-            raise ParsingDone
+        if "ROUTING_TABLE" not in self.current_ret:
+            self.current_ret['ROUTING_TABLE'] = list()
+        _ret_dict = {
+            "destination": match.group("DESTINATION"),
+            "gateway": match.group("GATEWAY"),
+            "genmask": match.group("GENMASK"),
+            "flags": match.group("FLAGS"),
+            "mss": convert_to_number(match.group("MSS")),
+            "window": convert_to_number(match.group("WINDOW")),
+            "irtt": convert_to_number(match.group("IRTT")),
+            "iface": match.group("INTERFACE")
+        }
+        self.current_ret['ROUTING_TABLE'].append(_ret_dict)
 
     # IcmpMsg:
     _re_statistics = re.compile(r"^(?P<PROTO>\S+):$")
 
-    def _parse_statistics(self, line):
+    def _parse_statistics_proto(self, line, match):
         """
-        Check if -s paramter is in use. If yes then parse corresponding values in line.
-        Update those values to STATISTICS dictionary.
+        Parse protocol of statistics in line (-s parameter). Create list of its statistics in STATISTICS dictionary.
 
         :param line: Line to process.
-        :return: None but raises ParsingDone if line has the information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
+        """
+        if "STATISTICS" not in self.current_ret:
+            self.current_ret['STATISTICS'] = dict()
+        self.statistics_proto = match.group("PROTO")
+        self.current_ret['STATISTICS'][self.statistics_proto] = list()
+
+    def _parse_statistics(self, line, match):
+        """
+        Parse statistics in line (-s parameter). Append line to statistics of current protocol.
+
+        :param line: Line to process.
+        :param match: None (rule of statistics has no regular expression).
+        :return: None
         """
-        if "s" in self.options:
-            if "STATISTICS" not in self.current_ret:
-                self.current_ret['STATISTICS'] = dict()
-            if self._regex_helper.search_compiled(Netstat._re_statistics, line):
-                self.statistics_proto = self._regex_helper.group("PROTO")
-                self.current_ret['STATISTICS'][self.statistics_proto] = list()
-            else:
-                self.current_ret['STATISTICS'][self.statistics_proto].append(line.lstrip())
-            raise ParsingDone
+        if "STATISTICS" not in self.current_ret:
+            self.current_ret['STATISTICS'] = dict()
+        self.current_ret['STATISTICS'][self.statistics_proto].append(line.lstrip())
+
+    _line_rules = LineRules([
+        LineRule(regex=_re_active, handler='_parse_active'),
+        LineRule(regex=_re_header_unix, handler='_parse_headers_unix',
+                 when=lambda cmd: cmd._active == "UNIX domain sockets"),
+        LineRule(regex=_re_header_internet, handler='_parse_headers_internet', literal=':',
+                 when=lambda cmd: cmd._active == "Internet connections"),
+        LineRule(regex=_re_interface, handler='_parse_interface', when=lambda cmd: "i" in cmd.options),
+        LineRule(regex=_re_groups, handler='_parse_groups', when=lambda cmd: "g" in cmd.options),
+        LineRule(regex=_re_routing_table, handler='_parse_routing_table', when=lambda cmd: "r" in cmd.options),
+        LineRule(regex=_re_statistics, handler='_parse_statistics_proto', when=lambda cmd: "s" in cmd.options),
+        LineRule(handler='_parse_statistics', when=lambda cmd: "s" in cmd.options),
+    ])
 
 
 COMMAND_OUTPUT = """
@@ -4,10 +4,9 @@ __author__ = 'Dariusz Rosinski, Marcin Usielski'
 __copyright__ = 'Copyright (C) 2018-2020, Nokia'
 __email__ = 'dariusz.rosinski@nokia.com, marcin.usielski@nokia.com'
 
-import re
 from moler.cmd.unix.genericunix import GenericUnixCommand
 from moler.exceptions import ParsingDone
-from moler.util.converterhelper import ConverterHelper
+from moler.parser.column_layout import ColumnLayout
 
 """
 ps command module.
@@ -38,10 +37,9 @@ class Ps(GenericUnixCommand):
         super(Ps, self).__init__(connection=connection, prompt=prompt, newline_chars=newline_chars, runner=runner)
         self.current_ret = list()
         self.options = options
-        self._headers = None
-        self._header_pos = None
+        self._layout = None  # ColumnLayout learned from headers
+        self._rows = list()  # rows of processes not converted yet (converted all at once)
         self.ret_required = False
-        self._converter_helper = ConverterHelper.get_converter_helper()
 
     def on_new_line(self, line, is_full_line):
         """
@@ -59,68 +57,49 @@ class Ps(GenericUnixCommand):
                 pass
         return super(Ps, self).on_new_line(line, is_full_line)
 
-    # USER       PID    VSZ SZ  MEM   RSS COMMAND
-    _re_headers = re.compile(r"(?P<HEADERS>\s*(\S+)\s*)")
+    def on_done(self):
+        """
+        Callback called by framework when command is just about to finish (on prompt, timeout or cancel).
+        Rows of processes parsed so far are put into result.
+
+        :return: None
+        """
+        self._convert_rows()
+        super(Ps, self).on_done()
 
     def _parse_headers(self, line):
         """
         Parse headers from line of output.
 
         :param line: Line from connection.
-        :return: None
+        :return: None but raises ParsingDone if line has information to handle by this method.
         """
-        if self._headers is None:
-            if self._regex_helper.search_compiled(Ps._re_headers, line):
-                matched = re.findall(r"\s*(\S+)\s*", line)
-                if matched:
-                    self._headers = matched
-                    self._header_pos = list()
-                    previous_pos = 0
-                    for header in self._headers:
-                        position = line.find(header, previous_pos)
-                        self._header_pos.append(position)
-                        previous_pos = position + len(header)
-                    raise ParsingDone()
-
-    # 123
-    _re_integer = re.compile(r"^[+\-]?\d+$")
-
-    # 2.5
-    _re_float = re.compile(r"^[+\-]?(\d+\.\d+|\.\d+|\d+\.)$")
+        if self._layout is None:
+            self._layout = ColumnLayout.from_header(line)
+            if self._layout is not None:
+                raise ParsingDone()
 
     def _parse_line_data(self, line):
         """
         Parse data from output.
 
         :param line: Line from connection.
-        :return: None
+        :return: None but raises ParsingDone if line has information to handle by this method.
         """
-        if self._headers:
-            item = dict()
-            max_column = len(self._headers)
-            previous_end_pos = 0
-            for column_nr in range(max_column):
-                org_start_pos = self._header_pos[column_nr]
-                start_pos = line.find(" ", previous_end_pos)
-                if start_pos > org_start_pos or start_pos < 0:
-                    start_pos = org_start_pos
-                if column_nr < max_column - 1:
-                    end_pos = self._header_pos[column_nr + 1]
-                    end_pos = line.rfind(" ", start_pos, end_pos + 1)
-                else:
-                    end_pos = len(line)
-
-                content = line[start_pos:end_pos]
-                content = content.strip()
-                try:
-                    content = self._converter_helper.to_number(value=content, raise_exception=True)
-                except ValueError:
-                    pass
-                item[self._headers[column_nr]] = content
-                previous_end_pos = end_pos
-            self.current_ret.append(item)
+        if self._layout is not None:
+            self._rows.append(line)
             raise ParsingDone()
 
+    def _convert_rows(self):
+        """
+        Convert collected rows of processes column by column (values like user or size repeat a lot).
+
+        :return: None
+        """
+        rows, self._rows = self._rows, list()
+        if rows:
+            self.current_ret.extend(self._layout.parse_rows(rows))
+
     def build_command_string(self):
         """
         Builds string with command.
@@ -9,8 +9,8 @@ __email__ = 'julia.patacz@nokia.com, michal.ernst@nokia.com, marcin.usielski@nok
 
 import re
 import six
+from moler.parser.line_rules import LineRule, LineRules
 from moler.cmd.unix.genericunix import GenericUnixCommand
-from moler.exceptions import ParsingDone
 
 
 class Tcpdump(GenericUnixCommand):
@@ -30,6 +30,7 @@ class Tcpdump(GenericUnixCommand):
         # Parameters defined by calling the command
         self.options = options
         self.packets_counter = 0
+        self._min_records_kept = 1  # Last packet may be completed by next lines of output.
         self.break_exec_regex = break_exec_regex
         self.ret_required = False
 
@@ -53,18 +54,7 @@ class Tcpdump(GenericUnixCommand):
         :return: None
         """
         if is_full_line:
-            try:
-                self._parse_class_payload_flowlabel(line)
-                self._parse_class_payload(line)
-                self._parse_port_linktype_capture_size(line)
-                self._parse_timestamp_src_dst_details(line)
-                self._parse_timestamp_tos_ttl_id_offset_flags_proto_length(line)
-                self._parse_src_dst_details(line)
-                self._parse_root_delay_root_dipersion_ref_id(line)
-                self._parse_header_timestamp_details(line)
-                self._parse_packets(line)
-            except ParsingDone:
-                pass
+            Tcpdump._line_rules.dispatch(self, line)
 
         return super(Tcpdump, self).on_new_line(line, is_full_line)
 
@@ -73,26 +63,23 @@ class Tcpdump(GenericUnixCommand):
         r"(?P<LISTENING>listening)\s+on\s+(?P<PORT>\S+),\s+(?P<LINK>link-type)\s+(?P<TYPE>.*),\s+"
         r"(?P<CAPTURE>capture size)\s+(?P<SIZE>.*)")
 
-    def _parse_port_linktype_capture_size(self, line):
-        if self._regex_helper.search_compiled(Tcpdump._re_port_linktype_capture_size, line):
-            self.current_ret[self._regex_helper.group("LISTENING")] = self._regex_helper.group("PORT")
-            self.current_ret[self._regex_helper.group("LINK")] = self._regex_helper.group("TYPE")
-            self.current_ret[self._regex_helper.group("CAPTURE")] = self._regex_helper.group("SIZE")
-            raise ParsingDone
+    def _parse_port_linktype_capture_size(self, line, match):
+        self.current_ret[match.group("LISTENING")] = match.group("PORT")
+        self.current_ret[match.group("LINK")] = match.group("TYPE")
+        self.current_ret[match.group("CAPTURE")] = match.group("SIZE")
 
     # 13:16:22.176856 IP debdev.ntp > fwdns2.vbctv.in.ntp: NTPv4, Client, length 48
     _re_timestamp_src_dst_details = re.compile(
         r"(?P<TIMESTAMP>\d+:\d+:\d+.\d+)\s+IP\s+(?P<SRC>\S+)\s+>\s+(?P<DEST>\S+):\s+(?P<DETAILS>.*)")
 
-    def _parse_timestamp_src_dst_details(self, line):
-        if self._regex_helper.search_compiled(Tcpdump._re_timestamp_src_dst_details, line):
-            self.packets_counter += 1
-            self.current_ret[str(self.packets_counter)] = {}
-            self.current_ret[str(self.packets_counter)]['timestamp'] = self._regex_helper.group("TIMESTAMP")
-            self.current_ret[str(self.packets_counter)]['source'] = self._regex_helper.group("SRC")
-            self.current_ret[str(self.packets_counter)]['destination'] = self._regex_helper.group("DEST")
-            self.current_ret[str(self.packets_counter)]['details'] = self._regex_helper.group("DETAILS")
-            raise ParsingDone
+    def _parse_timestamp_src_dst_details(self, line, match):
+        self.packets_counter += 1
+        packet = dict()
+        packet['timestamp'] = match.group("TIMESTAMP")
+        packet['source'] = match.group("SRC")
+        packet['destination'] = match.group("DEST")
+        packet['details'] = match.group("DETAILS")
+        self._add_record(container=self.current_ret, record=packet, key=str(self.packets_counter), complete=False)
 
     # 13:31:33.176710 IP (tos 0xc0, ttl 64, id 4236, offset 0, flags [DF], proto UDP (17), length 76)
 
@@ -101,19 +88,18 @@ class Tcpdump(GenericUnixCommand):
         r"offset\s+(?P<OFFSET>\S+),\s+flags\s+(?P<FLAGS>\S+),\s+proto\s+(?P<PROTO>\S+.*\S+),\s+"
         r"length\s+(?P<LENGTH>\S+)\)")
 
-    def _parse_timestamp_tos_ttl_id_offset_flags_proto_length(self, line):
-        if self._regex_helper.search_compiled(Tcpdump._re_timestamp_tos_ttl_id_offset_flags_proto_length, line):
-            self.packets_counter += 1
-            self.current_ret[str(self.packets_counter)] = {}
-            self.current_ret[str(self.packets_counter)]['timestamp'] = self._regex_helper.group("TIMESTAMP")
-            self.current_ret[str(self.packets_counter)]['tos'] = self._regex_helper.group("TOS")
-            self.current_ret[str(self.packets_counter)]['ttl'] = self._regex_helper.group("TTL")
-            self.current_ret[str(self.packets_counter)]['id'] = self._regex_helper.group("ID")
-            self.current_ret[str(self.packets_counter)]['offset'] = self._regex_helper.group("OFFSET")
-            self.current_ret[str(self.packets_counter)]['flags'] = self._regex_helper.group("FLAGS")
-            self.current_ret[str(self.packets_counter)]['proto'] = self._regex_helper.group("PROTO")
-            self.current_ret[str(self.packets_counter)]['length'] = self._regex_helper.group("LENGTH")
-            raise ParsingDone
+    def _parse_timestamp_tos_ttl_id_offset_flags_proto_length(self, line, match):
+        self.packets_counter += 1
+        packet = dict()
+        packet['timestamp'] = match.group("TIMESTAMP")
+        packet['tos'] = match.group("TOS")
+        packet['ttl'] = match.group("TTL")
+        packet['id'] = match.group("ID")
+        packet['offset'] = match.group("OFFSET")
+        packet['flags'] = match.group("FLAGS")
+        packet['proto'] = match.group("PROTO")
+        packet['length'] = match.group("LENGTH")
+        self._add_record(container=self.current_ret, record=packet, key=str(self.packets_counter), complete=False)
 
     # 12:08:35.714577 IP6 (class 0xba, flowlabel 0x7cb99, hlim 255, next-header SCTP (132) payload length: 64) 2a00:2222:2222:2222:2222:2222:2222:102.38472 > 2a00:2222:2222:2222:2222:2222:2222:63.38472: sctp (1) [HB REQ]
     _re_class_payload_flowlabel = re.compile(
@@ -123,21 +109,20 @@ class Tcpdump(GenericUnixCommand):
         r"(?P<DST>\S+):\s+(?P<DETAILS>.*)"
     )
 
-    def _parse_class_payload_flowlabel(self, line):
-        if self._regex_helper.search_compiled(Tcpdump._re_class_payload_flowlabel, line):
-            self.packets_counter += 1
-            str_packets_counter = str(self.packets_counter)
-            self.current_ret[str_packets_counter] = dict()
-            self.current_ret[str_packets_counter]['timestamp'] = self._regex_helper.group("TIMESTAMP")
-            self.current_ret[str_packets_counter]['class'] = self._regex_helper.group("CLASS")
-            self.current_ret[str_packets_counter]['flowlabel'] = self._regex_helper.group("FLOWLABEL")
-            self.current_ret[str_packets_counter]['hlim'] = self._regex_helper.group("HLIM")
-            self.current_ret[str_packets_counter]['next-header'] = self._regex_helper.group("NEXT_HEADER")
-            self.current_ret[str_packets_counter]['payload-length'] = self._regex_helper.group("PAYLOAD_LENGTH")
-            self.current_ret[str_packets_counter]['source'] = self._regex_helper.group("SRC")
-            self.current_ret[str_packets_counter]['destination'] = self._regex_helper.group("DST")
-            self.current_ret[str_packets_counter]['details'] = self._regex_helper.group("DETAILS")
-            raise ParsingDone
+    def _parse_class_payload_flowlabel(self, line, match):
+        self.packets_counter += 1
+        str_packets_counter = str(self.packets_counter)
+        packet = dict()
+        packet['timestamp'] = match.group("TIMESTAMP")
+        packet['class'] = match.group("CLASS")
+        packet['flowlabel'] = match.group("FLOWLABEL")
+        packet['hlim'] = match.group("HLIM")
+        packet['next-header'] = match.group("NEXT_HEADER")
+        packet['payload-length'] = match.group("PAYLOAD_LENGTH")
+        packet['source'] = match.group("SRC")
+        packet['destination'] = match.group("DST")
+        packet['details'] = match.group("DETAILS")
+        self._add_record(container=self.current_ret, record=packet, key=str_packets_counter, complete=False)
 
     # 12:08:35.714577 IP6 (class 0xba, hlim 255, next-header SCTP (132) payload length: 64) 2a00:2222:2222:2222:2222:2222:2222:102.38472 > 2a00:2222:2222:2222:2222:2222:2222:63.38472: sctp (1) [HB REQ
     _re_class_payload = re.compile(
@@ -146,67 +131,73 @@ class Tcpdump(GenericUnixCommand):
         r"(?P<DST>\S+):\s+(?P<DETAILS>.*)"
     )
 
-    def _parse_class_payload(self, line):
-        if self._regex_helper.search_compiled(Tcpdump._re_class_payload, line):
-            self.packets_counter += 1
-            str_packets_counter = str(self.packets_counter)
-            self.current_ret[str_packets_counter] = dict()
-            self.current_ret[str_packets_counter]['timestamp'] = self._regex_helper.group("TIMESTAMP")
-            self.current_ret[str_packets_counter]['class'] = self._regex_helper.group("CLASS")
-            self.current_ret[str_packets_counter]['hlim'] = self._regex_helper.group("HLIM")
-            self.current_ret[str_packets_counter]['next-header'] = self._regex_helper.group("NEXT_HEADER")
-            self.current_ret[str_packets_counter]['payload-length'] = self._regex_helper.group("PAYLOAD_LENGTH")
-            self.current_ret[str_packets_counter]['source'] = self._regex_helper.group("SRC")
-            self.current_ret[str_packets_counter]['destination'] = self._regex_helper.group("DST")
-            self.current_ret[str_packets_counter]['details'] = self._regex_helper.group("DETAILS")
-            raise ParsingDone
+    def _parse_class_payload(self, line, match):
+        self.packets_counter += 1
+        str_packets_counter = str(self.packets_counter)
+        packet = dict()
+        packet['timestamp'] = match.group("TIMESTAMP")
+        packet['class'] = match.group("CLASS")
+        packet['hlim'] = match.group("HLIM")
+        packet['next-header'] = match.group("NEXT_HEADER")
+        packet['payload-length'] = match.group("PAYLOAD_LENGTH")
+        packet['source'] = match.group("SRC")
+        packet['destination'] = match.group("DST")
+        packet['details'] = match.group("DETAILS")
+        self._add_record(container=self.current_ret, record=packet, key=str_packets_counter, complete=False)
 
     # debdev.ntp > ntp.wdc1.us.leaseweb.net.ntp: [bad udp cksum 0x7aab -> 0x9cd3!] NTPv4, length 48
     _re_src_dst_details = re.compile(r"(?P<SRC>\S+)\s+>\s+(?P<DST>\S+):\s+(?P<DETAILS>\S+.*\S+)")
 
-    def _parse_src_dst_details(self, line):
-        if self._regex_helper.search_compiled(Tcpdump._re_src_dst_details, line):
-            str_packets_counter = str(self.packets_counter)
-            if str_packets_counter not in self.current_ret:
-                self.current_ret[str_packets_counter] = dict()
-            self.current_ret[str_packets_counter]['source'] = self._regex_helper.group("SRC")
-            self.current_ret[str_packets_counter]['destination'] = self._regex_helper.group("DST")
-            self.current_ret[str_packets_counter]['details'] = self._regex_helper.group("DETAILS")
-            raise ParsingDone
+    def _parse_src_dst_details(self, line, match):
+        str_packets_counter = str(self.packets_counter)
+        if str_packets_counter not in self.current_ret:
+            self._add_record(container=self.current_ret, record=dict(), key=str_packets_counter, complete=False)
+        self.current_ret[str_packets_counter]['source'] = match.group("SRC")
+        self.current_ret[str_packets_counter]['destination'] = match.group("DST")
+        self.current_ret[str_packets_counter]['details'] = match.group("DETAILS")
 
     # Root Delay: 0.000000, Root dispersion: 1.031906, Reference-ID: (unspec)
     _re_root_delay_root_dispersion_ref_id = re.compile(
         r"(?P<ROOT>Root Delay):\s+(?P<DELAY>\S+),\s+(?P<ROOT_2>Root dispersion):\s+(?P<DISPERSION>\S+),\s+(?P<REF>Reference-ID):\s+(?P<ID>\S+)")
 
-    def _parse_root_delay_root_dipersion_ref_id(self, line):
-        if self._regex_helper.search_compiled(Tcpdump._re_root_delay_root_dispersion_ref_id, line):
-            self.current_ret[str(self.packets_counter)][self._regex_helper.group("ROOT")] = self._regex_helper.group(
-                "DELAY")
-            self.current_ret[str(self.packets_counter)][self._regex_helper.group("ROOT_2")] = self._regex_helper.group(
-                "DISPERSION")
-            self.current_ret[str(self.packets_counter)][self._regex_helper.group("REF")] = self._regex_helper.group(
-                "ID")
-            raise ParsingDone
+    def _parse_root_delay_root_dipersion_ref_id(self, line, match):
+        self.current_ret[str(self.packets_counter)][match.group("ROOT")] = match.group(
+            "DELAY")
+        self.current_ret[str(self.packets_counter)][match.group("ROOT_2")] = match.group(
+            "DISPERSION")
+        self.current_ret[str(self.packets_counter)][match.group("REF")] = match.group(
+            "ID")
 
     # Reference Timestamp:  0.000000000
     _re_timestamp_header_details = re.compile(r"(?P<TIMESTAMP_HEADER>\S+.*\S+\s+Timestamp):\s+(?P<DETAILS>\S+.*\S+)")
 
-    def _parse_header_timestamp_details(self, line):
-        if self._regex_helper.search_compiled(Tcpdump._re_timestamp_header_details, line):
-            self.current_ret[str(self.packets_counter)][
-                self._regex_helper.group("TIMESTAMP_HEADER")] = self._regex_helper.group("DETAILS")
-            raise ParsingDone
+    def _parse_header_timestamp_details(self, line, match):
+        self.current_ret[str(self.packets_counter)][
+            match.group("TIMESTAMP_HEADER")] = match.group("DETAILS")
 
     # 5 packets received by filter
     _re_packets = re.compile(
         r"(?P<PCKT>\d+)\s+(?P<GROUP>packets captured|packets received by filter|packets dropped by kernel)")
 
-    def _parse_packets(self, line):
-        if self._regex_helper.search_compiled(Tcpdump._re_packets, line):
-            temp_pckt = self._regex_helper.group('PCKT')
-            temp_group = self._regex_helper.group('GROUP')
-            self.current_ret[temp_group] = temp_pckt
-            raise ParsingDone
+    def _parse_packets(self, line, match):
+        temp_pckt = match.group('PCKT')
+        temp_group = match.group('GROUP')
+        self.current_ret[temp_group] = temp_pckt
+
+    _line_rules = LineRules([
+        LineRule(regex=_re_class_payload_flowlabel, handler='_parse_class_payload_flowlabel'),
+        LineRule(regex=_re_class_payload, handler='_parse_class_payload'),
+        LineRule(regex=_re_port_linktype_capture_size, handler='_parse_port_linktype_capture_size',
+                 literal='link-type'),
+        LineRule(regex=_re_timestamp_src_dst_details, handler='_parse_timestamp_src_dst_details'),
+        LineRule(regex=_re_timestamp_tos_ttl_id_offset_flags_proto_length,
+                 handler='_parse_timestamp_tos_ttl_id_offset_flags_proto_length'),
+        LineRule(regex=_re_src_dst_details, handler='_parse_src_dst_details'),
+        LineRule(regex=_re_root_delay_root_dispersion_ref_id, handler='_parse_root_delay_root_dipersion_ref_id',
+                 literal='Root Delay'),
+        LineRule(regex=_re_timestamp_header_details, handler='_parse_header_timestamp_details', literal='Timestamp:'),
+        LineRule(regex=_re_packets, handler='_parse_packets', literal='packets '),
+    ])
 
 
 COMMAND_OUTPUT = """
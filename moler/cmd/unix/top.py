@@ -9,9 +9,10 @@ __email__ = 'adrianna.pienkowska@nokia.com, michal.ernst@nokia.com, marcin.usiel
 
 import re
 
+from moler.parser.line_rules import LineRule, LineRules
 from moler.cmd.unix.genericunix import GenericUnixCommand
 from moler.exceptions import CommandFailure
-from moler.exceptions import ParsingDone
+from moler.helpers import convert_to_numbers
 from moler.util.converterhelper import ConverterHelper
 
 
@@ -53,139 +54,123 @@ class Top(GenericUnixCommand):
         :return: None
         """
         if is_full_line:
-            try:
-                self._command_failure(line)
-                self._parse_top_row(line)
-                self._parse_task_row(line)
-                self._parse_cpu_row(line)
-                self._parse_memory_rows(line)
-                self._parse_processes_list_headers(line)
-                self._parse_processes_list(line)
-            except ParsingDone:
-                pass
+            Top._line_rules.dispatch(self, line)
         return super(Top, self).on_new_line(line, is_full_line)
 
     _re_error = re.compile(r'top:\s*(?P<ERROR_MSG>.*)')
 
-    def _command_failure(self, line):
+    def _command_failure(self, line, match):
         """
         Parses errors from the line of command output
         :param line: Line of output of command.
-        :return: None but raises ParsingDone if line has information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if self._regex_helper.search_compiled(Top._re_error, line):
-            self.set_exception(CommandFailure(self, "ERROR: {}".format(self._regex_helper.group("ERROR_MSG"))))
-            raise ParsingDone
+        self.set_exception(CommandFailure(self, "ERROR: {}".format(match.group("ERROR_MSG"))))
 
     _re_top_row = re.compile(r'(?P<TOP_ROW>.*)\s-\s(?P<TIME>\d*:\d*:\d*)\sup\s(?P<UP_TIME>.*,.*),\s*(?P<USERS>.*)user'
                              r'.*load average:(?P<LOAD_AVE> .*)')
 
-    def _parse_top_row(self, line):
+    def _parse_top_row(self, line, match):
         """
         Parses top row from the line of command output
         :param line: Line of output of command.
-        :return: None but raises ParsingDone if line has information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if self._regex_helper.search_compiled(Top._re_top_row, line):
-            command_name = self._regex_helper.group("TOP_ROW")
-            current_time = self._regex_helper.group("TIME")
-            up_time = self._regex_helper.group("UP_TIME").replace(", ", ",")
-            users = self._converter_helper.to_number(self._regex_helper.group("USERS"))
-            load_ave = self._regex_helper.group("LOAD_AVE").split()
-            load_ave = [float(ave.strip(',')) for ave in load_ave]
-            top_row_dict = {'current time': current_time, 'up time': up_time, 'users': users, 'load average': load_ave}
-            self.current_ret.update({command_name: top_row_dict})
-            raise ParsingDone
+        command_name = match.group("TOP_ROW")
+        current_time = match.group("TIME")
+        up_time = match.group("UP_TIME").replace(", ", ",")
+        users = self._converter_helper.to_number(match.group("USERS"))
+        load_ave = match.group("LOAD_AVE").split()
+        load_ave = [float(ave.strip(',')) for ave in load_ave]
+        top_row_dict = {'current time': current_time, 'up time': up_time, 'users': users, 'load average': load_ave}
+        self.current_ret.update({command_name: top_row_dict})
 
     _re_task_row = re.compile(r'(?P<TASK_ROW>Tasks):\s*(?P<TOTAL>\d*)\s*total,\s*(?P<RUN>\d*)\s*running,\s*'
                               r'(?P<SLEEP>\d*)\s*sleeping,\s*(?P<STOP>\d*)\s*stopped, \s*(?P<ZOMBIE>\d*)\s*zombie')
 
-    def _parse_task_row(self, line):
+    def _parse_task_row(self, line, match):
         """
         Parses task row from the line of command output
         :param line: Line of output of command.
-        :return: None but raises ParsingDone if line has information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if self._regex_helper.search_compiled(Top._re_task_row, line):
-            total = self._converter_helper.to_number(self._regex_helper.group("TOTAL"))
-            running = self._converter_helper.to_number(self._regex_helper.group("RUN"))
-            sleeping = self._converter_helper.to_number(self._regex_helper.group("SLEEP"))
-            stopped = self._converter_helper.to_number(self._regex_helper.group("STOP"))
-            zombie = self._converter_helper.to_number(self._regex_helper.group("ZOMBIE"))
-            task_row_dict = {'total': total, 'running': running, 'sleeping': sleeping, 'stopped': stopped,
-                             'zombie': zombie}
-            self.current_ret.update({'tasks': task_row_dict})
-            raise ParsingDone
+        total = self._converter_helper.to_number(match.group("TOTAL"))
+        running = self._converter_helper.to_number(match.group("RUN"))
+        sleeping = self._converter_helper.to_number(match.group("SLEEP"))
+        stopped = self._converter_helper.to_number(match.group("STOP"))
+        zombie = self._converter_helper.to_number(match.group("ZOMBIE"))
+        task_row_dict = {'total': total, 'running': running, 'sleeping': sleeping, 'stopped': stopped,
+                         'zombie': zombie}
+        self.current_ret.update({'tasks': task_row_dict})
 
     _re_cpu_row = re.compile(r'.*(?P<CPU_ROW>Cpu).*:\s*(?P<US>\d*.\d*).*us,\s*(?P<SY>\d*.\d*).*sy,\s*(?P<NI>\d*.\d*)'
                              r'.*ni,\s*(?P<ID>\d*.\d*).*id,\s*(?P<WA>\d*.\d*).*wa,\s*(?P<HI>\d*.\d*)'
                              r'.*hi,\s*(?P<SI>\d*.\d*).*si,\s*(?P<ST>\d*.\d*).*st')
 
-    def _parse_cpu_row(self, line):
+    def _parse_cpu_row(self, line, match):
         """
         Parses cpu row from the line of command output
         :param line: Line of output of command.
-        :return: None but raises ParsingDone if line has information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if self._regex_helper.search_compiled(Top._re_cpu_row, line):
-            user_processed = float(self._regex_helper.group("US"))
-            system_processes = float(self._regex_helper.group("SY"))
-            upgraded_nice = float(self._regex_helper.group("NI"))
-            not_used = float(self._regex_helper.group("ID"))
-            io_operations = float(self._regex_helper.group("WA"))
-            hardware_interrupts = float(self._regex_helper.group("HI"))
-            software_interrupts = float(self._regex_helper.group("SI"))
-            steal_time = float(self._regex_helper.group("ST"))
-            cpu_row_dict = {'user processes': user_processed, 'system processes': system_processes,
-                            'not used': not_used,
-                            'upgraded nice': upgraded_nice, 'steal time': steal_time, 'IO operations': io_operations,
-                            'hardware interrupts': hardware_interrupts, 'software interrupts': software_interrupts}
-            self.current_ret.update({'%Cpu': cpu_row_dict})
-            raise ParsingDone
+        user_processed = float(match.group("US"))
+        system_processes = float(match.group("SY"))
+        upgraded_nice = float(match.group("NI"))
+        not_used = float(match.group("ID"))
+        io_operations = float(match.group("WA"))
+        hardware_interrupts = float(match.group("HI"))
+        software_interrupts = float(match.group("SI"))
+        steal_time = float(match.group("ST"))
+        cpu_row_dict = {'user processes': user_processed, 'system processes': system_processes,
+                        'not used': not_used,
+                        'upgraded nice': upgraded_nice, 'steal time': steal_time, 'IO operations': io_operations,
+                        'hardware interrupts': hardware_interrupts, 'software interrupts': software_interrupts}
+        self.current_ret.update({'%Cpu': cpu_row_dict})
 
     _re_memory_rows = re.compile(r'(?P<MEM>.*):\s*(?P<TOTAL_MEM>\d*)(?P<UNIT>.)\s*total,\s*(?P<FREE>\d*)\s*free,\s*'
                                  r'(?P<USED>\d*)\s*used[,.]\s*(?P<OTHER>\d*)\s*')
 
-    def _parse_memory_rows(self, line):
+    def _parse_memory_rows(self, line, match):
         """
         Parses memory rows from the line of command output
         :param line: Line of output of command.
-        :return: None but raises ParsingDone if line has information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if self._regex_helper.search_compiled(Top._re_memory_rows, line):
-            mem_type = self._regex_helper.group("MEM")
-            mem_total = self._if_number_convert_to_int_or_float(self._regex_helper.group("TOTAL_MEM"))
-            used = self._if_number_convert_to_int_or_float(self._regex_helper.group("USED"))
-            free = self._if_number_convert_to_int_or_float(self._regex_helper.group("FREE"))
-            cached = self._if_number_convert_to_int_or_float(self._regex_helper.group("OTHER"))
-            mem_row_dict = {'total': mem_total, 'used': used, 'free': free, 'cached': cached}
-            self.current_ret.update({mem_type: mem_row_dict})
-            raise ParsingDone
+        mem_type = match.group("MEM")
+        mem_total = self._if_number_convert_to_int_or_float(match.group("TOTAL_MEM"))
+        used = self._if_number_convert_to_int_or_float(match.group("USED"))
+        free = self._if_number_convert_to_int_or_float(match.group("FREE"))
+        cached = self._if_number_convert_to_int_or_float(match.group("OTHER"))
+        mem_row_dict = {'total': mem_total, 'used': used, 'free': free, 'cached': cached}
+        self.current_ret.update({mem_type: mem_row_dict})
 
     _re_processes_header = re.compile(r'(?P<HEADER> .*PID.*)')
 
-    def _parse_processes_list_headers(self, line):
+    def _parse_processes_list_headers(self, line, match):
         """
         Parses processes list headers from the line of command output
         :param line: Line of output of command.
-        :return: None but raises ParsingDone if line has information to handle by this method.
+        :param match: Match object of regular expression of rule.
+        :return: None
         """
-        if self._regex_helper.search_compiled(Top._re_processes_header, line) and not self._processes_list_headers:
-            self._processes_list_headers.extend(line.strip().split())
-            self.current_ret.update({'processes': list()})
-            raise ParsingDone
+        self._processes_list_headers.extend(line.strip().split())
+        self.current_ret.update({'processes': list()})
 
-    def _parse_processes_list(self, line):
+    def _parse_processes_list(self, line, match):
         """
         Parses processes list from the line of command output
         :param line: Line of output of command.
-        :return: None but raises ParsingDone if line has information to handle by this method.
+        :param match: None (rule of processes list has no regular expression).
+        :return: None
         """
-        if self._processes_list_headers:
-            processes_info = line.strip().split()
-            processes_info = [self._if_number_convert_to_int_or_float(process_info) for process_info in processes_info]
-            processes_dict = dict(zip(self._processes_list_headers, processes_info))
-            self.current_ret['processes'].append(processes_dict)
+        processes_info = convert_to_numbers(line.strip().split())
+        processes_dict = dict(zip(self._processes_list_headers, processes_info))
+        self.current_ret['processes'].append(processes_dict)
 
     def _if_number_convert_to_int_or_float(self, inscription):
         """
@@ -199,6 +184,17 @@ class Top(GenericUnixCommand):
         except ValueError:
             return inscription
 
+    _line_rules = LineRules([
+        LineRule(regex=_re_error, handler='_command_failure'),
+        LineRule(regex=_re_top_row, handler='_parse_top_row'),
+        LineRule(regex=_re_task_row, handler='_parse_task_row'),
+        LineRule(regex=_re_cpu_row, handler='_parse_cpu_row'),
+        LineRule(regex=_re_memory_rows, handler='_parse_memory_rows'),
+        LineRule(regex=_re_processes_header, handler='_parse_processes_list_headers', literal='PID',
+                 when=lambda cmd: not cmd._processes_list_headers),
+        LineRule(handler='_parse_processes_list', when=lambda cmd: bool(cmd._processes_list_headers)),
+    ])
+
 
 COMMAND_OUTPUT_without_options = """
 xyz@debian:~$ top n 1
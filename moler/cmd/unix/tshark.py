@@ -46,14 +46,15 @@ class Tshark(GenericUnixCommand):
     def _parse_pckt_time_src_dst_proto_id_seq_ttl(self, line):
         if self._regex_helper.search_compiled(Tshark._re_pckt_time_src_dst_proto_id_seq_ttl, line):
             temp_pckt = self._regex_helper.group('PCKT')
-            self.current_ret[temp_pckt] = {}
-            self.current_ret[temp_pckt]['time'] = self._regex_helper.group('TIME')
-            self.current_ret[temp_pckt]['src'] = self._regex_helper.group('SRC')
-            self.current_ret[temp_pckt]['dst'] = self._regex_helper.group('DST')
-            self.current_ret[temp_pckt]['proto'] = self._regex_helper.group('PROTO').strip()
-            self.current_ret[temp_pckt]['id'] = self._regex_helper.group('ID')
-            self.current_ret[temp_pckt]['seq'] = self._regex_helper.group('SEQ')
-            self.current_ret[temp_pckt]['ttl'] = self._regex_helper.group('TTL')
+            packet = dict()
+            packet['time'] = self._regex_helper.group('TIME')
+            packet['src'] = self._regex_helper.group('SRC')
+            packet['dst'] = self._regex_helper.group('DST')
+            packet['proto'] = self._regex_helper.group('PROTO').strip()
+            packet['id'] = self._regex_helper.group('ID')
+            packet['seq'] = self._regex_helper.group('SEQ')
+            packet['ttl'] = self._regex_helper.group('TTL')
+            self._add_record(container=self.current_ret, record=packet, key=temp_pckt)
             raise ParsingDone
 
     #     1 0.000000000          ::1 → ::1          ICMPv6 118 Echo (ping) request id=0x7b13, seq=4, hop limit=64
@@ -63,14 +64,15 @@ class Tshark(GenericUnixCommand):
     def _parse_pckt_time_src_dst_proto_id_seq_hop_limit(self, line):
         if self._regex_helper.search_compiled(Tshark._re_pckt_time_src_dst_proto_id_seq_hop_limit, line):
             temp_pckt = self._regex_helper.group('PCKT')
-            self.current_ret[temp_pckt] = {}
-            self.current_ret[temp_pckt]['time'] = self._regex_helper.group('TIME')
-            self.current_ret[temp_pckt]['src'] = self._regex_helper.group('SRC')
-            self.current_ret[temp_pckt]['dst'] = self._regex_helper.group('DST')
-            self.current_ret[temp_pckt]['proto'] = self._regex_helper.group('PROTO').strip()
-            self.current_ret[temp_pckt]['id'] = self._regex_helper.group('ID')
-            self.current_ret[temp_pckt]['seq'] = self._regex_helper.group('SEQ')
-            self.current_ret[temp_pckt]['hop_limit'] = self._regex_helper.group('HOP')
+            packet = dict()
+            packet['time'] = self._regex_helper.group('TIME')
+            packet['src'] = self._regex_helper.group('SRC')
+            packet['dst'] = self._regex_helper.group('DST')
+            packet['proto'] = self._regex_helper.group('PROTO').strip()
+            packet['id'] = self._regex_helper.group('ID')
+            packet['seq'] = self._regex_helper.group('SEQ')
+            packet['hop_limit'] = self._regex_helper.group('HOP')
+            self._add_record(container=self.current_ret, record=packet, key=temp_pckt)
             raise ParsingDone
 
     # 9 packets captured
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Pipelined execution of many Unix commands on one connection.
+
+Commands are sent back-to-back in one shell line, separated by echo of unique markers:
+
+    echo MARKER_0; cmd_1; echo MARKER_1; cmd_2; echo MARKER_2
+
+so there is one round trip (and one slot in CommandScheduler) for all of them instead of one per command.
+Output between markers is passed to parser of matching command as if the command was run alone:
+echo of its command string, its output lines and the prompt found after the last marker.
+That way results and exceptions of commands are the same as when they are run one by one.
+
+Only non interactive commands may be pipelined - commands never see data before whole pipeline is done so they
+can't answer any question of device.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import time
+
+from moler.cmd.commandtextualgeneric import CommandTextualGeneric
+from moler.cmd.unix.genericunix import GenericUnixCommand
+from moler.exceptions import CommandFailure
+from moler.exceptions import CommandTimeout
+from moler.exceptions import WrongUsage
+from moler.helpers import instance_id
+from moler.helpers import remove_all_known_special_chars
+
+
+class CommandPipeline(CommandTextualGeneric):
+    """Runs many Unix commands as one shell line. Result is list of results or exceptions of commands."""
+
+    def __init__(self, connection, commands, prompt=None, newline_chars=None, runner=None):
+        """
+        :param connection: Moler connection to device, terminal when commands are executed.
+        :param commands: list of not started objects of GenericUnixCommand using the same connection.
+        :param prompt: prompt (on system where commands run).
+        :param newline_chars: Characters to split lines - list.
+        :param runner: Runner to run pipeline.
+        """
+        super(CommandPipeline, self).__init__(connection=connection, prompt=prompt, newline_chars=newline_chars,
+                                              runner=runner)
+        self.commands = list(commands)
+        uid = instance_id(self)
+        # Marker is quoted in command string so echo of command string never contains line equal to marker.
+        self._markers = ["MOLER_PIPELINE_{}_{}".format(uid, nr) for nr in range(len(self.commands) + 1)]
+        self._quoted_markers = ["MOLER''_PIPELINE_{}_{}".format(uid, nr) for nr in range(len(self.commands) + 1)]
+        self._segments = [list() for _ in self.commands]  # output lines of every command
+        self._markers_found = 0
+        self._commands_finished = False
+        self.ret_required = False
+        self._validate_commands()
+
+    def _validate_commands(self):
+        """
+        Checks if commands may be pipelined.
+
+        :return: None
+        :raise WrongUsage: if any command cannot be pipelined.
+        """
+        if not self.commands:
+            raise WrongUsage("{}: no commands to run.".format(self))
+        for cmd in self.commands:
+            if not isinstance(cmd, GenericUnixCommand):
+                raise WrongUsage("{}: only GenericUnixCommand may be pipelined, not {}.".format(self, cmd))
+            if cmd.connection is not self.connection:
+                raise WrongUsage("{}: command {} uses other connection.".format(self, cmd))
+            if cmd.life_status._is_running or cmd.done():
+                raise WrongUsage("{}: command {} is already started.".format(self, cmd))
+            if not cmd.newline_after_command_string:
+                raise WrongUsage("{}: command {} is not sent as full line.".format(self, cmd))
+
+    def build_command_string(self):
+        """
+        Builds one shell line with all commands separated by echo of markers.
+
+        :return: String with command.
+        """
+        parts = ["echo {}".format(self._quoted_markers[0])]
+        for cmd, quoted_marker in zip(self.commands, self._quoted_markers[1:]):
+            parts.append(cmd.command_string)
+            parts.append("echo {}".format(quoted_marker))
+        return "; ".join(parts)
+
+    def on_new_line(self, line, is_full_line):
+        """
+        Splits output into segments of commands. Output is passed to commands when prompt after last marker is found.
+
+        :param line: Line to parse, new lines are trimmed
+        :param is_full_line: True if new line character was removed from line, False otherwise
+        :return: None
+        """
+        clean_line = remove_all_known_special_chars(line)
+        if self._markers_found == len(self._markers):
+            if self.is_end_of_cmd_output(clean_line):
+                self._finish_commands(prompt_line=line)
+                if not self.done():
+                    self.set_result(self.outcomes())
+            return
+        if not is_full_line:
+            return
+        if clean_line.strip() == self._markers[self._markers_found]:
+            self._markers_found += 1
+        elif self._markers_found > 0:
+            self._segments[self._markers_found - 1].append(line)
+
+    def on_timeout(self):
+        """
+        Commands fail with timeout at once, pipeline may still wait for prompt.
+
+        :return: None
+        """
+        super(CommandPipeline, self).on_timeout()
+        self._finish_commands(prompt_line=None)
+
+    def on_done(self):
+        """
+        Commands not finished by their output (pipeline failed or command didn't find its prompt) fail with timeout.
+
+        :return: None
+        """
+        self._finish_commands(prompt_line=None)
+
+    def _finish_commands(self, prompt_line):
+        """
+        Passes output to commands and ends commands not finished by their output.
+
+        :param prompt_line: prompt found after last marker, None if pipeline didn't reach it.
+        :return: None
+        """
+        if self._commands_finished:
+            return
+        self._commands_finished = True
+        recv_time = self._last_recv_time_data_read_from_connection
+        for cmd, lines in zip(self.commands, self._segments):
+            cmd.life_status.start_time = self.life_status.start_time
+            if prompt_line is not None:
+                newline = cmd._newline_chars[0]
+                output = [cmd.command_string] + lines + [prompt_line]
+                data = newline.join(output)
+                try:
+                    cmd.data_received(data, recv_time)
+                except Exception as exc:
+                    # the same as runner does for exception raised by command in serial mode
+                    ex_msg = "Unexpected exception from {} caught by runner when processing data >>{}<< at '{}':" \
+                             " >>>{}<<< -> repr: >>>{}<<<".format(cmd, data, recv_time, exc, repr(exc))
+                    cmd.set_exception(CommandFailure(command=cmd, message=ex_msg))
+            if not cmd.done():
+                cmd.set_exception(CommandTimeout(cmd,
+                                                 timeout=self.timeout,
+                                                 kind="pipeline",
+                                                 passed_time=time.time() - self.life_status.start_time))
+                cmd.set_end_of_life()
+
+    def outcomes(self):
+        """
+        :return: list of results or exceptions of commands, in order of commands.
+        """
+        outcomes = list()
+        for cmd in self.commands:
+            try:
+                outcomes.append(cmd.result())
+            except Exception as ex:
+                outcomes.append(ex)
+        return outcomes
@@ -7,8 +7,9 @@ __email__ = 'marcin.usielski@nokia.com'
 import threading
 import time
 import logging
+from collections import deque
 from moler.exceptions import CommandTimeout
-from threading import Thread
+from moler.util.shared_timer import get_process_timer
 
 
 class CommandScheduler(object):
@@ -25,13 +26,8 @@ class CommandScheduler(object):
         if not connection_observer.is_command():  # Passed observer, not command.
             scheduler._submit(connection_observer)
             return
-        if scheduler._add_command_to_connection(cmd=connection_observer, wait_for_slot=False):
-            #  We have a free slot available
-            return
-        # We have to wait to finish other command(s) so let's do it in another thread.
-        t1 = Thread(target=scheduler._add_command_to_connection, args=(connection_observer, True))
-        t1.setDaemon(True)
-        t1.start()
+        # If there is no free slot then command waits in queue. It is submitted when previous command is removed.
+        scheduler._add_command_to_connection(cmd=connection_observer, wait_for_slot=True)
 
     @staticmethod
     def dequeue_running_on_connection(connection_observer):
@@ -79,27 +75,18 @@ class CommandScheduler(object):
         """
         Adds command to execute on connection.
         :param cmd: Command object to add to connection
-        :param wait_for_slot: If True then waits till command timeout or there is free slot to execute command. If False
-        then returns immediately regardless there is free slot or not.
+        :param wait_for_slot: If True then command is queued if there is no free slot. Queued command is submitted when
+         previous commands are removed or fails with timeout. If False then returns immediately regardless there is free
+         slot or not.
         :return: True if command was marked as current executed, False if command cannot be set as current executed.
         """
         if self._add_command_to_execute(cmd=cmd):
             self._submit(cmd)
             return True
-        else:
-            if wait_for_slot:
-                self._add_command_to_queue(cmd=cmd)
-                start_time = cmd.life_status.start_time
-                if self._wait_for_slot_for_command(cmd=cmd):
-                    self._submit(connection_observer=cmd)
-                    return True
-                # If we are here it means command timeout before it really starts.
-                cmd.set_exception(CommandTimeout(cmd,
-                                                 timeout=cmd.timeout,
-                                                 kind="scheduler.await_done",
-                                                 passed_time=time.time() - start_time))
-                cmd.set_end_of_life()
-                self._remove_command(cmd=cmd)
+        if wait_for_slot:
+            self._add_command_to_queue(cmd=cmd)
+            # Previous command might be removed just before command was added to queue.
+            self._start_next_command(connection=cmd.connection)
         return False
 
     def _lock_for_connection(self, connection):
@@ -120,51 +107,83 @@ class CommandScheduler(object):
         """
         ret = dict()
         ret['lock'] = threading.Lock()
-        ret['queue'] = list()
+        ret['queue'] = deque()
         ret['current_cmd'] = None
+        ret['timeouts'] = dict()  # id(cmd) -> TimerHandle of timeout of command waiting in queue
         return ret
 
-    def _wait_for_slot_for_command(self, cmd):
+    def _timeout_queued_command(self, cmd):
         """
-        Waits for free slot for the command.
+        Called by timer when command waits in queue for its whole timeout.
         :param cmd: Command object.
-        :return: True if command was marked as ready to execute, False if timeout.
+        :return: None.
         """
         connection = cmd.connection
         lock = self._lock_for_connection(connection)
-        start_time = time.time()
         conn_atr = self._locks[connection]
-        while cmd.timeout >= (time.time() - start_time):
-            time.sleep(0.005)
-            with lock:
-                if conn_atr['current_cmd'] is None and len(conn_atr['queue']) >= 1 and cmd == conn_atr['queue'][0]:
-                    conn_atr['queue'].pop(0)
-                    conn_atr['current_cmd'] = cmd
-                    cmd._log(logging.DEBUG,
-                             ">'{}': added  added cmd ('{}') from queue.".format(
-                                 cmd.connection.name, cmd))
-                    return True
-        return False
+        with lock:
+            if cmd not in conn_atr['queue']:
+                return  # command is already started or removed
+            passed_time = time.time() - cmd.life_status.start_time
+            if cmd.timeout > passed_time:  # timeout of command was extended
+                conn_atr['timeouts'][id(cmd)] = get_process_timer().call_later(cmd.timeout - passed_time,
+                                                                               self._timeout_queued_command, cmd)
+                return
+            conn_atr['queue'].remove(cmd)
+            del conn_atr['timeouts'][id(cmd)]
+        # If we are here it means command timeout before it really starts.
+        cmd.set_exception(CommandTimeout(cmd,
+                                         timeout=cmd.timeout,
+                                         kind="scheduler.await_done",
+                                         passed_time=passed_time))
+        cmd.set_end_of_life()
+        self._remove_command(cmd=cmd)
+
+    def _start_next_command(self, connection):
+        """
+        Hands free slot of connection over to first command waiting in queue and submits it.
+        :param connection: connection to start next command on.
+        :return: None.
+        """
+        lock = self._lock_for_connection(connection)
+        conn_atr = self._locks[connection]
+        with lock:
+            if conn_atr['current_cmd'] is not None or not conn_atr['queue']:
+                return
+            cmd = conn_atr['queue'].popleft()
+            conn_atr['current_cmd'] = cmd
+            timeout_handle = conn_atr['timeouts'].pop(id(cmd), None)
+        if timeout_handle:
+            timeout_handle.cancel()
+        cmd._log(logging.DEBUG, ">'{}': added cmd ('{}') from queue.".format(cmd.connection.name, cmd))
+        # Submit from timer thread - here we may be inside thread making previous command done (f.ex. connection
+        # thread passing data to observers).
+        get_process_timer().call_soon(self._submit, cmd)
 
     def _remove_command(self, cmd):
         """
-        Removes command object from queue and/or current executed. It is safe to call this method many times for the
-         same command object.
+        Removes command object from queue and/or current executed. If command was current executed then first command
+         waiting in queue is started. It is safe to call this method many times for the same command object.
         :param cmd: Command object
         :return: None.
         """
         connection = cmd.connection
         lock = self._lock_for_connection(connection)
         conn_atr = self._locks[connection]
+        slot_released = False
         with lock:
             if cmd == conn_atr['current_cmd']:
                 conn_atr['current_cmd'] = None
+                slot_released = True
             try:
-                queue = conn_atr['queue']
-                index = queue.index(cmd)
-                queue.pop(index)
-            except ValueError:  # command object does not exist in the list
+                conn_atr['queue'].remove(cmd)
+            except ValueError:  # command object does not exist in the queue
                 pass
+            timeout_handle = conn_atr['timeouts'].pop(id(cmd), None)
+        if timeout_handle:
+            timeout_handle.cancel()
+        if slot_released:
+            self._start_next_command(connection=connection)
 
     def _add_command_to_execute(self, cmd):
         """
@@ -192,6 +211,8 @@ class CommandScheduler(object):
         conn_atr = self._locks[connection]
         with lock:
             conn_atr['queue'].append(cmd)
+            conn_atr['timeouts'][id(cmd)] = get_process_timer().call_at(cmd.life_status.start_time + cmd.timeout,
+                                                                        self._timeout_queued_command, cmd)
 
     def _does_it_wait_in_queue(self, cmd):
         connection = cmd.connection
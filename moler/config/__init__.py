@@ -119,6 +119,18 @@ def load_connection_from_config(config):
             defaults = config['IO_TYPES']['default_variant']
             for io_type, variant in defaults.items():
                 conn_cfg.set_default_variant(io_type, variant)
+    if 'OBSERVERS_DISPATCH' in config:
+        dispatch = config['OBSERVERS_DISPATCH']
+        conn_cfg.set_observers_dispatch(mode=dispatch['MODE'], workers=dispatch.get('WORKERS', None),
+                                        scope=dispatch.get('SCOPE', None))
+    if 'DATA_COALESCING' in config:
+        coalescing = config['DATA_COALESCING']
+        conn_cfg.set_data_coalescing(window=coalescing['WINDOW'], max_bytes=coalescing.get('MAX_BYTES', None),
+                                     on_newline=coalescing.get('ON_NEWLINE', None))
+    if 'SSH_TRANSPORT_POOL' in config:
+        pool = config['SSH_TRANSPORT_POOL']
+        conn_cfg.set_ssh_transport_pool(active=pool.get('ACTIVE', True), max_channels=pool.get('MAX_CHANNELS', None),
+                                        idle_timeout=pool.get('IDLE_TIMEOUT', None))
 
 
 def _load_topology(topology):
@@ -137,6 +149,30 @@ def _load_topology(topology):
                 device.add_neighbour_device(neighbour_device=neighbour_device, bidirectional=True)
 
 
+def _load_devices_options(devices_config, add_only):
+    """
+    Loads options of DEVICES section (all entries which are not definitions of devices) and removes them from section.
+
+    :param devices_config: dict of DEVICES section of config.
+    :param add_only: True if only new devices are added (default connection is not changed).
+    :return: tuple (create_at_startup, logical topology or None)
+    """
+    if 'DEFAULT_CONNECTION' in devices_config:
+        default_conn = devices_config.pop('DEFAULT_CONNECTION')
+        if add_only is False:
+            conn_desc = default_conn['CONNECTION_DESC']
+            dev_cfg.set_default_connection(**conn_desc)
+
+    create_at_startup = devices_config.pop('CREATE_AT_STARTUP', False)
+
+    if 'OBSERVERS_CACHE_FILE' in devices_config:
+        from moler.observer_registry import set_cache_file
+        set_cache_file(devices_config.pop('OBSERVERS_CACHE_FILE'))
+
+    topology = devices_config.pop('LOGICAL_TOPOLOGY', None)
+    return create_at_startup, topology
+
+
 def load_device_from_config(config, add_only=False):
     create_at_startup = False
     topology = None
@@ -145,16 +181,7 @@ def load_device_from_config(config, add_only=False):
     from moler.device.device import DeviceFactory
 
     if 'DEVICES' in config:
-        if 'DEFAULT_CONNECTION' in config['DEVICES']:
-            default_conn = config['DEVICES'].pop('DEFAULT_CONNECTION')
-            if add_only is False:
-                conn_desc = default_conn['CONNECTION_DESC']
-                dev_cfg.set_default_connection(**conn_desc)
-
-        if 'CREATE_AT_STARTUP' in config['DEVICES']:
-            create_at_startup = config['DEVICES'].pop('CREATE_AT_STARTUP')
-
-        topology = config['DEVICES'].pop('LOGICAL_TOPOLOGY', None)
+        create_at_startup, topology = _load_devices_options(devices_config=config['DEVICES'], add_only=add_only)
 
         for device_name in config['DEVICES']:
             device_def = config['DEVICES'][device_name]
@@ -220,6 +247,11 @@ def load_logger_from_config(config):
             log_cfg.configure_debug_level(level=config['LOGGER']['DEBUG_LEVEL'])
         if 'DATE_FORMAT' in config['LOGGER']:
             log_cfg.set_date_format(config['LOGGER']['DATE_FORMAT'])
+        if 'CALLER_LOOKUP' in config['LOGGER']:
+            log_cfg.set_caller_lookup(config['LOGGER']['CALLER_LOOKUP'])
+        if 'ASYNC' in config['LOGGER']:
+            log_cfg.set_async_logging(active=config['LOGGER']['ASYNC'],
+                                      queue_size=config['LOGGER'].get('ASYNC_QUEUE_SIZE', None))
 
     log_cfg.configure_moler_main_logger()
 
@@ -14,6 +14,18 @@ from moler.exceptions import MolerException
 
 default_variant = {}
 named_connections = {}
+# How ThreadedMolerConnection passes received data to its observers:
+# 'thread' - separate thread per observer, 'pool' - bounded pool of worker threads shared by observers
+# pool may be shared by all connections of process (scope 'process') or created per connection (scope 'connection')
+observers_dispatch = {'mode': 'thread', 'workers': 4, 'scope': 'process'}
+observers_dispatch_modes = ['thread', 'pool']
+observers_dispatch_scopes = ['process', 'connection']
+# How ThreadedMolerConnection merges small reads of external-IO into one dispatch to observers:
+# data arriving within 'window' seconds after previous dispatch is collected till window ends, 'max_bytes' are
+# collected or (if 'on_newline') newline arrives. Window 0 means no coalescing.
+data_coalescing = {'window': 0.0, 'max_bytes': 4096, 'on_newline': False}
+# Whether sshshell connections take ssh transport from pool shared by process (one login per host/port/username)
+ssh_transport_pool = {'active': False, 'max_channels': 10, 'idle_timeout': 60.0}
 
 
 def set_default_variant(io_type, variant):
@@ -41,10 +53,72 @@ def define_connection(name, io_type, **constructor_kwargs):
     named_connections[name] = (io_type, constructor_kwargs)
 
 
+def set_observers_dispatch(mode, workers=None, scope=None):
+    """
+    Select how connection data is passed to observers.
+
+    :param mode: 'thread' (thread per observer) or 'pool' (pool of worker threads)
+    :param workers: number of worker threads of pool (used only for 'pool' mode)
+    :param scope: 'process' (one pool for all connections) or 'connection' (pool per connection)
+    :return: None
+    """
+    if mode not in observers_dispatch_modes:
+        err_msg = "Unknown observers dispatch mode '{}'. Allowed are: {}".format(mode, observers_dispatch_modes)
+        raise MolerException(err_msg)
+    if scope is not None and scope not in observers_dispatch_scopes:
+        err_msg = "Unknown observers dispatch scope '{}'. Allowed are: {}".format(scope, observers_dispatch_scopes)
+        raise MolerException(err_msg)
+    observers_dispatch['mode'] = mode
+    if workers is not None:
+        observers_dispatch['workers'] = int(workers)
+    if scope is not None:
+        observers_dispatch['scope'] = scope
+
+
+def set_data_coalescing(window, max_bytes=None, on_newline=None):
+    """
+    Select how connection merges small reads into one dispatch to observers.
+    First data after idle (no dispatch for window) is passed to observers without delay.
+
+    :param window: time (in seconds) to collect data before dispatch, 0 to pass every read immediately
+    :param max_bytes: collected data is dispatched when it reaches that size
+    :param on_newline: True to dispatch collected data when read ends with newline char
+    :return: None
+    """
+    if window < 0:
+        raise MolerException("Data coalescing window must not be negative, got {}".format(window))
+    data_coalescing['window'] = float(window)
+    if max_bytes is not None:
+        data_coalescing['max_bytes'] = int(max_bytes)
+    if on_newline is not None:
+        data_coalescing['on_newline'] = on_newline
+
+
+def set_ssh_transport_pool(active=True, max_channels=None, idle_timeout=None):
+    """
+    Select if sshshell connections share ssh transports of process-wide pool.
+
+    :param active: True to take ssh transport from pool, False to create transport per connection
+    :param max_channels: max number of shell channels carried by one transport
+    :param idle_timeout: time (in seconds) to keep transport open after its last channel is closed
+    :return: None
+    """
+    if max_channels is not None and int(max_channels) < 1:
+        raise MolerException("Ssh transport must carry at least 1 channel, got {}".format(max_channels))
+    ssh_transport_pool['active'] = active
+    if max_channels is not None:
+        ssh_transport_pool['max_channels'] = int(max_channels)
+    if idle_timeout is not None:
+        ssh_transport_pool['idle_timeout'] = float(idle_timeout)
+
+
 def clear():
     """Cleanup configuration related to connections"""
     default_variant.clear()
     named_connections.clear()
+    observers_dispatch.update({'mode': 'thread', 'workers': 4, 'scope': 'process'})
+    data_coalescing.update({'window': 0.0, 'max_bytes': 4096, 'on_newline': False})
+    ssh_transport_pool.update({'active': False, 'max_channels': 10, 'idle_timeout': 60.0})
 
 
 def set_defaults():
@@ -147,24 +221,9 @@ def _register_builtin_connections(connection_factory, moler_conn_class):
 
     def sshshell_thd_conn(host=None, port=None, username=None, login=None, password=None, name=None,
                           reuse_ssh_of_shell=None, **kwargs):
-        mlr_conn = mlr_conn_utf8_with_clean_vt100(moler_conn_class, name=name)
-        if reuse_ssh_of_shell:
-            if not ((host is None) and (port is None) and (username is None) and (login is None) and (password is None)):
-                incorrect_params = "host/port/username/login/password"
-                when = "building sshshell reusing ssh of other sshshell"
-                err_msg = "Don't use {} when {}".format(incorrect_params, when)
-                raise MolerException(err_msg)
-            io_conn = ThreadedSshShell.from_sshshell(moler_connection=mlr_conn,  # TODO: add name
-                                                     sshshell=reuse_ssh_of_shell,
-                                                     **kwargs)  # logger_name
-        else:
-            if port is None:
-                port = 22
-            io_conn = ThreadedSshShell(moler_connection=mlr_conn,  # TODO: add name
-                                       host=host, port=port,
-                                       username=username, login=login, password=password,
-                                       **kwargs)  # receive_buffer_size, logger_name, other login credentials
-        return io_conn
+        return _sshshell_conn(ThreadedSshShell, moler_conn_class, host=host, port=port, username=username,
+                              login=login, password=password, name=name, reuse_ssh_of_shell=reuse_ssh_of_shell,
+                              **kwargs)
 
     # TODO: unify passing logger to io_conn (logger/logger_name - see above comments)
     connection_factory.register_construction(io_type="memory",
@@ -178,8 +237,38 @@ def _register_builtin_connections(connection_factory, moler_conn_class):
                                              constructor=sshshell_thd_conn)
 
 
+def _sshshell_conn(sshshell_class, moler_conn_class, host=None, port=None, username=None, login=None, password=None,
+                   name=None, reuse_ssh_of_shell=None, **kwargs):
+    mlr_conn = mlr_conn_utf8_with_clean_vt100(moler_conn_class, name=name)
+    if reuse_ssh_of_shell:
+        if not ((host is None) and (port is None) and (username is None) and (login is None) and (password is None)):
+            incorrect_params = "host/port/username/login/password"
+            when = "building sshshell reusing ssh of other sshshell"
+            err_msg = "Don't use {} when {}".format(incorrect_params, when)
+            raise MolerException(err_msg)
+        io_conn = sshshell_class.from_sshshell(moler_connection=mlr_conn,  # TODO: add name
+                                               sshshell=reuse_ssh_of_shell,
+                                               **kwargs)  # logger_name
+    else:
+        if port is None:
+            port = 22
+        if ssh_transport_pool['active'] and ('transport_pool' not in kwargs):
+            from moler.io.raw.sshshell import get_ssh_transport_pool
+            pool = get_ssh_transport_pool()
+            pool.max_channels_per_transport = ssh_transport_pool['max_channels']
+            pool.idle_timeout = ssh_transport_pool['idle_timeout']
+            kwargs['transport_pool'] = pool
+        io_conn = sshshell_class(moler_connection=mlr_conn,  # TODO: add name
+                                 host=host, port=port,
+                                 username=username, login=login, password=password,
+                                 **kwargs)  # receive_buffer_size, logger_name, other login credentials
+    return io_conn
+
+
 def _register_python3_builtin_connections(connection_factory, moler_conn_class):
     from moler.io.asyncio.tcp import AsyncioTcp, AsyncioInThreadTcp
+    from moler.io.raw.tcp import ReactorTcp
+    from moler.io.raw.sshshell import ReactorSshShell
 
     def tcp_asyncio_conn(port, host='localhost', name=None, **kwargs):  # kwargs to pass  receive_buffer_size and logger
         mlr_conn = mlr_conn_utf8(moler_conn_class, name=name)
@@ -193,7 +282,25 @@ def _register_python3_builtin_connections(connection_factory, moler_conn_class):
                                      port=port, host=host, **kwargs)  # TODO: add name
         return io_conn
 
+    def tcp_selector_conn(port, host='localhost', name=None, **kwargs):  # kwargs to pass  receive_buffer_size and logger
+        mlr_conn = mlr_conn_utf8(moler_conn_class, name=name)
+        io_conn = ReactorTcp(moler_connection=mlr_conn,
+                             port=port, host=host, **kwargs)  # TODO: add name
+        return io_conn
+
+    def sshshell_selector_conn(host=None, port=None, username=None, login=None, password=None, name=None,
+                               reuse_ssh_of_shell=None, **kwargs):
+        return _sshshell_conn(ReactorSshShell, moler_conn_class, host=host, port=port, username=username,
+                              login=login, password=password, name=name, reuse_ssh_of_shell=reuse_ssh_of_shell,
+                              **kwargs)
+
     # TODO: unify passing logger to io_conn (logger/logger_name - see above comments)
+    connection_factory.register_construction(io_type="tcp",
+                                             variant="selector",
+                                             constructor=tcp_selector_conn)
+    connection_factory.register_construction(io_type="sshshell",
+                                             variant="selector",
+                                             constructor=sshshell_selector_conn)
     connection_factory.register_construction(io_type="tcp",
                                              variant="asyncio",
                                              constructor=tcp_asyncio_conn)
@@ -220,6 +327,13 @@ def _register_builtin_unix_connections(connection_factory, moler_conn_class):
 
 def _register_builtin_py3_unix_connections(connection_factory, moler_conn_class):
     from moler.io.asyncio.terminal import AsyncioTerminal, AsyncioInThreadTerminal
+    from moler.io.raw.terminal import ReactorTerminal
+
+    def terminal_selector_conn(name=None):
+        # ReactorTerminal works on unicode so moler_connection must do no encoding
+        mlr_conn = mlr_conn_no_encoding_partial_clean_vt100(moler_conn_class, name=name)
+        io_conn = ReactorTerminal(moler_connection=mlr_conn)  # TODO: add name, logger
+        return io_conn
 
     def terminal_asyncio_conn(name=None):
         mlr_conn = mlr_conn_utf8(moler_conn_class, name=name)
@@ -232,6 +346,9 @@ def _register_builtin_py3_unix_connections(connection_factory, moler_conn_class)
         return io_conn
 
     # TODO: unify passing logger to io_conn (logger/logger_name)
+    connection_factory.register_construction(io_type="terminal",
+                                             variant="selector",
+                                             constructor=terminal_selector_conn)
     connection_factory.register_construction(io_type="terminal",
                                              variant="asyncio",
                                              constructor=terminal_asyncio_conn)
@@ -7,14 +7,22 @@ __author__ = 'Grzegorz Latuszek, Marcin Usielski, Michal Ernst'
 __copyright__ = 'Copyright (C) 2018-2019, Nokia'
 __email__ = 'grzegorz.latuszek@nokia.com, marcin.usielski@nokia.com, michal.ernst@nokia.com'
 
+import atexit
 import codecs
 import logging
 import os
 import sys
 import copy
 import re
+import threading
 import pkg_resources
 import platform
+from moler.util import loghelper
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # For python 2
 
 _logging_path = os.getcwd()  # Logging path that is used as a prefix for log file paths
 active_loggers = set()  # Active loggers created by Moler
@@ -29,6 +37,8 @@ TEST_CASE = 45
 debug_level = None  # means: inactive
 raw_logs_active = False
 write_mode = "a"
+async_logging = {'active': False, 'queue_size': 10000}  # file handlers write in separate thread if active
+_async_log_writer = None
 
 moler_logo = """
                         %%%%%%%%%%%%%%%%%%%%%
@@ -112,6 +122,70 @@ def set_date_format(format):
     date_format = format
 
 
+def set_async_logging(active=True, queue_size=None):
+    """
+    Configure asynchronous writing of logs. If active then all Moler file handlers created after this call
+    pass records into one bounded queue and records are written into files by separate thread.
+    Thread producing data (i.e. pulling data from IO) doesn't wait for slow disk.
+
+    :param active: True to write logs from separate thread, False to write them in thread of log call.
+    :param queue_size: max number of records waiting for write. Log call waits if queue is full.
+    :return: None
+    """
+    async_logging['active'] = active
+    if queue_size is not None:
+        async_logging['queue_size'] = queue_size
+
+
+def flush_async_logging():
+    """
+    Wait till all records passed to asynchronous logging are written into files.
+
+    :return: None
+    """
+    if _async_log_writer is not None:
+        _async_log_writer.flush()
+
+
+def _get_async_log_writer():
+    global _async_log_writer
+    if _async_log_writer is None:
+        _async_log_writer = AsyncLogWriter(queue_size=async_logging['queue_size'])
+        atexit.register(_async_log_writer.stop)
+    return _async_log_writer
+
+
+def _add_handler(logger, handler):
+    """
+    Add file handler to logger - directly or behind asynchronous writer.
+
+    :param logger: logger to add handler to.
+    :param handler: MolerFileHandler.
+    :return: None
+    """
+    if async_logging['active']:
+        handler.flush_after_emit = False  # writer flushes after batch of records
+        logger.addHandler(AsyncLogHandler(target=handler, writer=_get_async_log_writer()))
+    else:
+        logger.addHandler(handler)
+
+
+def set_caller_lookup(caller_lookup):
+    """
+    Configure finding caller location (file, line, function) of log records.
+    Finding caller walks stack frames for every record - switch it off for high volume loggers.
+
+    :param caller_lookup: True/False for all Moler loggers or dict logger name -> True/False
+     (i.e. {'moler.connection': False}), setting of logger applies also to its children.
+    :return: None
+    """
+    if isinstance(caller_lookup, dict):
+        for logger_name, enabled in caller_lookup.items():
+            loghelper.set_caller_lookup(logger_name=logger_name, enabled=enabled)
+    else:
+        loghelper.set_caller_lookup(logger_name="moler", enabled=caller_lookup)
+
+
 def configure_debug_level(level=None):
     """
     Configure debug_level based on environment variable MOLER_DEBUG_LEVEL
@@ -159,6 +233,9 @@ def _reopen_all_logfiles_in_new_path(old_logging_path, new_logging_path):
         logger_handlers = copy.copy(logger.handlers)
 
         for handler in logger_handlers:
+            if isinstance(handler, AsyncLogHandler):
+                flush_async_logging()
+                handler = handler.target
             if isinstance(handler, logging.FileHandler):
                 handler.close()
                 handler.baseFilename = handler.baseFilename.replace(old_logging_path, new_logging_path)
@@ -189,12 +266,12 @@ def setup_new_file_handler(logger_name, log_level, log_filename, formatter, filt
     """
     global write_mode
     logger = logging.getLogger(logger_name)
-    cfh = logging.FileHandler(log_filename, write_mode)
+    cfh = MolerFileHandler(log_filename, write_mode)
     cfh.setLevel(log_level)
     cfh.setFormatter(formatter)
     if filter:
         cfh.addFilter(filter)
-    logger.addHandler(cfh)
+    _add_handler(logger, cfh)
     return cfh
 
 
@@ -232,7 +309,7 @@ def _add_raw_file_handler(logger_name, log_file):
     _prepare_logs_folder(logfile_full_path)
     logger = logging.getLogger(logger_name)
     rfh = RawFileHandler(filename=logfile_full_path, mode='{}b'.format(write_mode))
-    logger.addHandler(rfh)
+    _add_handler(logger, rfh)
 
 
 def _add_raw_trace_file_handler(logger_name, log_file):
@@ -250,7 +327,7 @@ def _add_raw_trace_file_handler(logger_name, log_file):
     # exchange Formatter
     raw_trace_formatter = RawTraceFormatter()
     trace_rfh.setFormatter(raw_trace_formatter)
-    logger.addHandler(trace_rfh)
+    _add_handler(logger, trace_rfh)
 
 
 def create_logger(name,
@@ -439,7 +516,208 @@ class RawTraceFormatter(RawDataFormatter):
         return raw_trace_record
 
 
-class RawFileHandler(logging.FileHandler):
+class MolerFileHandler(logging.FileHandler):
+    """
+    FileHandler which may leave flushing of stream to AsyncLogWriter - then many records are written at once.
+    """
+    flush_after_emit = True
+
+    def flush(self):
+        if self.flush_after_emit:
+            super(MolerFileHandler, self).flush()
+
+    def flush_written(self):
+        """
+        Flush records written into stream since last flush.
+
+        :return: None
+        """
+        super(MolerFileHandler, self).flush()
+
+
+class AsyncLogHandler(logging.Handler):
+    """
+    Handler passing records to AsyncLogWriter which writes them via target handler in writer's thread.
+    """
+
+    def __init__(self, target, writer):
+        """
+        :param target: MolerFileHandler writing records into file.
+        :param writer: AsyncLogWriter shared by all asynchronous handlers.
+        """
+        self.target = target
+        self.writer = writer
+        formatter = target.formatter
+        super(AsyncLogHandler, self).__init__(level=target.level)  # sets formatter to None
+        self.target.setFormatter(formatter)
+
+    def emit(self, record):
+        try:
+            self.writer.put(handler=self.target, record=self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    @staticmethod
+    def prepare(record):
+        """
+        Copy record since formatters may modify it and other (synchronous) handlers use the same record.
+        Message with arguments is merged now since arguments may change before record is written.
+
+        :param record: LogRecord to prepare.
+        :return: LogRecord to pass into queue.
+        """
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    @property
+    def baseFilename(self):
+        return self.target.baseFilename
+
+    @property
+    def formatter(self):
+        return self.target.formatter
+
+    @formatter.setter
+    def formatter(self, value):
+        self.target.setFormatter(value)  # formatting is done by target
+
+    def close(self):
+        self.writer.flush()
+        self.target.close()
+        super(AsyncLogHandler, self).close()
+
+
+class AsyncLogWriter(object):
+    """
+    Single thread writing records of all asynchronous handlers. Records are taken from bounded queue in batches
+    and every handler is flushed once per batch.
+    """
+
+    def __init__(self, queue_size=10000, batch_size=500):
+        """
+        :param queue_size: max number of records waiting for write. Log call waits if queue is full.
+        :param batch_size: max number of records written before flush of files.
+        """
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._stopped = False
+        self._drain_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop, name="MolerAsyncLogWriter")
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def put(self, handler, record):
+        """
+        Put record to write by handler. Waits if queue is full.
+
+        :param handler: handler to write record.
+        :param record: LogRecord to write.
+        :return: None
+        """
+        if self._stopped:
+            self._write(handler, record)
+            handler.flush_written()
+        else:
+            self._queue.put((handler, record))
+            if self._stopped:  # writer stopped while record was put
+                self._drain()
+
+    def flush(self):
+        """
+        Wait till all records put before are written and flushed.
+
+        :return: None
+        """
+        if not self._stopped:
+            self._queue.join()
+
+    def stop(self):
+        """
+        Write all waiting records and stop thread of writer. Next records are written directly.
+
+        :return: None
+        """
+        if not self._stopped:
+            self._queue.put((None, None))
+            self._thread.join()
+            self._stopped = True
+            self._drain()  # records put after request to stop
+
+    def _drain(self):
+        """
+        Write records left in queue after thread of writer is stopped.
+
+        :return: None
+        """
+        with self._drain_lock:
+            while True:
+                try:
+                    batch = [self._queue.get_nowait()]
+                except queue.Empty:
+                    return
+                self._write_batch(batch)
+                self._queue.task_done()
+
+    def _loop(self):
+        while True:
+            batch = self._take_batch()
+            stop_requested = self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop_requested:
+                return
+
+    def _take_batch(self):
+        """
+        Wait for records and take up to batch_size of them.
+
+        :return: list of tuples (handler, record).
+        """
+        batch = [self._queue.get()]
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch):
+        """
+        Write records and flush every handler once.
+
+        :param batch: list of tuples (handler, record). Handler None means request to stop.
+        :return: True if batch contains request to stop, False otherwise.
+        """
+        stop_requested = False
+        handlers_to_flush = list()
+        for handler, record in batch:
+            if handler is None:
+                stop_requested = True
+                continue
+            self._write(handler, record)
+            if handler not in handlers_to_flush:
+                handlers_to_flush.append(handler)
+        self._flush_handlers(handlers_to_flush)
+        return stop_requested
+
+    @staticmethod
+    def _flush_handlers(handlers):
+        for handler in handlers:
+            try:
+                handler.flush_written()
+            except Exception:  # log writing must not break writer thread
+                pass
+
+    @staticmethod
+    def _write(handler, record):
+        if record.levelno >= handler.level:
+            handler.handle(record)
+
+
+class RawFileHandler(MolerFileHandler):
     def __init__(self, *args, **kwargs):
         """RawFileHandler must use RawDataFormatter and level == RAW_DATA only"""
         super(RawFileHandler, self).__init__(*args, **kwargs)
@@ -32,12 +32,18 @@ def register_builtin_runners(runner_factory):
 
 def _register_builtin_runners(runner_factory):
     from moler.runner import ThreadPoolExecutorRunner
+    from moler.event_driven_runner import EventDrivenRunner
 
     def thd_runner(executor=None):
         runner = ThreadPoolExecutorRunner(executor=executor)
         return runner
 
+    def event_driven_thd_runner(timer=None):
+        runner = EventDrivenRunner(timer=timer)
+        return runner
+
     runner_factory.register_construction(variant="threaded", constructor=thd_runner)
+    runner_factory.register_construction(variant="threaded-event-driven", constructor=event_driven_thd_runner)
 
 
 def _register_python3_builtin_runners(runner_factory):
@@ -21,9 +21,9 @@ from moler.exceptions import WrongUsage
 from moler.helpers import ClassProperty
 from moler.helpers import camel_case_to_lower_case_underscore
 from moler.helpers import instance_id
-from moler.helpers import copy_list
 from moler.util.connection_observer import exception_stored_if_not_main_thread
 from moler.util.loghelper import log_into_logger
+from moler.util.unraised_exceptions import UnraisedExceptions
 from moler.runner_factory import get_runner
 from moler.command_scheduler import CommandScheduler
 from moler.util.connection_observer_life_status import ConnectionObserverLifeStatus
@@ -31,7 +31,7 @@ from moler.util.connection_observer_life_status import ConnectionObserverLifeSta
 
 @add_metaclass(ABCMeta)
 class ConnectionObserver(object):
-    _not_raised_exceptions = list()  # list of dict: "exception" and "time"
+    _not_raised_exceptions = UnraisedExceptions(max_size=1000)  # exceptions set on observers, not raised yet
     _exceptions_lock = threading.Lock()
 
     def __init__(self, connection=None, runner=None):
@@ -47,6 +47,8 @@ class ConnectionObserver(object):
         self._exception = None
         self.runner = runner if runner else get_runner()
         self._future = None
+        self._done_callbacks = list()
+        self._done_callbacks_lock = threading.Lock()
 
         self.device_logger = logging.getLogger('moler.{}'.format(self.get_logger_name()))
         self.logger = logging.getLogger('moler.connection.{}'.format(self.get_logger_name()))
@@ -92,6 +94,7 @@ class ConnectionObserver(object):
         self.life_status.is_done = value
         if value:
             CommandScheduler.dequeue_running_on_connection(connection_observer=self)
+            self._call_done_callbacks()
 
     @property
     def _is_cancelled(self):
@@ -265,6 +268,48 @@ class ConnectionObserver(object):
         self._result = result
         self._is_done = True
 
+    def add_done_callback(self, callback):
+        """
+        Add callback to be called when connection-observer becomes done (has result, exception or is cancelled).
+        If connection-observer is already done then callback is called immediately.
+        Callback is called with connection-observer as only parameter, from thread that makes observer done.
+        It should not block nor take locks of observer - if it needs more then it should pass work to other thread.
+
+        :param callback: callable to call.
+        :return: None
+        """
+        with self._done_callbacks_lock:
+            if not self.done():
+                self._done_callbacks.append(callback)
+                return
+        self._call_done_callback(callback)
+
+    def remove_done_callback(self, callback):
+        """
+        Remove callback added by add_done_callback.
+
+        :param callback: callable to remove.
+        :return: True if callback was removed, False if it was not found (maybe already called).
+        """
+        with self._done_callbacks_lock:
+            if callback in self._done_callbacks:
+                self._done_callbacks.remove(callback)
+                return True
+        return False
+
+    def _call_done_callbacks(self):
+        with self._done_callbacks_lock:
+            callbacks = self._done_callbacks
+            self._done_callbacks = list()
+        for callback in callbacks:
+            self._call_done_callback(callback)
+
+    def _call_done_callback(self, callback):
+        try:
+            callback(self)
+        except Exception as ex:
+            self._log(logging.WARNING, "Exception {!r} inside done callback {} of {}".format(ex, callback, self))
+
     def connection_closed_handler(self):
         """
         Called by Moler (ThreadedMolerConnection) when connection is closed.
@@ -324,8 +369,7 @@ class ConnectionObserver(object):
             ConnectionObserver._log_unraised_exceptions(self)
             if self._exception:
                 exception = self._exception
-                if exception in ConnectionObserver._not_raised_exceptions:
-                    ConnectionObserver._not_raised_exceptions.remove(exception)
+                ConnectionObserver._not_raised_exceptions.remove(exception)
                 raise exception
         if self.cancelled():
             raise NoResultSinceCancelCalled(self)
@@ -364,21 +408,36 @@ class ConnectionObserver(object):
         return name
 
     @staticmethod
-    def get_unraised_exceptions(remove=True):
+    def get_unraised_exceptions(remove=True, connection_name=None):
+        """
+        Get exceptions set on observers but not raised by their result().
+
+        :param remove: True to remove returned exceptions.
+        :param connection_name: name of connection (device) to get exceptions of its observers only, None for all.
+        :return: list of exceptions, oldest first.
+        """
+        with ConnectionObserver._exceptions_lock:
+            return ConnectionObserver._not_raised_exceptions.get(remove=remove, connection_name=connection_name)
+
+    @staticmethod
+    def get_dropped_unraised_exceptions_count(reset=True):
+        """
+        Get number of unraised exceptions dropped to keep registry of unraised exceptions bounded.
+
+        :param reset: True to reset counter.
+        :return: number of dropped exceptions.
+        """
         with ConnectionObserver._exceptions_lock:
-            if remove:
-                list_of_exceptions = ConnectionObserver._not_raised_exceptions
-                ConnectionObserver._not_raised_exceptions = list()
-                return list_of_exceptions
-            else:
-                list_of_exceptions = copy_list(ConnectionObserver._not_raised_exceptions)
-                return list_of_exceptions
+            dropped = ConnectionObserver._not_raised_exceptions.dropped
+            if reset:
+                ConnectionObserver._not_raised_exceptions.dropped = 0
+            return dropped
 
     @staticmethod
     def _change_unraised_exception(new_exception, observer):
         with ConnectionObserver._exceptions_lock:
             old_exception = observer._exception
-            ConnectionObserver._log_unraised_exceptions(observer)
+            connection_name = getattr(observer.connection, "name", None)
             if old_exception:
                 observer._log(logging.DEBUG,
                               "{} has overwritten exception. From {!r} to {!r}".format(
@@ -386,23 +445,23 @@ class ConnectionObserver(object):
                                   old_exception,
                                   new_exception,
                               ))
-                if old_exception in ConnectionObserver._not_raised_exceptions:
-                    ConnectionObserver._not_raised_exceptions.remove(old_exception)
-                else:
+                if not ConnectionObserver._not_raised_exceptions.replace(old_exception, new_exception,
+                                                                         connection_name=connection_name):
                     observer._log(logging.DEBUG,
                                   "{}: cannot find exception {!r} in _not_raised_exceptions.".format(
                                       observer,
                                       old_exception,
                                   ))
-                    ConnectionObserver._log_unraised_exceptions(observer)
-
-            ConnectionObserver._not_raised_exceptions.append(new_exception)
+            else:
+                ConnectionObserver._not_raised_exceptions.add(new_exception, connection_name=connection_name)
+            ConnectionObserver._log_unraised_exceptions(observer)
             observer._exception = new_exception
 
     @staticmethod
     def _log_unraised_exceptions(observer):
-        for i, item in enumerate(ConnectionObserver._not_raised_exceptions):
-            observer._log(logging.DEBUG, "{:4d} NOT RAISED: {!r}".format(i + 1, item), levels_to_go_up=2)
+        if len(ConnectionObserver._not_raised_exceptions):
+            observer._log(logging.DEBUG, "NOT RAISED: {}".format(ConnectionObserver._not_raised_exceptions.summary()),
+                          levels_to_go_up=2)
 
     def get_long_desc(self):
         return "Observer '{}.{}'".format(self.__class__.__module__, self)
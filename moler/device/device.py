@@ -9,6 +9,7 @@ __email__ = 'grzegorz.latuszek@nokia.com, marcin.usielski@nokia.com, michal.erns
 
 
 from moler.config import devices as devices_config
+from moler.config import loggers as logger_config
 from moler.instance_loader import create_instance_from_class_fullname
 from moler.helpers import copy_list
 from moler.exceptions import WrongUsage
@@ -63,6 +64,7 @@ class DeviceFactory(object):
         for device_name in devices:
             cls.remove_device(name=device_name)
         devices_config.clear()
+        logger_config.flush_async_logging()
         if clear_device_history:
             MolerTest.warning("All history of devices will be forgotten. The same names can be used again with"
                               " different meaning!")
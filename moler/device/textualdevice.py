@@ -10,24 +10,26 @@ __email__ = 'grzegorz.latuszek@nokia.com, marcin.usielski@nokia.com, michal.erns
 
 import abc
 import functools
-import importlib
-import inspect
 import logging
-import pkgutil
 import re
 import time
 import traceback
 import threading
 
+import six
+
 from moler.cmd.commandtextualgeneric import CommandTextualGeneric
-from moler.connection_observer import ConnectionObserver
+from moler.command_pipeline import CommandPipeline
 from moler.config.loggers import configure_device_logger
+from moler.connection_observer import ConnectionObserver
 from moler.connection_factory import get_connection
 from moler.device.state_machine import StateMachine
 from moler.exceptions import CommandWrongState, DeviceFailure, EventWrongState, DeviceChangeStateFailure
+from moler.exceptions import MolerException
 from moler.helpers import copy_dict, update_dict
 from moler.helpers import copy_list
 from moler.instance_loader import create_instance_from_class_fullname
+from moler.observer_registry import get_observers_of_package
 from moler.device.abstract_device import AbstractDevice
 try:
     import queue
@@ -558,36 +560,7 @@ class TextualDevice(AbstractDevice):
         return self.states
 
     def _load_cmds_from_package(self, package_name):
-        available_cmds = dict()
-        basic_module = importlib.import_module(package_name)
-        try:
-            mod_path = basic_module.__path__
-        except AttributeError:
-            module_available_cmds = self._load_cmds_from_module(module_name=package_name)
-            available_cmds.update(module_available_cmds)
-        else:
-            for importer, modname, is_pkg in pkgutil.iter_modules(mod_path):
-                module_name = "{}.{}".format(package_name, modname)
-                module_available_cmds = self._load_cmds_from_module(module_name)
-                available_cmds.update(module_available_cmds)
-
-        return available_cmds
-
-    def _load_cmds_from_module(self, module_name):
-        available_cmds = dict()
-
-        module = importlib.import_module(module_name)
-        for (cmd_class_name, cmd_module_name) in inspect.getmembers(module, inspect.isclass):
-            if cmd_module_name.__module__ == module_name:
-                cmd_class_obj = getattr(module, cmd_class_name)
-                if issubclass(cmd_class_obj, ConnectionObserver):  # module may contain other classes (f.ex. exceptions)
-                    # like:  IpAddr --> ip_addr
-                    cmd_name = cmd_class_obj.observer_name
-                    # like:  IpAddr --> moler.cmd.unix.ip_addr.IpAddr
-                    cmd_class_fullname = "{}.{}".format(module_name, cmd_class_name)
-
-                    available_cmds.update({cmd_name: cmd_class_fullname})
-        return available_cmds
+        return get_observers_of_package(package_name)
 
     def _get_observer_in_state(self, observer_name, observer_type, for_state, **kwargs):
         """Return Observable object assigned to observer_name of given device"""
@@ -645,23 +618,34 @@ class TextualDevice(AbstractDevice):
             observer = self._create_event_instance(observer_name, for_state=for_state, **kwargs)
 
         if check_state:
-            original_fun = observer._validate_start
-            creation_state = for_state
-
-            @functools.wraps(observer._validate_start)
-            def validate_device_state_before_observer_start(*args, **kargs):
-                current_state = self.current_state
-                if current_state == creation_state:
-                    ret = original_fun(*args, **kargs)
-                    return ret
-                else:
-                    exc = observer_exception(observer, creation_state, current_state)
-                    self._log(logging.ERROR, exc)
-                    raise exc
-
-            observer._validate_start = validate_device_state_before_observer_start
+            self._check_state_before_start(observer=observer, observer_exception=observer_exception,
+                                           creation_state=for_state)
         return observer
 
+    def _check_state_before_start(self, observer, observer_exception, creation_state):
+        """
+        Makes observer check at start if device is still in state where observer was created.
+
+        :param observer: command or event object.
+        :param observer_exception: class of exception raised if device changed state.
+        :param creation_state: state of device when observer was created.
+        :return: None
+        """
+        original_fun = observer._validate_start
+
+        @functools.wraps(observer._validate_start)
+        def validate_device_state_before_observer_start(*args, **kargs):
+            current_state = self.current_state
+            if current_state == creation_state:
+                ret = original_fun(*args, **kargs)
+                return ret
+            else:
+                exc = observer_exception(observer, creation_state, current_state)
+                self._log(logging.ERROR, exc)
+                raise exc
+
+        observer._validate_start = validate_device_state_before_observer_start
+
     def get_cmd(self, cmd_name, cmd_params=None, check_state=True, for_state=None):
         """
         Returns instance of command connected with the device.
@@ -700,6 +684,14 @@ class TextualDevice(AbstractDevice):
 
         return event
 
+    def get_unraised_exceptions(self, remove=True):
+        """
+        Return exceptions set on commands/events of the device which were not raised (nobody called their result()).
+        :param remove: True to remove returned exceptions.
+        :return: list of exceptions, oldest first.
+        """
+        return ConnectionObserver.get_unraised_exceptions(remove=remove, connection_name=self.name)
+
     def run(self, cmd_name, **kwargs):
         """
         Wrapper for simple use:
@@ -711,6 +703,37 @@ class TextualDevice(AbstractDevice):
         cmd = self.get_cmd(cmd_name=cmd_name, **kwargs)
         return cmd()
 
+    def run_batch(self, commands, timeout=None, check_state=True):
+        """
+        Runs many (not interactive) commands as one compound shell invocation, f.ex. for inventory of device:
+
+        uname_ret, hostname_ret = ux.run_batch(['uname', ('hostname', {'options': '-f'})])
+
+        Output of every command is parsed by its command object, the same as for run().
+
+        :param commands: list of command names or tuples (command name, dict with command parameters).
+        :param timeout: timeout for all commands, None for default.
+        :param check_state: if True then commands are run only if device is still in state where they were created.
+        :return: list of results or exceptions of commands, in order of commands.
+        """
+        cmds = list()
+        for command in commands:
+            if isinstance(command, six.string_types):
+                cmd_name, cmd_params = command, None
+            else:
+                cmd_name, cmd_params = command
+            cmds.append(self.get_cmd(cmd_name=cmd_name, cmd_params=cmd_params, check_state=False))
+        pipeline = CommandPipeline(connection=self.io_connection.moler_connection, commands=cmds,
+                                   prompt=self.get_prompt())
+        if check_state:
+            self._check_state_before_start(observer=pipeline, observer_exception=CommandWrongState,
+                                           creation_state=self.current_state)
+        pipeline.start(timeout=timeout)
+        try:
+            return pipeline.await_done()
+        except MolerException:
+            return pipeline.outcomes()  # commands not finished by their output have CommandTimeout
+
     def start(self, cmd_name, **kwargs):
         """
         Wrapper for simple use:
@@ -8,6 +8,7 @@ __author__ = 'Marcin Usielski'
 __copyright__ = 'Copyright (C) 2018, Nokia'
 __email__ = 'marcin.usielski@nokia.com'
 
+import threading
 import time
 
 
@@ -19,43 +20,73 @@ class EventAwaiter(object):
         Wait for all events are done or timeout occurs
         :param timeout: time in seconds
         :param events: list of events to check
-        :param interval: interval in seconds between checking events
+        :param interval: interval in seconds between checking events which can't notify about being done
         :return: True if all events are done, False otherwise
         """
-        grand_timeout = timeout
-        start_time = time.time()
-        all_done = True
-        while timeout >= 0:
-            time.sleep(interval)
-            all_done = True
-            for event in events:
-                if not event.done():
-                    all_done = False
-                    break
-            if all_done:
-                break
-            timeout = grand_timeout - (time.time() - start_time)
-        return all_done
+        return EventAwaiter._wait_for(timeout=timeout, events=events, all_needed=True, interval=interval)
 
     @staticmethod
     def wait_for_any(timeout, events, interval=0.001):
         """
         :param timeout: time in seconds
         :param events: list of events to check
-        :param interval: interval in seconds between checking events
+        :param interval: interval in seconds between checking events which can't notify about being done
         :return: True if any event is done, False otherwise
         """
-        grand_timeout = timeout
-        start_time = time.time()
-        any_done = False
-        while timeout >= 0 and not any_done:
-            time.sleep(interval)
-            for event in events:
-                if event.done():
-                    any_done = True
-                    break
-            timeout = grand_timeout - (time.time() - start_time)
-        return any_done
+        return EventAwaiter._wait_for(timeout=timeout, events=events, all_needed=False, interval=interval)
+
+    @staticmethod
+    def is_decided(events, all_needed):
+        """
+        :param events: list of events to check
+        :param all_needed: True if all events have to be done, False if any
+        :return: True if all (or any) events are done, False otherwise
+        """
+        if all_needed:
+            return all(event.done() for event in events)
+        return any(event.done() for event in events)
+
+    @staticmethod
+    def _wait_for(timeout, events, all_needed, interval):
+        """
+        Wait till events are done. Events are not polled - waiting thread is woken up by done callbacks of events.
+        Only events without add_done_callback() (not connection observers) are polled every interval.
+
+        :param timeout: time in seconds
+        :param events: list of events to check
+        :param all_needed: True if all events have to be done, False if any
+        :param interval: interval in seconds between checking events which can't notify about being done
+        :return: True if all (or any) events are done, False otherwise
+        """
+        decided = threading.Event()
+        polled_events = list()
+        notifying_events = list()
+
+        def _event_done(event):
+            if EventAwaiter.is_decided(events, all_needed):
+                decided.set()
+
+        for event in events:
+            if hasattr(event, 'add_done_callback'):
+                event.add_done_callback(_event_done)
+                notifying_events.append(event)
+            else:
+                polled_events.append(event)
+        try:
+            if not polled_events:
+                if not EventAwaiter.is_decided(events, all_needed):
+                    decided.wait(max(timeout, 0))
+            else:
+                end_time = time.time() + timeout
+                while not EventAwaiter.is_decided(events, all_needed):
+                    remaining = end_time - time.time()
+                    if remaining < 0:
+                        break
+                    decided.wait(min(interval, remaining))
+        finally:
+            for event in notifying_events:
+                event.remove_done_callback(_event_done)
+        return EventAwaiter.is_decided(events, all_needed)
 
     @staticmethod
     def separate_done_events(events):
@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2020 Nokia
+"""
+Runner without thread per connection-observer.
+
+ThreadPoolExecutorRunner occupies one thread of pool for each running connection-observer.
+That thread wakes up every tick just to check if observer is done, timed out or inactive.
+
+EventDrivenRunner:
+- gets data into observer the same way (subscription on connection),
+- is woken when observer becomes done (done callback fired from set_result/set_exception/cancel),
+- checks timeouts and inactivity of all observers inside one SharedTimer thread
+  that sleeps till nearest deadline of any observer.
+"""
+
+__author__ = 'Grzegorz Latuszek, Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'grzegorz.latuszek@nokia.com, marcin.usielski@nokia.com'
+
+import concurrent.futures
+import logging
+import threading
+import time
+from concurrent.futures import wait
+
+from moler.runner import ThreadPoolExecutorRunner, CancellableFuture
+from moler.runner import time_out_observer, his_remaining_time
+from moler.util.shared_timer import get_process_timer
+
+
+class ObserverFuture(CancellableFuture):
+    """
+    Future of connection-observer run by EventDrivenRunner.
+    There is no thread to stop - stopping means finishing feeding of observer.
+    """
+
+    def __init__(self, future, observer_lock, stop_running, is_done, finish_feeding, stop_timeout=0.5):
+        """
+        :param future: wrapped instance of concurrent.futures.Future
+        :param observer_lock: lock against threads race write-access to observer
+        :param stop_running: set when future is stopped
+        :param is_done: set when feeding of observer is finished
+        :param finish_feeding: callable finishing feeding of observer
+        :param stop_timeout: timeout to await is_done after setting stop_running
+        """
+        super(ObserverFuture, self).__init__(future=future, observer_lock=observer_lock, stop_running=stop_running,
+                                             is_done=is_done, stop_timeout=stop_timeout)
+        self._finish_feeding = finish_feeding
+
+    def __str__(self):
+        f_str = str(self._future)
+        return "ObserverFuture({})".format(f_str)
+
+    def _stop(self, no_wait=False):
+        self._stop_running.set()
+        self._finish_feeding()
+
+
+class _ObserverFeed(object):
+    """State of single connection-observer fed by EventDrivenRunner."""
+
+    def __init__(self, connection_observer, future, subscribed_data_receiver, stop_feeding, feed_done,
+                 observer_lock):
+        self.connection_observer = connection_observer
+        self.future = future
+        self.subscribed_data_receiver = subscribed_data_receiver
+        self.stop_feeding = stop_feeding
+        self.feed_done = feed_done
+        self.observer_lock = observer_lock
+        self.start_time = connection_observer.life_status.start_time
+        self.c_future = None
+        self.timer_handle = None
+        self.finished = False
+        self.lock = threading.Lock()  # guards timer_handle and finished
+
+
+class EventDrivenRunner(ThreadPoolExecutorRunner):
+    def __init__(self, timer=None):
+        """
+        Create instance of EventDrivenRunner class
+
+        :param timer: SharedTimer to check deadlines of observers. If None then timer shared by whole process is used.
+        """
+        self._timer = timer if timer else get_process_timer()
+        self._feeds = dict()  # id(connection_observer) -> _ObserverFeed
+        self._awaiting_submit = dict()  # id(connection_observer) -> threading.Event set when observer is submitted
+        self._feeds_lock = threading.Lock()
+        super(EventDrivenRunner, self).__init__(executor=None)
+        self.logger = logging.getLogger('moler.runner.event-driven')
+
+    def shutdown(self):
+        """Cleanup used resources."""
+        if self._in_shutdown:
+            return
+        super(EventDrivenRunner, self).shutdown()
+        with self._feeds_lock:
+            feeds = list(self._feeds.values())
+        for feed in feeds:
+            self.logger.debug("shutdown so cancelling {}".format(feed.connection_observer))
+            feed.connection_observer.cancel()
+            self._finish_feeding(feed)
+
+    def submit(self, connection_observer):
+        """
+        Submit connection observer to background execution.
+        Returns Future that could be used to await for connection_observer done.
+        """
+        assert connection_observer.life_status.start_time > 0.0  # connection-observer lifetime should already been
+        # started
+        remain_time, msg = his_remaining_time("remaining", timeout=connection_observer.timeout,
+                                              from_start_time=connection_observer.life_status.start_time)
+        self.logger.debug("go background: {!r} - {}".format(connection_observer, msg))
+
+        stop_feeding = threading.Event()
+        feed_done = threading.Event()
+        observer_lock = threading.Lock()  # against threads race write-access to observer
+        subscribed_data_receiver = self._start_feeding(connection_observer, observer_lock)
+        future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+        feed = _ObserverFeed(connection_observer=connection_observer, future=future,
+                             subscribed_data_receiver=subscribed_data_receiver, stop_feeding=stop_feeding,
+                             feed_done=feed_done, observer_lock=observer_lock)
+        c_future = ObserverFuture(future, observer_lock, stop_feeding, feed_done,
+                                  finish_feeding=lambda: self._finish_feeding(feed))
+        feed.c_future = c_future
+        connection_observer.life_status.last_feed_time = time.time()
+        with self._feeds_lock:
+            self._feeds[id(connection_observer)] = feed
+            submitted = self._awaiting_submit.get(id(connection_observer), None)
+        connection_observer.life_status.timing_listener = lambda: self._schedule_check(feed)
+        connection_observer.add_done_callback(lambda observer: self._timer.call_soon(self._finish_feeding, feed))
+        self._schedule_check(feed)
+        if submitted:
+            submitted.set()
+        return c_future
+
+    def wait_for(self, connection_observer, connection_observer_future, timeout=None):
+        """
+        Await for connection_observer running in background or timeout.
+
+        :param connection_observer: The one we are awaiting for.
+        :param connection_observer_future: Future of connection-observer returned from submit().
+        :param timeout: Max time (in float seconds) you want to await before you give up. If None then taken from connection_observer
+        :return:
+        """
+        if connection_observer.done():
+            self.logger.debug("go foreground: {} is already done".format(connection_observer))
+            self._cancel_submitted_future(connection_observer, connection_observer_future)
+            return None
+
+        max_timeout = timeout
+        observer_timeout = connection_observer.timeout
+        # we count timeout from now if timeout is given; else we use .life.status.start_time and .timeout of observer
+        start_time = time.time() if max_timeout else connection_observer.life_status.start_time
+        await_timeout = max_timeout if max_timeout else observer_timeout
+        if max_timeout:
+            remain_time, msg = his_remaining_time("await max.", timeout=max_timeout, from_start_time=start_time)
+        else:
+            remain_time, msg = his_remaining_time("remaining", timeout=observer_timeout, from_start_time=start_time)
+        self.logger.debug("go foreground: {} - {}".format(connection_observer, msg))
+
+        if connection_observer_future is None:
+            end_of_life, remain_time, connection_observer_future = self._await_future_or_eol(connection_observer,
+                                                                                             remain_time)
+            if end_of_life:
+                return None
+        if not self._execute_till_eol(connection_observer=connection_observer,
+                                      connection_observer_future=connection_observer_future,
+                                      max_timeout=max_timeout,
+                                      await_timeout=await_timeout,
+                                      remain_time=remain_time):
+            # code below is to close ConnectionObserver and future objects
+            self._end_of_life_of_future_and_connection_observer(connection_observer, connection_observer_future)
+        return None
+
+    def _execute_till_eol(self, connection_observer, connection_observer_future, max_timeout, await_timeout,
+                          remain_time):
+        if remain_time <= 0.0:
+            self._wait_for_not_started_connection_observer_is_done(connection_observer=connection_observer)
+            return False
+        future = connection_observer_future or connection_observer._future
+        assert future is not None
+        if max_timeout:
+            return super(EventDrivenRunner, self)._execute_till_eol(
+                connection_observer=connection_observer, connection_observer_future=connection_observer_future,
+                max_timeout=max_timeout, await_timeout=await_timeout, remain_time=remain_time)
+        # Timeout of observer is handled by timer of runner - here we just await end of its life.
+        while True:
+            eol_remain_time = self._eol_remain_time(connection_observer)
+            done, not_done = wait([future], timeout=eol_remain_time + self._eol_guard_time)
+            if (future in done) or connection_observer.done():
+                self._cancel_submitted_future(connection_observer, future)
+                return True
+            if self._eol_remain_time(connection_observer) <= 0.0:
+                self.logger.debug("{} not finished by runner timer at end of life".format(connection_observer))
+                return False
+
+    _eol_guard_time = 0.5  # extra await for timer of runner to finish observer at end of its life
+
+    @staticmethod
+    def _eol_remain_time(connection_observer):
+        already_passed = time.time() - connection_observer.life_status.start_time
+        eol_timeout = connection_observer.timeout + connection_observer.life_status.terminating_timeout
+        return max(eol_timeout - already_passed, 0.0)
+
+    def _wait_for_not_started_connection_observer_is_done(self, connection_observer):
+        # Have to wait till connection_observer is done with terminating timeout.
+        self._wait_till_done(connection_observer, timeout=connection_observer.life_status.terminating_timeout)
+
+    def _await_future_or_eol(self, connection_observer, remain_time):
+        # Observer lifetime started with its timeout clock
+        # but setting connection_observer._future may be delayed by nonempty commands queue.
+        # In such case we have to wait either for submit (runner sets event) or done (scheduler times out command).
+        # Returned future is taken from runner since scheduler sets connection_observer._future after submit().
+        submitted = threading.Event()
+        with self._feeds_lock:
+            self._awaiting_submit[id(connection_observer)] = submitted
+            feed = self._feeds.get(id(connection_observer), None)
+        try:
+            if (connection_observer._future is None) and (feed is None):
+                observer_eol = self._eol_remain_time(connection_observer)
+                self._wait_till_done(connection_observer, timeout=min(remain_time, observer_eol), event=submitted)
+        finally:
+            with self._feeds_lock:
+                self._awaiting_submit.pop(id(connection_observer), None)
+                feed = self._feeds.get(id(connection_observer), None)
+        if connection_observer.done():
+            self.logger.debug("{} is done before creating future".format(connection_observer))
+            return True, 0.0, None
+        future = connection_observer._future or (feed.c_future if feed else None)
+        if future is None:
+            self.logger.debug("{} timeout before creating future".format(connection_observer))
+            return False, 0.0, None
+        if self._eol_remain_time(connection_observer) <= 0.0:
+            return False, 0.0, future
+        return False, remain_time, future
+
+    @staticmethod
+    def _wait_till_done(connection_observer, timeout, event=None):
+        """
+        Await (without polling) till connection_observer is done or event is set.
+
+        :param connection_observer: ConnectionObserver to await for.
+        :param timeout: max time to await.
+        :param event: threading.Event to await together with done of connection_observer.
+        :return: None
+        """
+        event = event if event else threading.Event()
+
+        def on_done(observer):
+            event.set()
+
+        connection_observer.add_done_callback(on_done)
+        event.wait(timeout)
+        connection_observer.remove_done_callback(on_done)
+
+    def feed(self, connection_observer, subscribed_data_receiver, stop_feeding, feed_done, observer_lock):
+        """
+        Nothing to do here. Data is passed to connection_observer directly from connection
+        and timeouts are checked by timer of runner.
+        """
+
+    def _schedule_check(self, feed):
+        """
+        (Re)schedule check of observer at its nearest deadline - timeout or inactivity.
+
+        :param feed: _ObserverFeed of observer.
+        :return: None
+        """
+        connection_observer = feed.connection_observer
+        life_status = connection_observer.life_status
+        with feed.lock:
+            if feed.finished:
+                return
+            timeout = connection_observer.timeout
+            if life_status.in_terminating:
+                timeout = life_status.terminating_timeout
+            deadline = feed.start_time + timeout if timeout is not None else None
+            if (life_status.inactivity_timeout > 0.0) and (life_status.last_feed_time is not None):
+                inactivity_deadline = life_status.last_feed_time + life_status.inactivity_timeout
+                if (deadline is None) or (inactivity_deadline < deadline):
+                    deadline = inactivity_deadline
+            if self._in_shutdown:
+                deadline = time.time()
+            if feed.timer_handle is not None:
+                if feed.timer_handle.when == deadline and not feed.timer_handle.cancelled:
+                    return
+                feed.timer_handle.cancel()
+                feed.timer_handle = None
+            if deadline is not None:
+                feed.timer_handle = self._timer.call_at(deadline, self._check_observer, feed)
+
+    def _check_observer(self, feed):
+        """
+        Called by timer at deadline of observer - the same checks as ThreadPoolExecutorRunner does at each tick.
+
+        :param feed: _ObserverFeed of observer.
+        :return: None
+        """
+        connection_observer = feed.connection_observer
+        with feed.lock:
+            feed.timer_handle = None  # that one is just called
+        if feed.stop_feeding.is_set() or connection_observer.done():
+            self._finish_feeding(feed)
+            return
+        current_time = time.time()
+        run_duration = current_time - feed.start_time
+        # connection_observer.timeout may change during lifetime of connection_observer
+        timeout = connection_observer.timeout
+        if connection_observer.life_status.in_terminating:
+            timeout = connection_observer.life_status.terminating_timeout
+        if (timeout is not None) and (run_duration >= timeout):
+            if connection_observer.life_status.in_terminating:
+                msg = "{} underlying real command failed to finish during {} seconds. It will be forcefully" \
+                      " terminated".format(connection_observer, timeout)
+                self.logger.info(msg)
+                connection_observer.set_end_of_life()
+            else:
+                with feed.observer_lock:
+                    time_out_observer(connection_observer,
+                                      timeout=connection_observer.timeout,
+                                      passed_time=run_duration,
+                                      runner_logger=self.logger)
+                    in_terminating = connection_observer.life_status.terminating_timeout >= 0.0
+                    if in_terminating:
+                        feed.start_time = time.time()
+                        connection_observer.life_status.in_terminating = True
+                if not in_terminating:
+                    self._finish_feeding(feed)
+                    return
+        else:
+            self._call_on_inactivity(connection_observer=connection_observer, current_time=current_time)
+
+        if self._in_shutdown:
+            self.logger.debug("shutdown so cancelling {}".format(connection_observer))
+            connection_observer.cancel()
+        if connection_observer.done():
+            self._finish_feeding(feed)
+        else:
+            self._schedule_check(feed)
+
+    def _finish_feeding(self, feed):
+        """
+        Stop feeding observer and mark its future as finished. Safe to call many times.
+
+        :param feed: _ObserverFeed of observer.
+        :return: None
+        """
+        with feed.lock:
+            if feed.finished:
+                return
+            feed.finished = True
+            if feed.timer_handle is not None:
+                feed.timer_handle.cancel()
+                feed.timer_handle = None
+        connection_observer = feed.connection_observer
+        connection_observer.life_status.timing_listener = None
+        with self._feeds_lock:
+            self._feeds.pop(id(connection_observer), None)
+        if feed.stop_feeding.is_set():
+            self.logger.debug("stopped {}".format(connection_observer))
+        else:
+            self.logger.debug("done {}".format(connection_observer))
+        self._stop_feeding(connection_observer, feed.subscribed_data_receiver, feed.feed_done, feed.observer_lock)
+        if not feed.future.done():
+            feed.future.set_result(None)
@@ -12,6 +12,7 @@ from moler.events.textualevent import TextualEvent
 from moler.exceptions import NoDetectPatternProvided
 from moler.exceptions import WrongUsage
 from moler.helpers import instance_id, copy_list, convert_to_number
+from moler.util.regex_set import RegexSet
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -82,6 +83,7 @@ class LineEvent(TextualEvent):
     def _prepare_parameters(self):
         self.parser = self._get_parser()
         self.compiled_patterns = self.compile_patterns(self.detect_patterns)
+        self._regex_set = RegexSet(self.compiled_patterns)
 
         if self.match in ['all', 'sequence']:
             self._prepare_new_cycle_parameters()
@@ -123,26 +125,22 @@ class LineEvent(TextualEvent):
         return current_ret
 
     def _catch_any(self, line):
-        for pattern in self.compiled_patterns:
-            match = re.search(pattern, line)
-            if match:
-                self._set_current_ret(line=line, match=match)
-                return
+        _, match = self._regex_set.search_first(line=line)
+        if match:
+            self._set_current_ret(line=line, match=match)
 
     def _catch_all(self, line):
-        for index, pattern in enumerate(self.copy_compiled_patterns):
-            match = re.search(pattern, line)
-            if match:
-                del self.copy_compiled_patterns[index]
-                self._set_current_ret(line=line, match=match)
-                if self._is_single_cycle_finished():
-                    self._prepare_new_cycle_parameters()
-                return
+        index, match = self._regex_set.search_first(line=line, patterns=self.copy_compiled_patterns)
+        if match:
+            del self.copy_compiled_patterns[index]
+            self._set_current_ret(line=line, match=match)
+            if self._is_single_cycle_finished():
+                self._prepare_new_cycle_parameters()
 
     def _catch_sequence(self, line):
         if self.copy_compiled_patterns:
             pattern = self.copy_compiled_patterns[0]
-            match = re.search(pattern, line)
+            match = self._regex_set.search(pattern=pattern, line=line)
             if match:
                 del self.copy_compiled_patterns[0]
                 self._set_current_ret(line=line, match=match)
@@ -10,6 +10,7 @@ import sys
 import logging
 from moler.event import Event
 from moler.cmd import RegexHelper
+from moler.util.line_splitter import split_into_lines
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -49,25 +50,52 @@ class TextualEvent(Event):
         :return: None.
         """
         if not self._paused:
-            self._last_recv_time_data_read_from_connection = recv_time
             try:
                 # Workaround for some terminals and python 2.7
                 data = u"".join(str(data.encode("utf-8", errors="ignore"))) if sys.version_info < (3, 0) else data
-                lines = data.splitlines(True)
-                for current_chunk in lines:
+            except UnicodeDecodeError as ex:
+                self._handle_unicode_error(ex)
+                return
+            self.lines_received(lines=split_into_lines(data=data, newline_chars=self._newline_chars),
+                                recv_time=recv_time)
+
+    def lines_received(self, lines, recv_time):
+        """
+        Called with data already split into lines. Lines of data received on connection are split only once
+        and shared by all observers of connection.
+
+        :param lines: tuple of (chunk, line, is_full_line) as returned by moler.util.line_splitter.split_into_lines.
+        :param recv_time: time stamp with the moment when the data was read from connection.
+        :return: None.
+        """
+        if not self._paused:
+            self._last_recv_time_data_read_from_connection = recv_time
+            try:
+                for current_chunk, chunk_line, chunk_is_full_line in lines:
                     if not self.done():
-                        line, is_full_line = self._update_from_cached_incomplete_line(current_chunk=current_chunk)
+                        line, is_full_line = self._update_from_cached_incomplete_line(current_chunk=current_chunk,
+                                                                                      line=chunk_line,
+                                                                                      is_full_line=chunk_is_full_line)
                         self._process_line_from_output(line=line, current_chunk=current_chunk,
                                                        is_full_line=is_full_line)
                         if self._paused:
                             self._last_not_full_line = None
                             break
             except UnicodeDecodeError as ex:
-                if self._ignore_unicode_errors:
-                    self._log(lvl=logging.WARNING,
-                              msg="Processing data from '{}' with unicode problem: '{}'.".format(self, ex))
-                else:
-                    raise ex
+                self._handle_unicode_error(ex)
+
+    def _handle_unicode_error(self, ex):
+        """
+        Logs or raises UnicodeDecodeError raised while processing data.
+
+        :param ex: UnicodeDecodeError
+        :return: None.
+        """
+        if self._ignore_unicode_errors:
+            self._log(lvl=logging.WARNING,
+                      msg="Processing data from '{}' with unicode problem: '{}'.".format(self, ex))
+        else:
+            raise ex
 
     def _process_line_from_output(self, current_chunk, line, is_full_line):
         """
@@ -81,14 +109,23 @@ class TextualEvent(Event):
         decoded_line = self._decode_line(line=line)
         self.on_new_line(line=decoded_line, is_full_line=is_full_line)
 
-    def _update_from_cached_incomplete_line(self, current_chunk):
+    def _update_from_cached_incomplete_line(self, current_chunk, line=None, is_full_line=None):
         """
         Concatenates (if necessary) previous chunk(s) of line and current.
 
         :param current_chunk: line from connection (full line or incomplete one).
+        :param line: current_chunk without newline char(s) or None if not known yet.
+        :param is_full_line: True if current_chunk has newline char(s), False if not, None if not known yet.
         :return: Concatenated (if necessary) line from connection without newline char(s). Flag: True if line had
          newline char(s), False otherwise.
         """
+        if is_full_line is not None:
+            if self._last_not_full_line is not None:
+                line = "{}{}".format(self._last_not_full_line, line)
+                self._last_not_full_line = None
+            if not is_full_line:
+                self._last_not_full_line = line
+            return line, is_full_line
         line = current_chunk
         if self._last_not_full_line is not None:
             line = "{}{}".format(self._last_not_full_line, line)
@@ -4,6 +4,7 @@ __copyright__ = 'Copyright (C) 2019, Nokia'
 __email__ = 'michal.ernst@nokia.com, marcin.usielski@nokia.com'
 import datetime
 import re
+import six
 
 from moler.events.unix.genericunix_textualevent import GenericUnixTextualEvent
 from moler.exceptions import ParsingDone
@@ -11,6 +12,9 @@ from operator import attrgetter
 
 
 class Wait4prompts(GenericUnixTextualEvent):
+    _re_numbered_group_reference = re.compile(r"\\[1-9]|\(\?\(\d")  # \1 or (?(1)...) - broken by alternation
+    _prompt_group_prefix = "moler_prompt_"
+
     def __init__(self, connection, prompts, till_occurs_times=-1, runner=None):
         """
         Event for waiting for prompt
@@ -20,9 +24,33 @@ class Wait4prompts(GenericUnixTextualEvent):
         :param runner: Runner to run event
         """
         super(Wait4prompts, self).__init__(connection=connection, runner=runner, till_occurs_times=till_occurs_times)
+        self._compiled_prompts_regex = None
+        self._sorted_prompts_regex = list()  # prompts in order of checking
+        self._all_prompts_regex = None  # all prompts as one alternation to check line with one scan
         self.compiled_prompts_regex = self._compile_prompts_patterns(prompts)
         self.process_full_lines_only = False
 
+    @property
+    def compiled_prompts_regex(self):
+        """
+        Getter for compiled_prompts_regex.
+
+        :return: compiled prompt regex->state dict.
+        """
+        return self._compiled_prompts_regex
+
+    @compiled_prompts_regex.setter
+    def compiled_prompts_regex(self, value):
+        """
+        Setter for compiled_prompts_regex. Prepares prompts to check. Assign new dict to change prompts.
+
+        :param value: compiled prompt regex->state dict.
+        :return: None
+        """
+        self._compiled_prompts_regex = value
+        self._sorted_prompts_regex = sorted(value.keys(), key=attrgetter('pattern'))
+        self._all_prompts_regex = self._build_all_prompts_regex(self._sorted_prompts_regex)
+
     def on_new_line(self, line, is_full_line):
         try:
             self._parse_prompts(line)
@@ -30,7 +58,15 @@ class Wait4prompts(GenericUnixTextualEvent):
             pass
 
     def _parse_prompts(self, line):
-        for prompt_regex in sorted(self.compiled_prompts_regex.keys(), key=attrgetter('pattern')):
+        prompts_regex = self._sorted_prompts_regex
+        if self._all_prompts_regex is not None:
+            match = self._all_prompts_regex.search(line)
+            if match is None:
+                return  # No prompt in line.
+            # Alternation finds leftmost prompt in line. Prompts sorted before it may be found later in line.
+            found_prompt_index = int(match.lastgroup[len(self._prompt_group_prefix):])
+            prompts_regex = prompts_regex[:found_prompt_index + 1]
+        for prompt_regex in prompts_regex:
             if self._regex_helper.search_compiled(prompt_regex, line):
                 current_ret = {
                     'line': line,
@@ -52,6 +88,28 @@ class Wait4prompts(GenericUnixTextualEvent):
             compiled_patterns[compiled_pattern] = patterns[pattern]
         return compiled_patterns
 
+    def _build_all_prompts_regex(self, prompts_regex):
+        """
+        Builds one regex with all prompts as alternation of named groups.
+
+        :param prompts_regex: sorted list of compiled prompts.
+        :return: compiled regex or None if prompts can't be joined (different flags, numbered group references).
+        """
+        if not prompts_regex:
+            return None
+        if len(set(prompt_regex.flags for prompt_regex in prompts_regex)) != 1:
+            return None
+        alternatives = list()
+        for index, prompt_regex in enumerate(prompts_regex):
+            pattern = prompt_regex.pattern
+            if not isinstance(pattern, six.string_types) or self._re_numbered_group_reference.search(pattern):
+                return None
+            alternatives.append("(?P<{}{}>{})".format(self._prompt_group_prefix, index, pattern))
+        try:
+            return re.compile("|".join(alternatives), prompts_regex[0].flags)
+        except re.error:
+            return None
+
 
 EVENT_OUTPUT = """
 user@host01:~> TERM=xterm-mono telnet -4 host.domain.net 1500
@@ -254,6 +254,21 @@ def convert_to_number(value):
     return value
 
 
+def convert_to_numbers(values):
+    """
+    Convert many values (like column of table) to Python number type. Every distinct value is converted only once.
+    :param values: iterable of values to convert
+    :return: list of converted values (see convert_to_number)
+    """
+    converted = dict()
+    numbers = list()
+    for value in values:
+        if value not in converted:
+            converted[value] = convert_to_number(value)
+        numbers.append(converted[value])
+    return numbers
+
+
 def is_digit(value):
     """
     Check that value is digit.
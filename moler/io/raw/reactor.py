@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Single thread serving reads of many external-IO connections.
+
+Threaded connections (ThreadedTcp, ThreadedTerminal, ThreadedSshShell) have one pulling thread per connection
+waking up every few milliseconds even if there is nothing to read. SelectorReactor waits (epoll/kqueue/select
+via selectors module) for data on all registered file descriptors in one thread and calls callback of connection
+only when its descriptor is readable.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import atexit
+import logging
+import selectors
+import socket
+import threading
+
+_reactor = None
+_reactor_lock = threading.Lock()
+
+
+def get_reactor():
+    """
+    Get reactor shared by all connections. Reactor is started at first call.
+
+    :return: SelectorReactor
+    """
+    global _reactor
+    with _reactor_lock:
+        if _reactor is None:
+            _reactor = SelectorReactor()
+            _reactor.start()
+            atexit.register(_reactor.stop)
+        return _reactor
+
+
+class SelectorReactor(object):
+    """
+    Reactor calling callbacks of connections when their file descriptors are readable.
+    Registration changes are done inside reactor thread so no callback of connection is called after its unregister()
+    returns.
+    """
+
+    def __init__(self, name="MolerSelectorReactor"):
+        """
+        :param name: name of reactor thread.
+        """
+        self.logger = logging.getLogger("moler.connection.reactor")
+        self._name = name
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+        self._wakeup_writer.setblocking(False)
+        self._selector.register(self._wakeup_reader, selectors.EVENT_READ, None)
+        self._changes = list()  # list of (function, args, done_event) to call inside reactor thread
+        self._changes_lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """
+        Start reactor thread.
+
+        :return: None
+        """
+        self._thread = threading.Thread(target=self._loop, name=self._name)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop reactor thread. Callbacks of connections are not called any more.
+
+        :return: None
+        """
+        if self._thread is not None and not self._stopped.is_set():
+            self._stopped.set()
+            self._wakeup()
+            if threading.current_thread() is not self._thread:
+                self._thread.join()
+
+    def register(self, fileobj, callback):
+        """
+        Register file object to wait for its data.
+
+        :param fileobj: object with fileno() method (socket, paramiko channel) or file descriptor.
+        :param callback: callable without parameters called in reactor thread when fileobj is readable.
+         Callback should read available data and pass it to Moler's connection.
+        :return: None
+        """
+        self._change(self._register, fileobj, callback)
+
+    def unregister(self, fileobj):
+        """
+        Stop waiting for data of file object. After return callback of fileobj is not called any more.
+
+        :param fileobj: object given to register().
+        :return: None
+        """
+        self._change(self._unregister, fileobj)
+
+    def registered_count(self):
+        """
+        :return: number of file objects registered by connections.
+        """
+        return len(self._selector.get_map()) - 1  # without wakeup socket
+
+    def _change(self, function, *args):
+        if self._stopped.is_set():
+            return  # reactor doesn't serve connections any more
+        if threading.current_thread() is self._thread:
+            function(*args)
+            return
+        done = threading.Event()
+        with self._changes_lock:
+            self._changes.append((function, args, done))
+        self._wakeup()
+        while not done.wait(timeout=0.5):
+            if not self._thread.is_alive():
+                break  # reactor stopped before change was applied
+
+    def _register(self, fileobj, callback):
+        self._selector.register(fileobj, selectors.EVENT_READ, callback)
+
+    def _unregister(self, fileobj):
+        try:
+            self._selector.unregister(fileobj)
+        except (KeyError, ValueError):
+            pass  # already unregistered
+
+    def _wakeup(self):
+        try:
+            self._wakeup_writer.send(b'\x00')
+        except (socket.error, ValueError):
+            pass  # buffer full means reactor will wake up anyway
+
+    def _apply_changes(self):
+        with self._changes_lock:
+            changes = self._changes
+            self._changes = list()
+        for function, args, done in changes:
+            try:
+                function(*args)
+            except Exception as err:
+                self.logger.exception("Can't change registration in reactor: {!r}".format(err))
+            finally:
+                done.set()
+
+    def _loop(self):
+        while not self._stopped.is_set():
+            events = self._selector.select()
+            for key, _ in events:
+                if key.fileobj is self._wakeup_reader:
+                    self._drain_wakeup()
+                    continue
+                try:
+                    key.data()
+                except Exception as err:
+                    self.logger.exception("Unexpected {!r} in callback for {}".format(err, key.fileobj))
+                    self._unregister(key.fileobj)
+            self._apply_changes()
+        self._apply_changes()
+        self._selector.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_reader.recv(4096):
+                pass
+        except (socket.error, ValueError):
+            pass
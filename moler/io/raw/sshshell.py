@@ -15,6 +15,7 @@ __author__ = 'Grzegorz Latuszek'
 __copyright__ = 'Copyright (C) 2020, Nokia'
 __email__ = 'grzegorz.latuszek@nokia.com'
 
+import atexit
 import socket
 import threading
 import contextlib
@@ -31,6 +32,8 @@ from moler.io.io_exceptions import RemoteEndpointNotConnected
 from moler.io.io_connection import IOConnection
 from moler.io.raw import TillDoneThread
 import datetime
+from concurrent.futures import Future
+from six.moves.queue import Queue
 
 
 class SshShell(object):
@@ -45,7 +48,7 @@ class SshShell(object):
     _channels_of_transport = {}  # key is instance_id(transport), value is list of channel IDs
 
     def __init__(self, host, port=22, username=None, login=None, password=None, receive_buffer_size=64 * 4096,
-                 logger=None, existing_client=None):
+                 logger=None, existing_client=None, transport_pool=None):
         """
         Initialization of SshShell connection.
 
@@ -57,6 +60,7 @@ class SshShell(object):
         :param receive_buffer_size:
         :param logger: logger to use (None means no logging)
         :param existing_client: (internal use) for reusing ssh transport of existing sshshell
+        :param transport_pool: SshTransportPool to take ssh transport from (None means own transport)
         """
         super(SshShell, self).__init__()
         self.host = host
@@ -72,6 +76,8 @@ class SshShell(object):
         self.ssh_client = existing_client if existing_client else paramiko.SSHClient()
         self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         self._shell_channel = None  # MOST IMPORTANT
+        self.transport_pool = transport_pool
+        self._client_from_pool = False
         self.timeout = None
         self.await_ready_tick_resolution = 0.01
 
@@ -92,7 +98,8 @@ class SshShell(object):
         new_sshshell = cls(host=sshshell.host, port=sshshell.port,
                            username=sshshell.username, password=sshshell.password,
                            receive_buffer_size=sshshell.receive_buffer_size,
-                           logger=logger, existing_client=sshshell.ssh_client)
+                           logger=logger, existing_client=sshshell.ssh_client,
+                           transport_pool=sshshell.transport_pool)
         return new_sshshell
 
     @property
@@ -111,6 +118,7 @@ class SshShell(object):
 
         If SshShell was created with "reused ssh transport" then no new transport is created - just shell channel.
         (such connection establishment is quicker)
+        If SshShell was created with transport pool then transport is taken from pool (created there if needed).
         Else - before creating channel we create ssh transport and perform full login with provided credentials.
 
         May be used as context manager: with connection.open():
@@ -118,8 +126,14 @@ class SshShell(object):
         if self._shell_channel is None:
             self._debug('connecting to {}'.format(self))
 
+            if self.transport_pool is not None:
+                self.ssh_client = self.transport_pool.acquire(host=self.host, port=self.port,
+                                                              username=self.username, password=self.password)
+                self._client_from_pool = True
             transport = self.ssh_client.get_transport()
-            if transport is None:
+            if self._client_from_pool:
+                action = "pooled"
+            elif transport is None:
                 self.ssh_client.connect(self.host, username=self.username, password=self.password)
                 transport = self.ssh_client.get_transport()
                 action = "established"
@@ -130,7 +144,11 @@ class SshShell(object):
                               'using socket = {}'.format(transport.sock)]
             self._debug('  {} ssh transport to {}:{} |{}\n    {}'.format(action, self.host, self.port, transport,
                                                                          "\n    ".join(transport_info)))
-            self._shell_channel = self.ssh_client.invoke_shell()  # newly created channel will be connected to Pty
+            try:
+                self._shell_channel = self.ssh_client.invoke_shell()  # newly created channel will be connected to Pty
+            except Exception:
+                self._release_client_to_pool()
+                raise
             self._remember_channel_of_transport(self._shell_channel)
             self._debug('  established shell ssh to {}:{} [channel {}] |{}'.format(self.host, self.port,
                                                                                    self._shell_channel.get_id(),
@@ -185,13 +203,22 @@ class SshShell(object):
                                                                    self._shell_channel))
             self._forget_channel_of_transport(self._shell_channel)
             self._shell_channel = None
-        transport = self.ssh_client.get_transport()
+        if self._client_from_pool:
+            self._release_client_to_pool()  # pool decides when to close transport
+            transport = None
+        else:
+            transport = self.ssh_client.get_transport()
         if transport is not None:
             if self._num_channels_of_transport(transport) == 0:
                 self._debug('  closing ssh transport to {}:{} |{}'.format(self.host, self.port, transport))
                 self.ssh_client.close()
         self._info('connection {} {}is closed'.format(self, which_channel))
 
+    def _release_client_to_pool(self):
+        if self._client_from_pool:
+            self._client_from_pool = False
+            self.transport_pool.release(self.ssh_client)
+
     def __enter__(self):
         """While working as context manager connection should auto-open if it's not open yet."""
         self.open()
@@ -241,8 +268,8 @@ class SshShell(object):
                 chunk_bytes_sent = self._shell_channel.send(data2send)
                 nb_bytes_sent += chunk_bytes_sent
             else:
+                # channel window is full - wait for remote side to consume data (already sent bytes stay sent)
                 time.sleep(self.await_ready_tick_resolution)
-                nb_bytes_sent = 0
             if nb_bytes_sent >= nb_bytes_to_send:
                 break
             if time.time() - start_time >= timeout:
@@ -292,6 +319,9 @@ class SshShell(object):
     def _info(self, msg, levels_to_go_up=2):
         self._log(level=logging.INFO, msg=msg, levels_to_go_up=levels_to_go_up)
 
+    def _error(self, msg, levels_to_go_up=2):
+        self._log(level=logging.ERROR, msg=msg, levels_to_go_up=levels_to_go_up)
+
     def _log(self, msg, level, levels_to_go_up=1):
         if self.logger:
             try:
@@ -301,6 +331,186 @@ class SshShell(object):
                 print(err)  # logging errors should not propagate
 
 
+_ssh_transport_pool = None
+_ssh_transport_pool_lock = threading.Lock()
+
+
+def get_ssh_transport_pool():
+    """
+    Get ssh transport pool shared by all connections of process.
+
+    :return: SshTransportPool
+    """
+    global _ssh_transport_pool
+    with _ssh_transport_pool_lock:
+        if _ssh_transport_pool is None:
+            _ssh_transport_pool = SshTransportPool()
+            atexit.register(_ssh_transport_pool.close_all)
+        return _ssh_transport_pool
+
+
+class _PooledSshClient(object):
+    """Ssh client kept inside SshTransportPool with number of shell channels using its transport."""
+
+    def __init__(self, key, ssh_client):
+        self.key = key
+        self.ssh_client = ssh_client
+        self.channels = 0
+        self.expiry = None  # TimerHandle of closing idle transport
+
+
+class SshTransportPool(object):
+    """
+    Authenticated ssh transports shared by shell channels connecting to same host with same credentials.
+
+    Transport is keyed by (host, port, username) so only first connection performs key exchange and login.
+    Next connections just open new channel on it. Transport without channels is closed after idle_timeout.
+    """
+
+    def __init__(self, max_channels_per_transport=10, idle_timeout=60.0, logger=None):
+        """
+        :param max_channels_per_transport: when all transports of key carry that many channels new transport is created.
+        :param idle_timeout: time (in seconds) to keep transport open after its last channel is closed.
+        :param logger: logger to use (None means default "moler.connection.sshpool" logger)
+        """
+        self.max_channels_per_transport = max_channels_per_transport
+        self.idle_timeout = idle_timeout
+        self.logger = logger if logger else logging.getLogger("moler.connection.sshpool")
+        self._clients = {}  # key is (host, port, username), value is list of _PooledSshClient
+        self._lock = threading.Lock()
+        self._key_locks = {}  # connecting to one key doesn't block connecting to other keys
+
+    def acquire(self, host, port, username, password):
+        """
+        Get ssh client with open transport able to carry one more shell channel.
+        Each acquire() must be paired with release() when channel is closed.
+
+        :param host: host of ssh server
+        :param port: port of ssh server
+        :param username: username for password based login
+        :param password: password for password based login
+        :return: paramiko.SSHClient
+        """
+        key = (host, port, username)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            pooled = self._take_pooled_client(key)
+            if pooled is None:
+                ssh_client = paramiko.SSHClient()
+                ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+                ssh_client.connect(host, port=port, username=username, password=password)
+                pooled = _PooledSshClient(key=key, ssh_client=ssh_client)
+                pooled.channels = 1
+                with self._lock:
+                    self._clients.setdefault(key, list()).append(pooled)
+                self.logger.debug("established ssh transport to {}@{}:{} |{}".format(
+                    username, host, port, ssh_client.get_transport()))
+            return pooled.ssh_client
+
+    def release(self, ssh_client):
+        """
+        Give back ssh client taken by acquire().
+
+        :param ssh_client: ssh client returned by acquire()
+        :return: None
+        """
+        with self._lock:
+            pooled = self._find(ssh_client)
+            if pooled is None:
+                return  # already dropped from pool (closed as unhealthy or by close_all())
+            pooled.channels -= 1
+            if pooled.channels > 0:
+                return
+            if self.idle_timeout > 0:
+                from moler.util.shared_timer import get_process_timer
+                pooled.expiry = get_process_timer().call_later(self.idle_timeout, self._close_if_idle, pooled)
+                return
+            self._remove(pooled)
+        self._close_client(pooled)
+
+    def transports_count(self, host=None, port=None, username=None):
+        """
+        :return: number of transports kept in pool (for given host/port/username or all if no key given).
+        """
+        with self._lock:
+            if host is None:
+                return sum(len(clients) for clients in self._clients.values())
+            return len(self._clients.get((host, port, username), []))
+
+    def close_all(self):
+        """
+        Close all transports of pool (also those still carrying channels).
+
+        :return: None
+        """
+        with self._lock:
+            all_clients = [pooled for clients in self._clients.values() for pooled in clients]
+            self._clients.clear()
+        for pooled in all_clients:
+            self._close_client(pooled)
+
+    def _take_pooled_client(self, key):
+        unhealthy = list()
+        taken = None
+        with self._lock:
+            for pooled in self._clients.get(key, []):
+                if not self._is_healthy(pooled.ssh_client):
+                    unhealthy.append(pooled)
+                elif pooled.channels < self.max_channels_per_transport:
+                    taken = pooled
+                    break
+            for pooled in unhealthy:
+                self._remove(pooled)
+            if taken:
+                taken.channels += 1
+                if taken.expiry:
+                    taken.expiry.cancel()
+                    taken.expiry = None
+        for pooled in unhealthy:
+            self.logger.debug("dropping broken ssh transport to {} |{}".format(
+                pooled.key, pooled.ssh_client.get_transport()))
+            self._close_client(pooled)
+        return taken
+
+    @staticmethod
+    def _is_healthy(ssh_client):
+        transport = ssh_client.get_transport()
+        return (transport is not None) and transport.is_active() and transport.is_authenticated()
+
+    def _close_if_idle(self, pooled):
+        with self._lock:
+            if (pooled.channels > 0) or (self._find(pooled.ssh_client) is None):
+                return
+            self._remove(pooled)
+        self.logger.debug("closing idle ssh transport to {}".format(pooled.key))
+        self._close_client(pooled)
+
+    def _find(self, ssh_client):
+        for clients in self._clients.values():
+            for pooled in clients:
+                if pooled.ssh_client is ssh_client:
+                    return pooled
+        return None
+
+    def _remove(self, pooled):
+        clients = self._clients.get(pooled.key, [])
+        if pooled in clients:
+            clients.remove(pooled)
+        if not clients:
+            self._clients.pop(pooled.key, None)
+        if pooled.expiry:
+            pooled.expiry.cancel()
+            pooled.expiry = None
+
+    @staticmethod
+    def _close_client(pooled):
+        try:
+            pooled.ssh_client.close()
+        except Exception:
+            pass  # transport may be already broken
+
+
 ##################################################################################################################
 # SshShell and ThreadedSshShell differ in API - ThreadedSshShell gets moler_connection
 # It is intentional architecture decision: SshShell has much looser binding with moler.
@@ -325,7 +535,9 @@ class ThreadedSshShell(IOConnection):
                  receive_buffer_size=64 * 4096,
                  name=None,
                  logger_name="",
-                 existing_client=None):
+                 existing_client=None,
+                 queued_send=False,
+                 transport_pool=None):
         """
         Initialization of SshShell-threaded connection.
 
@@ -339,6 +551,9 @@ class ThreadedSshShell(IOConnection):
         :param name: name assigned to connection
         :param logger_name: take that logger from logging
         :param existing_client: (internal use) for reusing ssh transport of existing sshshell
+        :param queued_send: True if send() should only put data into write queue of channel and return without
+         waiting till data is sent (see send_async()). Failed queued send closes connection.
+        :param transport_pool: SshTransportPool to take ssh transport from (None means own transport)
 
         Logger is retrieved by logging.getLogger(logger_name)
         If logger_name == "" - take default logger "<moler-connection-logger>.io"
@@ -350,13 +565,17 @@ class ThreadedSshShell(IOConnection):
         self.logger = self._select_logger(logger_name, self.name, moler_connection)
         self.sshshell = SshShell(host=host, port=port, username=username, login=login, password=password,
                                  receive_buffer_size=receive_buffer_size,
-                                 logger=self.logger, existing_client=existing_client)
+                                 logger=self.logger, existing_client=existing_client,
+                                 transport_pool=transport_pool)
         self.pulling_thread = None
         self.pulling_timeout = 0.1
         self._pulling_done = threading.Event()
+        self.queued_send = queued_send
+        self._writer = None
+        self._writer_lock = threading.Lock()
 
     @classmethod
-    def from_sshshell(cls, moler_connection, sshshell, name=None, logger_name=""):
+    def from_sshshell(cls, moler_connection, sshshell, name=None, logger_name="", queued_send=False):
         """
         Build new sshshell based on existing one - it will reuse its transport
 
@@ -366,6 +585,7 @@ class ThreadedSshShell(IOConnection):
         :param moler_connection: moler-connection may not be reused; we need fresh one
         :param sshshell: existing connection to reuse it's ssh transport
         :param logger: new logger for new connection
+        :param queued_send: True if send() should only put data into write queue of channel.
         :return: instance of new sshshell connection with reused ssh transport
         """
         if isinstance(sshshell, ThreadedSshShell):
@@ -375,7 +595,8 @@ class ThreadedSshShell(IOConnection):
         new_sshshell = cls(moler_connection=moler_connection, host=sshshell.host, port=sshshell.port,
                            username=sshshell.username, password=sshshell.password,
                            receive_buffer_size=sshshell.receive_buffer_size, name=name,
-                           logger_name=logger_name, existing_client=sshshell.ssh_client)
+                           logger_name=logger_name, existing_client=sshshell.ssh_client,
+                           queued_send=queued_send, transport_pool=sshshell.transport_pool)
         return new_sshshell
 
     @property
@@ -479,8 +700,53 @@ class ThreadedSshShell(IOConnection):
         :type data: bytes
         :param timeout: max time to spend on sending all data, default 1 sec
         :type timeout: float
+        :return: None
+
+        If connection was created with queued_send=True data is only put into write queue.
+        Nobody awaits result of such sending so its failure is logged as error and closes connection
+        (observers of connection_lost are notified).
+        """
+        if self.queued_send:
+            self.send_async(data=data, timeout=timeout)
+        else:
+            self.sshshell.send(data=data, timeout=timeout)
+
+    def send_async(self, data, timeout=1):
+        """
+        Put data into write queue of channel and return without waiting till data is sent.
+
+        Data is sent (in order of send_async() calls) by writer thread of connection so big chunks of data
+        don't block caller nor thread pulling data from connection.
+
+        :param data: data
+        :type data: bytes
+        :param timeout: max time to spend on sending all data (counted since data is taken from queue), default 1 sec
+        :type timeout: float
+        :return: concurrent.futures.Future with number of bytes sent as result or exception raised by send.
         """
-        self.sshshell.send(data=data, timeout=timeout)
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = _ChannelWriter(sshshell=self.sshshell, name="{}-writer".format(self.name),
+                                              on_send_failure=self._on_send_failure)
+            return self._writer.put(data=data, timeout=timeout)
+
+    def _on_send_failure(self, data, err):
+        """Called from writer thread when queued data can't be sent."""
+        self.sshshell._error("Can't send {!r} via {}: {!r} - closing connection".format(data, self, err))
+        self._close_after_send_failure()
+
+    def _close_after_send_failure(self):
+        if self.pulling_thread:
+            self._pulling_done.set()  # pulling thread closes shell and notifies about disconnection
+        else:
+            self._close_shell(already_notified=False)
+
+    def _stop_writer(self):
+        with self._writer_lock:
+            writer = self._writer
+            self._writer = None
+        if writer:
+            writer.stop()  # data already in queue is sent before channel is closed
 
     def receive(self):
         """
@@ -500,27 +766,174 @@ class ThreadedSshShell(IOConnection):
         """Pull data from SshShell connection."""
         already_notified = False
         while not pulling_done.is_set():
-            try:
-                data = self.receive()
-                if data:
-                    self.data_received(data, datetime.datetime.now())  # (3)
-            except ConnectionTimeout:
-                continue
-            except RemoteEndpointNotConnected:
-                break
-            except RemoteEndpointDisconnected:
-                self._notify_on_disconnect()
-                already_notified = True
-                break
-            except Exception as err:
-                err_msg = "Unexpected {!r} during pulling for data in {}".format(err, self)
-                if self.sshshell.logger:
-                    self.sshshell.logger.exception(err_msg)
-                else:
-                    print("ERROR: {}".format(err_msg))
+            keep_pulling, already_notified = self._forward_received_data()
+            if not keep_pulling:
                 break
+        self._close_shell(already_notified=already_notified)
+
+    def _forward_received_data(self):
+        """
+        Receive data from SshShell connection and pass it to Moler's connection.
+
+        :return: tuple (True if pulling should be continued, True if disconnection was already notified)
+        """
+        try:
+            data = self.receive()
+            if data:
+                self.data_received(data, datetime.datetime.now())  # (3)
+        except ConnectionTimeout:
+            pass
+        except RemoteEndpointNotConnected:
+            return False, False
+        except RemoteEndpointDisconnected:
+            self._notify_on_disconnect()
+            return False, True
+        except Exception as err:
+            err_msg = "Unexpected {!r} during pulling for data in {}".format(err, self)
+            if self.sshshell.logger:
+                self.sshshell.logger.exception(err_msg)
+            else:
+                print("ERROR: {}".format(err_msg))
+            return False, False
+        return True, False
+
+    def _close_shell(self, already_notified):
+        self._stop_writer()
         was_open = self._shell_channel is not None
         self.sshshell.close()
         is_closed = self._shell_channel is None
         if was_open and is_closed and (not already_notified):
             self._notify_on_disconnect()
+
+
+class ReactorSshShell(ThreadedSshShell):
+    """
+    SshShell connection feeding Moler's connection from thread of reactor shared by many connections.
+
+    Reactor (see moler.io.raw.reactor) waits for data of shell channel via channel.fileno().
+    """
+
+    def __init__(self, moler_connection, reactor=None, **kwargs):
+        """
+        :param moler_connection: Moler's connection to join with
+        :param reactor: SelectorReactor to wait for data in. None to use reactor shared by all connections.
+        :param kwargs: parameters of ThreadedSshShell.
+        """
+        super(ReactorSshShell, self).__init__(moler_connection=moler_connection, **kwargs)
+        self._reactor = reactor
+        self._registered_channel = None
+
+    def open(self):
+        """
+        Open Ssh channel to remote shell & register it in reactor.
+
+        May be used as context manager: with connection.open():
+        """
+        was_closed = self._shell_channel is None
+        self.sshshell.open()
+        is_open = self._shell_channel is not None
+        if was_closed and is_open:
+            self._notify_on_connect()
+        if self._registered_channel is None:
+            self.sshshell._settimeout(timeout=self.pulling_timeout)
+            if self._reactor is None:
+                from moler.io.raw.reactor import get_reactor
+                self._reactor = get_reactor()
+            self._registered_channel = self._shell_channel
+            self._reactor.register(self._registered_channel, self._on_readable)
+        return contextlib.closing(self)
+
+    def close(self):
+        """
+        Unregister shell channel from reactor & close SshShell connection.
+
+        If SshShell was created with "reused ssh transport" then closing will close only ssh channel of remote shell.
+        Ssh transport will be closed after it's last channel is closed.
+        """
+        if self._unregister():
+            self._close_shell(already_notified=False)
+
+    def _unregister(self):
+        if self._registered_channel is None:
+            return False
+        self._reactor.unregister(self._registered_channel)
+        self._registered_channel = None
+        return True
+
+    def _close_after_send_failure(self):
+        self._unregister()
+        self._close_shell(already_notified=False)
+
+    def _on_readable(self):
+        """Called by reactor when data arrived on shell channel."""
+        keep_pulling, already_notified = self._forward_received_data()
+        if not keep_pulling:
+            self._unregister()
+            self._close_shell(already_notified=already_notified)
+
+
+class _ChannelWriter(object):
+    """
+    Write queue of shell channel drained by dedicated thread.
+
+    Paramiko channel signals via fileno() only readability so writer waits for channel window in
+    SshShell.send() (send_ready() polling) - but inside own thread instead of caller's one.
+    """
+
+    def __init__(self, sshshell, name, on_send_failure):
+        """
+        :param sshshell: SshShell to send data by.
+        :param name: name of writer thread.
+        :param on_send_failure: callable(data, exception) called when data can't be sent.
+        """
+        self._sshshell = sshshell
+        self._on_send_failure = on_send_failure
+        self._queue = Queue()
+        self._thread = threading.Thread(target=self._loop, name=name)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def put(self, data, timeout):
+        """
+        Put data into write queue.
+
+        :param data: bytes to send.
+        :param timeout: max time to spend on sending data.
+        :return: Future of sending.
+        """
+        future = Future()
+        self._queue.put((data, timeout, future))
+        return future
+
+    def stop(self):
+        """
+        Stop writer thread after all data already queued is sent.
+
+        :return: None
+        """
+        self._queue.put(None)
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            data, timeout, future = item
+            if not future.set_running_or_notify_cancel():
+                continue  # cancelled by caller while waiting in queue
+            try:
+                self._sshshell.send(data=data, timeout=timeout)
+            except Exception as err:
+                future.set_exception(err)
+                self._report_send_failure(data, err)
+            else:
+                future.set_result(len(data))
+
+    def _report_send_failure(self, data, err):
+        try:
+            self._on_send_failure(data, err)
+        except Exception as handler_err:  # writer thread must keep draining queue
+            msg = "Can't handle failed send of {!r} via {}: {!r}".format(data, self._sshshell, handler_err)
+            self._sshshell._error(msg)
@@ -210,3 +210,60 @@ class ThreadedTcp(Tcp):
                 break
         if self.socket is not None:
             self._close_ignoring_exceptions()
+
+
+class ReactorTcp(Tcp):
+    """
+    TCP connection feeding Moler's connection from thread of reactor shared by many connections.
+
+    Doesn't need own thread - reactor (see moler.io.raw.reactor) calls it when data arrived on its socket.
+    """
+
+    def __init__(self, moler_connection,
+                 port, host="localhost", receive_buffer_size=64 * 4096,
+                 logger=None, reactor=None):
+        """
+        Initialization of TCP connection served by reactor.
+
+        :param reactor: SelectorReactor to wait for data in. None to use reactor shared by all connections.
+        """
+        super(ReactorTcp, self).__init__(port=port, host=host,
+                                         receive_buffer_size=receive_buffer_size,
+                                         logger=logger)
+        self._reactor = reactor
+        self._registered_socket = None
+        # make Moler happy (3 requirements) :-)
+        self.moler_connection = moler_connection  # (1)
+        self.moler_connection.how2send = self.send  # (2)
+
+    def open(self):
+        """Open TCP connection & register it in reactor."""
+        ret = super(ReactorTcp, self).open()
+        if self._reactor is None:
+            from moler.io.raw.reactor import get_reactor
+            self._reactor = get_reactor()
+        self._registered_socket = self.socket
+        self._reactor.register(self._registered_socket, self._on_readable)
+        return ret
+
+    def close(self):
+        """Unregister TCP connection from reactor & close it."""
+        self._unregister()
+        super(ReactorTcp, self).close()
+
+    def _unregister(self):
+        if self._registered_socket is not None:
+            self._reactor.unregister(self._registered_socket)
+            self._registered_socket = None
+
+    def _on_readable(self):
+        """Called by reactor when data arrived on socket."""
+        try:
+            data = self.receive(timeout=0)
+        except ConnectionTimeout:
+            return
+        except (RemoteEndpointNotConnected, RemoteEndpointDisconnected):
+            self._unregister()
+            return
+        # make Moler happy :-)
+        self.moler_connection.data_received(data, datetime.datetime.now())  # (3)
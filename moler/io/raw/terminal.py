@@ -65,11 +65,7 @@ class ThreadedTerminal(IOConnection):
             # need to not replace not unicode data instead of raise exception
             self._terminal.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
 
-            done = Event()
-            self.pulling_thread = TillDoneThread(target=self.pull_data,
-                                                 done_event=done,
-                                                 kwargs={'pulling_done': done})
-            self.pulling_thread.start()
+            self._start_pulling()
             retry = 0
             is_operable = False
 
@@ -86,9 +82,7 @@ class ThreadedTerminal(IOConnection):
 
     def close(self):
         """Close ThreadedTerminal connection & stop pulling thread."""
-        if self.pulling_thread:
-            self.pulling_thread.join()
-            self.pulling_thread = None
+        self._stop_pulling()
         self.moler_connection.shutdown()
         super(ThreadedTerminal, self).close()
 
@@ -102,6 +96,20 @@ class ThreadedTerminal(IOConnection):
         if self._terminal:
             self._terminal.write(data)
 
+    def _start_pulling(self):
+        """Start thread pulling data from terminal."""
+        done = Event()
+        self.pulling_thread = TillDoneThread(target=self.pull_data,
+                                             done_event=done,
+                                             kwargs={'pulling_done': done})
+        self.pulling_thread.start()
+
+    def _stop_pulling(self):
+        """Stop thread pulling data from terminal."""
+        if self.pulling_thread:
+            self.pulling_thread.join()
+            self.pulling_thread = None
+
     def pull_data(self, pulling_done):
         """Pull data from ThreadedTerminal connection."""
         reads = []
@@ -115,21 +123,31 @@ class ThreadedTerminal(IOConnection):
                 pulling_done.set()
 
             if self._terminal.fd in reads:
-                try:
-                    data = self._terminal.read(self._read_buffer_size)
-                    if self.debug_hex_on_all_chars:
-                        self.logger.debug("incoming data: '{}'.".format(all_chars_to_hex(data)))
-                    if self.debug_hex_on_non_printable_chars:
-                        self.logger.debug("incoming data: '{}'.".format(non_printable_chars_to_hex(data)))
-
-                    if self._shell_operable.is_set():
-                        self.data_received(data=data, recv_time=datetime.datetime.now())
-                    else:
-                        self._verify_shell_is_operable(data)
-                except EOFError:
-                    self._notify_on_disconnect()
+                if not self._read_data():
                     pulling_done.set()
 
+    def _read_data(self):
+        """
+        Read data available on terminal and pass it to Moler's connection.
+
+        :return: False if terminal is closed, True otherwise.
+        """
+        try:
+            data = self._terminal.read(self._read_buffer_size)
+            if self.debug_hex_on_all_chars:
+                self.logger.debug("incoming data: '{}'.".format(all_chars_to_hex(data)))
+            if self.debug_hex_on_non_printable_chars:
+                self.logger.debug("incoming data: '{}'.".format(non_printable_chars_to_hex(data)))
+
+            if self._shell_operable.is_set():
+                self.data_received(data=data, recv_time=datetime.datetime.now())
+            else:
+                self._verify_shell_is_operable(data)
+        except EOFError:
+            self._notify_on_disconnect()
+            return False
+        return True
+
     def _verify_shell_is_operable(self, data):
         self.read_buffer = self.read_buffer + data
         lines = self.read_buffer.splitlines()
@@ -144,3 +162,40 @@ class ThreadedTerminal(IOConnection):
             elif not self._export_sent and re.search(self.first_prompt, self.read_buffer, re.MULTILINE):
                 self.send(self.set_prompt_cmd)
                 self._export_sent = True
+
+
+class ReactorTerminal(ThreadedTerminal):
+    """
+    Works on Unix (like Linux) systems only!
+
+    ReactorTerminal is shell working under Pty served by reactor shared by many connections (no own thread).
+    """
+
+    def __init__(self, moler_connection, reactor=None, **kwargs):
+        """
+        :param moler_connection: Moler's connection to join with
+        :param reactor: SelectorReactor to wait for data in. None to use reactor shared by all connections.
+        :param kwargs: parameters of ThreadedTerminal.
+        """
+        super(ReactorTerminal, self).__init__(moler_connection=moler_connection, **kwargs)
+        self._reactor = reactor
+        self._registered_fd = None
+
+    def _start_pulling(self):
+        """Register terminal in reactor."""
+        if self._reactor is None:
+            from moler.io.raw.reactor import get_reactor
+            self._reactor = get_reactor()
+        self._registered_fd = self._terminal.fd
+        self._reactor.register(self._registered_fd, self._on_readable)
+
+    def _stop_pulling(self):
+        """Unregister terminal from reactor."""
+        if self._registered_fd is not None:
+            self._reactor.unregister(self._registered_fd)
+            self._registered_fd = None
+
+    def _on_readable(self):
+        """Called by reactor when data arrived on terminal."""
+        if not self._read_data():
+            self._stop_pulling()
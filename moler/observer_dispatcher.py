@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Dispatching of connection data to observers via shared, bounded pool of threads.
+
+ObserverThreadWrapper uses one thread per subscribed observer.
+With many devices (each with prompt observers, commands and events) it gives
+hundreds of mostly idle threads. ObserverDispatcher serves all observers
+with fixed number of worker threads. Each observer still gets its data in order
+(only one worker at a time processes data of given observer) and exception inside
+one observer doesn't impact other observers.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import logging
+from collections import deque
+from threading import Thread, Lock
+from moler.observer_thread_wrapper import ObserverWrapper
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # For python 2
+
+
+class ObserverDispatcher(object):
+    """
+    Bounded pool of worker threads notifying observers about data received on connection(s).
+    """
+
+    def __init__(self, workers=4, name="ObserverDispatcher"):
+        """
+        Create dispatcher and start its worker threads.
+
+        :param workers: number of worker threads serving all observers.
+        :param name: name of dispatcher, used as prefix of worker thread names.
+        """
+        if workers < 1:
+            raise ValueError("ObserverDispatcher needs at least 1 worker, not {}".format(workers))
+        self.name = name
+        self.logger = logging.getLogger('moler.connection')
+        self._ready_wrappers = queue.Queue()
+        self._request_end = False
+        self._timeout_for_get_from_queue = 1
+        self._stats_lock = Lock()
+        self._dispatched_chunks = 0
+        self._threads = list()
+        for worker_no in range(workers):
+            t = Thread(target=self._loop_for_worker, name="{}-{}".format(name, worker_no))
+            t.setDaemon(True)
+            t.start()
+            self._threads.append(t)
+
+    @property
+    def workers_count(self):
+        """
+        :return: number of worker threads still running.
+        """
+        return len([t for t in self._threads if t.is_alive()])
+
+    @property
+    def dispatched_chunks(self):
+        """
+        :return: number of data chunks passed to observers since dispatcher creation.
+        """
+        return self._dispatched_chunks
+
+    def schedule(self, wrapper):
+        """
+        Put wrapper having pending data into queue of wrappers waiting for worker.
+
+        :param wrapper: ObserverDispatcherWrapper with pending data.
+        :return: None
+        """
+        self._ready_wrappers.put(wrapper)
+
+    def request_stop(self):
+        """
+        Stop all worker threads. Data not yet dispatched is dropped.
+
+        :return: None
+        """
+        self._request_end = True
+
+    def _loop_for_worker(self):
+        """
+        Loop of single worker taking wrappers with pending data and passing that data to observers.
+
+        :return: None
+        """
+        while self._request_end is False:
+            try:
+                wrapper = self._ready_wrappers.get(True, self._timeout_for_get_from_queue)
+            except queue.Empty:
+                continue  # No observer with pending data within self._timeout_for_get_from_queue
+            try:
+                dispatched = wrapper.process_pending_data()
+            except Exception:
+                self.logger.exception(msg=r'Exception inside dispatcher while serving {}'.format(wrapper))
+            else:
+                with self._stats_lock:
+                    self._dispatched_chunks += dispatched
+
+
+class ObserverDispatcherWrapper(ObserverWrapper):
+    """
+    Wrapper for observer registered in ThreadedMolerConnection served by ObserverDispatcher.
+    """
+
+    def __init__(self, observer, observer_self, logger, dispatcher, max_chunks_per_turn=20):
+        """
+        Construct wrapper for observer.
+
+        :param observer: observer to wrap.
+        :param observer_self: self for observer if observer is method from object or None if observer is a function.
+        :param logger: logger to log.
+        :param dispatcher: ObserverDispatcher whose workers will notify observer.
+        :param max_chunks_per_turn: how many chunks may be passed to observer before worker serves other observers.
+        """
+        super(ObserverDispatcherWrapper, self).__init__(observer=observer, observer_self=observer_self,
+                                                        logger=logger)
+        self._dispatcher = dispatcher
+        self._max_chunks_per_turn = max_chunks_per_turn
+        self._pending_data = deque()
+        self._lock = Lock()
+        self._scheduled = False
+
+    def feed(self, data, recv_time):
+        """
+        Put data here.
+
+        :param data: data to put.
+        :param recv_time: time of data really read form connection.
+        :return: None
+        """
+        with self._lock:
+            if self._request_end:
+                return
+            self._pending_data.append((data, recv_time))
+            if self._scheduled:
+                return  # Worker will take that data in the same or next turn.
+            self._scheduled = True
+        self._dispatcher.schedule(self)
+
+    def request_stop(self):
+        """
+        Call if you want to stop feed observer.
+        :return: None
+        """
+        with self._lock:
+            self._request_end = True
+            self._pending_data.clear()
+            if not self._scheduled:
+                self._release_observer()
+
+    def process_pending_data(self):
+        """
+        Pass pending data to observer. Called by worker of dispatcher.
+        Wrapper is scheduled only once at a time so observer gets data in order of feeding.
+
+        :return: number of chunks passed to observer.
+        """
+        dispatched = 0
+        while dispatched < self._max_chunks_per_turn:
+            with self._lock:
+                if self._request_end or not self._pending_data:
+                    self._scheduled = False
+                    if self._request_end:
+                        self._release_observer()
+                    return dispatched
+                data, timestamp = self._pending_data.popleft()
+            self._notify_observer(data=data, timestamp=timestamp)
+            dispatched += 1
+        with self._lock:
+            if self._request_end or not self._pending_data:
+                self._scheduled = False
+                if self._request_end:
+                    self._release_observer()
+                return dispatched
+        self._dispatcher.schedule(self)  # Give other observers a chance, continue in next turn.
+        return dispatched
+
+
+_process_dispatcher = None
+_process_dispatcher_lock = Lock()
+
+
+def get_process_dispatcher(workers=4):
+    """
+    Return dispatcher shared by all connections of this process (created at first call).
+
+    :param workers: number of worker threads if dispatcher is created by this call.
+    :return: ObserverDispatcher
+    """
+    global _process_dispatcher
+    with _process_dispatcher_lock:
+        if _process_dispatcher is None:
+            _process_dispatcher = ObserverDispatcher(workers=workers, name="MolerObserverDispatcher")
+        return _process_dispatcher
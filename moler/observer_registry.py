@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Index of commands and events (connection observers) available inside packages.
+
+Device gets names of observers for every package of every its state. Finding them requires importing all modules
+of package and inspecting their classes. Here it is done once per process and result is shared by all devices.
+
+Index may be also stored in cache file (see set_cache_file()). Entry of package in cache file is valid as long as
+modules of package are not changed (their names and modification times are the same) so next process gets names of
+observers without importing and inspecting modules.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import importlib
+import inspect
+import json
+import logging
+import os
+import pkgutil
+import threading
+
+from moler.connection_observer import ConnectionObserver
+
+_index = dict()  # package name -> dict(observer name -> class fullname)
+_index_lock = threading.RLock()  # importing module of package may ask for observers again
+_cache_file = None
+_cache = None  # content of cache file: package name -> dict(signature, observers)
+
+
+def get_observers_of_package(package_name):
+    """
+    Get observers available in package (or module).
+
+    :param package_name: name of package like 'moler.cmd.unix' or name of single module.
+    :return: dict observer name -> class fullname, like {'ip_addr': 'moler.cmd.unix.ip_addr.IpAddr'}
+    """
+    with _index_lock:
+        if package_name not in _index:
+            _index[package_name] = _load_observers_of_package(package_name)
+        return dict(_index[package_name])
+
+
+def set_cache_file(path):
+    """
+    Set file to store index of observers between processes.
+
+    :param path: path to cache file (json). None to not use cache file.
+    :return: None
+    """
+    global _cache_file, _cache
+    with _index_lock:
+        _cache_file = path
+        _cache = None
+
+
+def clear():
+    """
+    Forget index built so far (cache file is not changed).
+
+    :return: None
+    """
+    global _cache
+    with _index_lock:
+        _index.clear()
+        _cache = None
+
+
+def _load_observers_of_package(package_name):
+    basic_module = importlib.import_module(package_name)
+    try:
+        mod_path = basic_module.__path__
+    except AttributeError:
+        return _scan_module(module_name=package_name)
+    signature = _package_signature(mod_path)
+    cache = _read_cache()
+    cached = cache.get(package_name) if cache is not None else None
+    if cached and cached['signature'] == signature:
+        return cached['observers']
+    observers = dict()
+    for importer, modname, is_pkg in pkgutil.iter_modules(mod_path):
+        module_name = "{}.{}".format(package_name, modname)
+        observers.update(_scan_module(module_name))
+    if cache is not None:
+        cache[package_name] = {'signature': signature, 'observers': observers}
+        _write_cache(cache)
+    return observers
+
+
+def _scan_module(module_name):
+    observers = dict()
+    module = importlib.import_module(module_name)
+    for (class_name, class_obj) in inspect.getmembers(module, inspect.isclass):
+        if class_obj.__module__ == module_name:
+            if issubclass(class_obj, ConnectionObserver):  # module may contain other classes (f.ex. exceptions)
+                # like:  IpAddr --> ip_addr   and   IpAddr --> moler.cmd.unix.ip_addr.IpAddr
+                observers[class_obj.observer_name] = "{}.{}".format(module_name, class_name)
+    return observers
+
+
+def _package_signature(mod_path):
+    """
+    :return: list of [file name, modification time] of all files and directories of package.
+    """
+    signature = list()
+    for directory in mod_path:
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.endswith('.pyc') or file_name == '__pycache__':
+                continue
+            signature.append([file_name, os.path.getmtime(os.path.join(directory, file_name))])
+    return signature
+
+
+def _read_cache():
+    global _cache
+    if _cache is None and _cache_file is not None:
+        _cache = dict()
+        if os.path.exists(_cache_file):
+            try:
+                with open(_cache_file) as cache_file:
+                    _cache = json.load(cache_file)
+            except (IOError, OSError, ValueError) as err:
+                logging.getLogger('moler').warning("Can't read observers cache '{}': {}".format(_cache_file, err))
+    return _cache
+
+
+def _write_cache(cache):
+    try:
+        with open(_cache_file, 'w') as cache_file:
+            json.dump(cache, cache_file, indent=1, sort_keys=True)
+    except (IOError, OSError) as err:
+        logging.getLogger('moler').warning("Can't write observers cache '{}': {}".format(_cache_file, err))
@@ -13,9 +13,10 @@ except ImportError:
     import Queue as queue  # For python 2
 
 
-class ObserverThreadWrapper(object):
+class ObserverWrapper(object):
     """
-    Wrapper for observer registered in ThreadedMolerConnection (old name: ObservableConnection).
+    Base for wrappers of observers registered in ThreadedMolerConnection.
+    Knows how to notify observer and how to isolate observer's exceptions.
     """
 
     def __init__(self, observer, observer_self, logger):
@@ -28,22 +29,18 @@ class ObserverThreadWrapper(object):
         """
         self._observer = observer
         self._observer_self = observer_self
-        self._queue = queue.Queue()
         self._request_end = False
-        self._timeout_for_get_from_queue = 1
         self.logger = logger
-        t = Thread(target=self._loop_for_observer)
-        t.setDaemon(True)
-        t.start()
 
     def feed(self, data, recv_time):
         """
         Put data here.
 
         :param data: data to put.
+        :param recv_time: time of data really read form connection.
         :return: None
         """
-        self._queue.put((data, recv_time))
+        raise NotImplementedError()
 
     def request_stop(self):
         """
@@ -52,6 +49,64 @@ class ObserverThreadWrapper(object):
         """
         self._request_end = True
 
+    def _notify_observer(self, data, timestamp):
+        """
+        Pass single chunk of data to observer.
+
+        :param data: data to pass.
+        :param timestamp: time of data really read form connection.
+        :return: None
+        """
+        if self.logger.isEnabledFor(TRACE):  # don't build message for every chunk if it is not logged
+            try:
+                self.logger.log(level=TRACE, msg=r'notifying {}({!r})'.format(self._observer, repr(data)))
+            except ReferenceError:
+                self._request_end = True  # self._observer is no more valid.
+        try:
+            if self._observer_self:
+                self._observer(self._observer_self, data, timestamp)
+            else:
+                self._observer(data, timestamp)
+        except ReferenceError:
+            self._request_end = True  # self._observer is no more valid.
+        except Exception:
+            self.logger.exception(msg=r'Exception inside: {}({!r})'.format(self._observer, repr(data)))
+
+    def _release_observer(self):
+        self._observer = None
+        self._observer_self = None
+
+
+class ObserverThreadWrapper(ObserverWrapper):
+    """
+    Wrapper for observer registered in ThreadedMolerConnection (old name: ObservableConnection).
+    Every wrapped observer gets its own thread.
+    """
+
+    def __init__(self, observer, observer_self, logger):
+        """
+        Construct wrapper for observer.
+
+        :param observer: observer to wrap.
+        :param observer_self: self for observer if observer is method from object or None if observer is a function.
+        :param logger: logger to log.
+        """
+        super(ObserverThreadWrapper, self).__init__(observer=observer, observer_self=observer_self, logger=logger)
+        self._queue = queue.Queue()
+        self._timeout_for_get_from_queue = 1
+        t = Thread(target=self._loop_for_observer)
+        t.setDaemon(True)
+        t.start()
+
+    def feed(self, data, recv_time):
+        """
+        Put data here.
+
+        :param data: data to put.
+        :return: None
+        """
+        self._queue.put((data, recv_time))
+
     def _loop_for_observer(self):
         """
         Loop to pass data (put by method feed) to observer.
@@ -60,20 +115,7 @@ class ObserverThreadWrapper(object):
         while self._request_end is False:
             try:
                 data, timestamp = self._queue.get(True, self._timeout_for_get_from_queue)
-                try:
-                    self.logger.log(level=TRACE, msg=r'notifying {}({!r})'.format(self._observer, repr(data)))
-                except ReferenceError:
-                    self._request_end = True  # self._observer is no more valid.
-                try:
-                    if self._observer_self:
-                        self._observer(self._observer_self, data, timestamp)
-                    else:
-                        self._observer(data, timestamp)
-                except ReferenceError:
-                    self._request_end = True  # self._observer is no more valid.
-                except Exception:
-                    self.logger.exception(msg=r'Exception inside: {}({!r})'.format(self._observer, repr(data)))
+                self._notify_observer(data=data, timestamp=timestamp)
             except queue.Empty:
                 pass  # No incoming data within self._timeout_for_get_from_queue
-        self._observer = None
-        self._observer_self = None
+        self._release_observer()
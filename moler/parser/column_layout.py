@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Parsing of tables with columns aligned under headers (output of ps, df, lsof, ...).
+
+Layout of columns is learned once from header line. Every next row is cut into values using precomputed
+positions of headers. Values may be wider than their headers (like right aligned numbers or long user names)
+so value ends at last space before start of next header. Last column takes the rest of row (so it may contain
+spaces, like command with its arguments).
+Values are converted to int/float by regular expressions - without raising and catching exceptions.
+When many rows are parsed at once, columns holding only numbers are converted by one batch call.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import re
+
+from moler.util.converterhelper import ConverterHelper
+
+# 123
+_re_integer = re.compile(r"^[+\-]?\d+$")
+# 2.5
+_re_float = re.compile(r"^[+\-]?(\d+\.\d*|\.\d+)([eE][+\-]?\d+)?$")
+
+
+def convert_value(value):
+    """
+    Convert text to int or float if it represents number.
+
+    :param value: text to convert (already stripped).
+    :return: int, float or not changed text.
+    """
+    if _re_integer.match(value):
+        return int(value)
+    if _re_float.match(value):
+        return float(value)
+    return value
+
+
+def _is_number(value):
+    """
+    Check if text represents int or float (the same way as convert_value).
+
+    :param value: text to check (already stripped).
+    :return: True if text is number, False otherwise.
+    """
+    return bool(_re_integer.match(value) or _re_float.match(value))
+
+
+class ColumnLayout(object):
+    """
+    Positions of columns of table learned from its header line.
+    """
+
+    def __init__(self, headers, positions, converters=None):
+        """
+        Create layout.
+
+        :param headers: names of columns.
+        :param positions: start positions of headers in header line.
+        :param converters: dict with callables converting stripped text of given column. Columns not found here
+         are converted by convert_value(). Use str to keep text of column.
+        """
+        self.headers = list(headers)
+        self.positions = list(positions)
+        converters = converters if converters else dict()
+        self._columns = list()  # tuples (header, start of header, start of next header or None, converter)
+        for index, header in enumerate(self.headers):
+            next_position = self.positions[index + 1] if index + 1 < len(self.positions) else None
+            self._columns.append((header, self.positions[index], next_position,
+                                  converters.get(header, convert_value)))
+
+    @classmethod
+    def from_header(cls, line, converters=None):
+        """
+        Learn layout of columns from header line.
+
+        :param line: header line (like '  PID TTY          TIME CMD').
+        :param converters: dict with callables converting text of given column.
+        :return: ColumnLayout or None if line has no headers.
+        """
+        headers = line.split()
+        if not headers:
+            return None
+        positions = list()
+        previous_end = 0
+        for header in headers:
+            position = line.find(header, previous_end)
+            positions.append(position)
+            previous_end = position + len(header)
+        return cls(headers=headers, positions=positions, converters=converters)
+
+    def parse(self, line):
+        """
+        Cut row into values of columns.
+
+        :param line: row of table.
+        :return: dict with converted value for every header.
+        """
+        item = dict()
+        for (header, _, _, converter), text in zip(self._columns, self._cut(line)):
+            item[header] = converter(text)
+        return item
+
+    def parse_rows(self, lines):
+        """
+        Cut many rows into values of columns. Values are converted column by column and every distinct text of
+        column is converted only once (columns like user, state or size repeat a lot). Columns without own
+        converter which hold only numbers are converted by ConverterHelper.to_numbers() in one call.
+
+        :param lines: rows of table.
+        :return: list of dicts with converted value for every header.
+        """
+        rows = [self._cut(line) for line in lines]
+        items = [dict() for _ in rows]
+        for index, (header, _, _, converter) in enumerate(self._columns):
+            texts = [row[index] for row in rows]
+            if converter is convert_value and texts and all(_is_number(text) for text in set(texts)):
+                values = ConverterHelper.get_converter_helper().to_numbers(texts)
+            else:
+                values = self._convert_column(texts, converter)
+            for item, value in zip(items, values):
+                item[header] = value
+        return items
+
+    @staticmethod
+    def _convert_column(texts, converter):
+        """
+        Convert texts of one column. Every distinct text is converted only once.
+
+        :param texts: stripped texts of column.
+        :param converter: callable converting one text.
+        :return: list of converted values.
+        """
+        converted = dict()
+        values = list()
+        for text in texts:
+            if text not in converted:
+                converted[text] = converter(text)
+            values.append(converted[text])
+        return values
+
+    def _cut(self, line):
+        """
+        Cut row into texts of columns.
+
+        :param line: row of table.
+        :return: list of stripped texts of columns.
+        """
+        texts = list()
+        previous_end = None
+        find = line.find
+        rfind = line.rfind
+        for _, header_start, next_header_start, _ in self._columns:
+            if previous_end is None:
+                start = 0  # first value may be wider than its (right aligned) header
+            else:
+                start = find(" ", previous_end)
+                if start > header_start or start < 0:
+                    start = header_start
+            if next_header_start is None:
+                end = len(line)
+            else:
+                end = rfind(" ", start, next_header_start + 1)
+            texts.append(line[start:end].strip())
+            previous_end = end
+        return texts
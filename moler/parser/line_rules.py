@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Declarative dispatching of output lines to parsing methods of command.
+
+Instead of calling chain of _parse_*() methods (each running its regular expression and raising ParsingDone
+when line is handled) command declares table of rules::
+
+    _line_rules = LineRules([
+        LineRule(regex=_re_task_row, handler='_parse_task_row'),
+        LineRule(regex=_re_processes_header, handler='_parse_processes_list_headers', literal='PID'),
+    ])
+
+and calls from on_new_line()::
+
+    self._line_rules.dispatch(self, line)
+
+Before running regular expression rule checks cheap conditions: line start token, required literal (given
+or found inside regular expression - see moler.util.regex_set) and state of command. So for most lines only
+few substring checks are done. Not handled line is reported by return value, not by exception.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import re
+import six
+
+from moler.exceptions import WrongUsage
+from moler.util.regex_set import required_literal
+
+
+class LineRule(object):
+    """
+    Single rule of LineRules: which lines are handled by which method of command.
+    """
+
+    def __init__(self, handler, regex=None, literal=None, starts_with=None, when=None):
+        """
+        Create rule.
+
+        :param handler: name of method of command called as handler(line, match). Method may return False to say
+         that line is not handled - then next rules are checked.
+        :param regex: regular expression (compiled or string) searched in line. None means rule matches every line
+         (handler gets None as match).
+        :param literal: text that must be inside line to run regex. None means literal found in regex (if any).
+        :param starts_with: text that line must start with.
+        :param when: callable(command) returning False when rule should not be checked for current state of command.
+        """
+        if isinstance(regex, six.string_types):
+            regex = re.compile(regex)
+        if (literal is None) and (regex is not None):
+            literal = required_literal(regex)
+        self.handler = handler
+        self.regex = regex
+        self.literal = literal
+        self.starts_with = starts_with
+        self.when = when
+
+    def __str__(self):
+        pattern = self.regex.pattern if self.regex is not None else None
+        return "LineRule(handler={}, regex={!r}, literal={!r}, starts_with={!r})".format(
+            self.handler, pattern, self.literal, self.starts_with)
+
+
+class LineRules(object):
+    """
+    Ordered table of LineRule. First rule that handles line ends dispatching of that line.
+    """
+
+    def __init__(self, rules):
+        """
+        Create table of rules.
+
+        :param rules: list of LineRule in order of checking.
+        """
+        self.rules = list(rules)
+        for rule in self.rules:
+            if not isinstance(rule.handler, six.string_types):
+                raise WrongUsage("Handler of {} must be name of method, got {!r}".format(rule, rule.handler))
+        # Compiled form of rules - tuples checked in dispatch() loop without attribute lookups.
+        self._checks = tuple((rule.starts_with, rule.literal, rule.when,
+                              rule.regex.search if rule.regex is not None else None,
+                              rule.handler) for rule in self.rules)
+
+    def dispatch(self, observer, line):
+        """
+        Pass line to handler of first matching rule.
+
+        :param observer: command (or event) which methods are handlers of rules.
+        :param line: line to dispatch.
+        :return: True if line was handled, False if no rule handled line.
+        """
+        for starts_with, literal, when, search, handler in self._checks:
+            if (starts_with is not None) and (not line.startswith(starts_with)):
+                continue
+            if (literal is not None) and (literal not in line):
+                continue
+            if (when is not None) and (not when(observer)):
+                continue
+            match = None
+            if search is not None:
+                match = search(line)
+                if match is None:
+                    continue
+            if getattr(observer, handler)(line, match) is not False:
+                return True
+        return False
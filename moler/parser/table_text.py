@@ -32,8 +32,13 @@ class TableText:
         self._finish_found = 0  # flag for matching finish regexp
         self._found = None
         self._value_splitter = value_splitter
+        # regexps are compiled once - parse() is called for every line of table
+        self._re_finish = re.compile(_finish) if _finish != '' else None
+        self._re_skip = re.compile(_skip) if _skip != '' else None
+        self._re_value_splitter = re.compile(value_splitter)
 
         self.header_regexp_groups = self.build_hdr_groups()
+        self._re_header = re.compile(self.header_regexp_groups)
         self.header_positions = []  # array of "column position" of header
 
     def build_hdr_groups(self):
@@ -65,22 +70,18 @@ class TableText:
         '''
         result = dict()
         # looking for finish pareser. If found stop processing
-        if re.match(r'^\s*$', data):
+        if not data.strip():
             return None
-        finish = self._finish
-        if finish != '' and re.search(finish, data):
+        if self._re_finish is not None and self._re_finish.search(data):
             self._finish_found = True
         if self._finish_found:
             return None
         # looking for skip keyword
-        skip = self._skip
-        if skip != '' and re.search(skip, data):
+        if self._re_skip is not None and self._re_skip.search(data):
             return None
-        hdr_regexp = self.header_regexp_groups
-        compiled_header_re = re.compile(hdr_regexp)
         # finding header in line until headers are found
         if not self.header_positions:
-            header_search_result = re.search(compiled_header_re, data)
+            header_search_result = self._re_header.search(data)
             if header_search_result is not None:
                 groups_found = header_search_result.groupdict()
                 for index in range(0, len(self._header_keys), 1):
@@ -91,7 +92,7 @@ class TableText:
         else:
             header_keys_number = len(self._header_keys)
             # split values into table of values
-            split_values = re.split(self._value_splitter, str.strip(str(data)))
+            split_values = self._re_value_splitter.split(str.strip(str(data)))
             # connect values and end of them in order to manage them correclty
             split_values_positions = self.split_with_end_position(split_values, data)
             value_index = 0
@@ -145,14 +146,10 @@ class TableText:
         :return: returns list of dictionary where each dict contains 2 keys 'value' and 'end' which is end position of
             string
         '''
-        current_value = values[0]
-        current_end = re.search(r'[\b\s]??' + current_value + r'[\b\s]??', data).end()
         result = list()
-        result.append({'value': current_value, 'end': current_end})
-        for i in range(1, len(values), 1):
-            current_value = values[i]
-            current_search = re.search(r'[\b\s]??' + re.escape(values[i]) + r'[\b\s]??', data[current_end:])
-            current_end += current_search.end()
+        current_end = 0
+        for current_value in values:
+            current_end = data.find(current_value, current_end) + len(current_value)
             result.append({'value': current_value, 'end': current_end})
         return result
 
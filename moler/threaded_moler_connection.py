@@ -17,13 +17,21 @@ __email__ = 'grzegorz.latuszek@nokia.com, marcin.usielski@nokia.com, michal.erns
 
 import weakref
 import logging
+import time
 import six
 from threading import Lock
 from moler.abstract_moler_connection import AbstractMolerConnection
 from moler.abstract_moler_connection import identity_transformation
+from moler.config import connections as connection_cfg
 from moler.config.loggers import RAW_DATA, TRACE
 from moler.helpers import instance_id
+from moler.observer_dispatcher import ObserverDispatcher, ObserverDispatcherWrapper, get_process_dispatcher
 from moler.observer_thread_wrapper import ObserverThreadWrapper
+from moler.util.line_splitter import ReceivedText
+from moler.util.shared_timer import get_process_timer
+
+
+_newline_endings = (b'\n', b'\r', u'\n', u'\r')
 
 
 class ThreadedMolerConnection(AbstractMolerConnection):
@@ -34,10 +42,13 @@ class ThreadedMolerConnection(AbstractMolerConnection):
 
     def observer(data):
         # handle that data
+
+    Observers are notified from separate thread per observer or from pool of threads
+    shared by observers - see moler.config.connections.set_observers_dispatch().
     """
 
     def __init__(self, how2send=None, encoder=identity_transformation, decoder=identity_transformation,
-                 name=None, newline='\n', logger_name=""):
+                 name=None, newline='\n', logger_name="", observers_dispatch=None, coalesce_window=None):
         """
         Create Connection via registering external-IO
 
@@ -46,6 +57,9 @@ class ThreadedMolerConnection(AbstractMolerConnection):
         :param decoder: callable restoring data from bytes
         :param name: name assigned to connection
         :param logger_name: take that logger from logging
+        :param observers_dispatch: 'thread', 'pool' or None to take mode from configuration
+        :param coalesce_window: time (in seconds) to merge small reads into one dispatch, 0 to pass every read
+         immediately, None to take it from configuration (see moler.config.connections.set_data_coalescing())
 
         Logger is retrieved by logging.getLogger(logger_name)
         If logger_name == "" - take logger "moler.connection.<name>"
@@ -56,6 +70,19 @@ class ThreadedMolerConnection(AbstractMolerConnection):
         self._connection_closed_handlers = dict()
         self._observer_wrappers = dict()
         self._observers_lock = Lock()
+        self._observers_dispatch = observers_dispatch or connection_cfg.observers_dispatch['mode']
+        self._own_dispatcher = None
+        if coalesce_window is None:
+            coalesce_window = connection_cfg.data_coalescing['window']
+        self._coalesce_window = coalesce_window
+        self._coalesce_max_bytes = connection_cfg.data_coalescing['max_bytes']
+        self._coalesce_on_newline = connection_cfg.data_coalescing['on_newline']
+        self._coalesce_lock = Lock()
+        self._coalesced = list()  # reads collected for next dispatch
+        self._coalesced_size = 0
+        self._coalesced_recv_time = None  # recv_time of first collected read
+        self._coalesce_timer_handle = None
+        self._last_dispatch_time = 0.0
 
     def data_received(self, data, recv_time):
         """
@@ -64,13 +91,64 @@ class ThreadedMolerConnection(AbstractMolerConnection):
         """
         if not self.is_open():
             return
-        extra = {'transfer_direction': '<', 'encoder': lambda data: data.encode(encoding='utf-8', errors="replace")}
+        if self._coalesce_window <= 0:
+            self._dispatch_data(data, recv_time)
+            return
+        with self._coalesce_lock:
+            now = time.time()
+            if not self._coalesced and (now - self._last_dispatch_time) >= self._coalesce_window:
+                self._last_dispatch_time = now
+                self._dispatch_data(data, recv_time)  # first data after idle - no delay
+                return
+            if not self._coalesced:
+                self._coalesced_recv_time = recv_time
+                self._coalesce_timer_handle = get_process_timer().call_later(self._coalesce_window,
+                                                                             self._flush_coalesced_data)
+            self._coalesced.append(data)
+            self._coalesced_size += len(data)
+            if (self._coalesced_size >= self._coalesce_max_bytes) or (
+                    self._coalesce_on_newline and data[-1:] in _newline_endings):
+                self._dispatch_coalesced_data()
+
+    def _flush_coalesced_data(self):
+        """
+        Pass collected data to observers.
+
+        :return: None
+        """
+        with self._coalesce_lock:
+            if self._coalesced:
+                self._dispatch_coalesced_data()
+
+    def _dispatch_coalesced_data(self):
+        """
+        Pass collected data to observers. Call with held _coalesce_lock.
+
+        :return: None
+        """
+        self._coalesce_timer_handle.cancel()
+        data = self._coalesced[0][:0].join(self._coalesced)
+        recv_time = self._coalesced_recv_time
+        self._coalesced = list()
+        self._coalesced_size = 0
+        self._coalesced_recv_time = None
+        self._last_dispatch_time = time.time()
+        self._dispatch_data(data, recv_time)
+
+    def _dispatch_data(self, data, recv_time):
+        """
+        Log, decode and pass data to observers.
+
+        :param data: data from external-IO.
+        :param recv_time: time of data really read form connection.
+        :return: None
+        """
         self._log_data(msg=data, level=RAW_DATA,
-                       extra=extra)
+                       extra=self._received_data_log_extra)
 
         decoded_data = self.decode(data)
         self._log_data(msg=decoded_data, level=logging.INFO,
-                       extra=extra)
+                       extra=self._received_data_log_extra)
 
         self.notify_observers(decoded_data, recv_time)
 
@@ -87,8 +165,8 @@ class ThreadedMolerConnection(AbstractMolerConnection):
 
             if observer_key not in self._observer_wrappers:
                 self_for_observer, observer_reference = value
-                self._observer_wrappers[observer_key] = ObserverThreadWrapper(
-                    observer=observer_reference, observer_self=self_for_observer, logger=self.logger)
+                self._observer_wrappers[observer_key] = self._create_observer_wrapper(
+                    observer=observer_reference, observer_self=self_for_observer)
                 self._connection_closed_handlers[observer_key] = connection_closed_handler
 
     def unsubscribe(self, observer, connection_closed_handler):
@@ -114,10 +192,12 @@ class ThreadedMolerConnection(AbstractMolerConnection):
         Closes connection with notifying all observers about closing.
         :return: None
         """
-
+        self._flush_coalesced_data()
         for handler in list(self._connection_closed_handlers.values()):
             handler()
         super(ThreadedMolerConnection, self).shutdown()
+        if self._own_dispatcher:
+            self._own_dispatcher.request_stop()
 
     def notify_observers(self, data, recv_time):
         """
@@ -126,10 +206,34 @@ class ThreadedMolerConnection(AbstractMolerConnection):
         :param recv_time: time of data really read form connection.
         :return None
         """
+        if isinstance(data, six.text_type) and not isinstance(data, ReceivedText):
+            data = ReceivedText(data)  # lines are split once and shared by all observers
         subscribers_wrappers = list(self._observer_wrappers.values())
         for wrapper in subscribers_wrappers:
             wrapper.feed(data=data, recv_time=recv_time)
 
+    def _create_observer_wrapper(self, observer, observer_self):
+        """
+        Create wrapper passing data to observer according to selected observers dispatch mode.
+
+        :param observer: observer to wrap.
+        :param observer_self: self for observer if observer is method from object or None if observer is a function.
+        :return: wrapper of observer.
+        """
+        if self._observers_dispatch == 'pool':
+            return ObserverDispatcherWrapper(observer=observer, observer_self=observer_self, logger=self.logger,
+                                             dispatcher=self._get_dispatcher())
+        return ObserverThreadWrapper(observer=observer, observer_self=observer_self, logger=self.logger)
+
+    def _get_dispatcher(self):
+        workers = connection_cfg.observers_dispatch['workers']
+        if connection_cfg.observers_dispatch['scope'] == 'connection':
+            if self._own_dispatcher is None:
+                self._own_dispatcher = ObserverDispatcher(workers=workers,
+                                                          name="ObserverDispatcher-{}".format(self.name))
+            return self._own_dispatcher
+        return get_process_dispatcher(workers=workers)
+
     @staticmethod
     def _get_observer_key_value(observer):
         """
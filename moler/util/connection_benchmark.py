@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Measure cost of data path of ThreadedMolerConnection.
+
+Usage:
+python -m moler.util.connection_benchmark dispatch --observers 50 --chunks 10000
+python -m moler.util.connection_benchmark lines --observers 1 10 50 --chunks 2000
+python -m moler.util.connection_benchmark logging --chunks 100000
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import datetime
+import logging
+import threading
+import time
+from argparse import ArgumentParser
+
+from moler.config.loggers import TRACE
+from moler.events.textualevent import TextualEvent
+from moler.observer_thread_wrapper import ObserverWrapper
+from moler.threaded_moler_connection import ThreadedMolerConnection
+from moler.util.line_splitter import ReceivedText
+
+
+class _CountingObserver(object):
+    def __init__(self):
+        self.received_chunks = 0
+
+    def on_new_data(self, data, time_recv):
+        self.received_chunks += 1
+
+
+def _do_nothing():
+    pass
+
+
+def benchmark_observers_dispatch(mode, observers_count=50, chunks_count=10000, chunk="some line of output\n",
+                                 max_wait=60):
+    """
+    Measure threads used and throughput of notifying observers of single connection.
+
+    :param mode: observers dispatch mode: 'thread' or 'pool'.
+    :param observers_count: number of observers subscribed to connection.
+    :param chunks_count: number of chunks passed to connection.
+    :param chunk: data of single chunk.
+    :param max_wait: max time (in seconds) to wait for all observers to get all chunks.
+    :return: dict with measured values.
+    """
+    threads_before = threading.active_count()
+    moler_conn = ThreadedMolerConnection(observers_dispatch=mode)
+    observers = [_CountingObserver() for _ in range(observers_count)]
+    for observer in observers:
+        moler_conn.subscribe(observer=observer.on_new_data, connection_closed_handler=_do_nothing)
+    threads_used = threading.active_count() - threads_before
+
+    expected_notifications = observers_count * chunks_count
+    start_time = time.time()
+    for _ in range(chunks_count):
+        moler_conn.data_received(chunk, datetime.datetime.now())
+    notifications = 0
+    while time.time() - start_time < max_wait:
+        notifications = sum(observer.received_chunks for observer in observers)
+        if notifications >= expected_notifications:
+            break
+        time.sleep(0.001)
+    duration = time.time() - start_time
+    for observer in observers:
+        moler_conn.unsubscribe(observer=observer.on_new_data, connection_closed_handler=_do_nothing)
+    return {
+        'mode': mode,
+        'observers': observers_count,
+        'chunks': chunks_count,
+        'threads_used': threads_used,
+        'notifications': notifications,
+        'duration': duration,
+        'notifications_per_second': notifications / duration if duration else 0.0,
+    }
+
+
+class _LinesCountingEvent(TextualEvent):
+    def __init__(self):
+        super(_LinesCountingEvent, self).__init__()
+        self.received_lines = 0
+
+    def on_new_line(self, line, is_full_line):
+        self.received_lines += 1
+
+
+def benchmark_lines_splitting(shared, observers_count=10, chunks_count=2000,
+                              chunk="64 bytes from 10.0.2.15: icmp_req=3 ttl=64 time=0.045 ms\n" * 5 + "ping stat"):
+    """
+    Measure cost of splitting data into lines by textual observers of single connection.
+    Observers are fed directly (without threads of connection) to measure just processing of data.
+
+    :param shared: True if observers get lines split once by connection, False if each observer splits data itself.
+    :param observers_count: number of observers getting the same data.
+    :param chunks_count: number of chunks passed to observers.
+    :param chunk: data of single chunk.
+    :return: dict with measured values.
+    """
+    observers = [_LinesCountingEvent() for _ in range(observers_count)]
+    recv_time = datetime.datetime.now()
+    start_time = time.time()
+    for _ in range(chunks_count):
+        data = ReceivedText(chunk) if shared else chunk
+        for observer in observers:
+            observer.data_received(data, recv_time)
+    duration = time.time() - start_time
+    lines = sum(observer.received_lines for observer in observers)
+    return {
+        'shared': shared,
+        'observers': observers_count,
+        'chunks': chunks_count,
+        'lines': lines,
+        'duration': duration,
+        'chunks_per_second': chunks_count / duration if duration else 0.0,
+    }
+
+
+def benchmark_data_path_logging(chunks_count=100000, chunk="some line of output\n"):
+    """
+    Measure per chunk cost of logging on data path when TRACE level is off.
+    Data is passed synchronously (without threads) to measure just cost of connection and observer wrapper.
+
+    :param chunks_count: number of chunks passed.
+    :param chunk: data of single chunk.
+    :return: dict with measured values.
+    """
+    moler_conn = ThreadedMolerConnection(name="benchmark_logging")
+    moler_conn.logger.setLevel(logging.DEBUG)  # TRACE is below DEBUG so it is off
+    observer = _CountingObserver()
+    wrapper = ObserverWrapper(observer=observer.on_new_data.__func__, observer_self=observer,
+                              logger=moler_conn.logger)
+    recv_time = datetime.datetime.now()
+
+    start_time = time.time()
+    for _ in range(chunks_count):
+        moler_conn.data_received(chunk, recv_time)
+    connection_duration = time.time() - start_time
+
+    start_time = time.time()
+    for _ in range(chunks_count):
+        wrapper._notify_observer(chunk, recv_time)
+    wrapper_duration = time.time() - start_time
+    return {
+        'chunks': chunks_count,
+        'trace_enabled': moler_conn.logger.isEnabledFor(TRACE),
+        'connection_us_per_chunk': connection_duration * 1000000.0 / chunks_count,
+        'observer_wrapper_us_per_chunk': wrapper_duration * 1000000.0 / chunks_count,
+    }
+
+
+def _print_result(result):
+    print(", ".join("{}={}".format(key, value) for key, value in sorted(result.items())))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Measure data path of ThreadedMolerConnection.')
+    subparsers = parser.add_subparsers(dest='benchmark')
+    dispatch_parser = subparsers.add_parser('dispatch', help='threads and throughput of observers dispatch')
+    dispatch_parser.add_argument('--observers', type=int, default=50)
+    dispatch_parser.add_argument('--chunks', type=int, default=10000)
+    dispatch_parser.add_argument('--mode', choices=['thread', 'pool'], default=None,
+                                 help='dispatch mode to measure (both if not given)')
+    lines_parser = subparsers.add_parser('lines', help='cost of splitting data into lines by observers')
+    lines_parser.add_argument('--observers', type=int, nargs='+', default=[1, 10, 50])
+    lines_parser.add_argument('--chunks', type=int, default=2000)
+    logging_parser = subparsers.add_parser('logging', help='per chunk cost of logging on data path')
+    logging_parser.add_argument('--chunks', type=int, default=100000)
+    options = parser.parse_args()
+
+    if options.benchmark == 'dispatch':
+        modes = [options.mode] if options.mode else ['thread', 'pool']
+        for dispatch_mode in modes:
+            _print_result(benchmark_observers_dispatch(mode=dispatch_mode, observers_count=options.observers,
+                                                       chunks_count=options.chunks))
+    elif options.benchmark == 'lines':
+        for count in options.observers:
+            for shared_lines in (False, True):
+                _print_result(benchmark_lines_splitting(shared=shared_lines, observers_count=count,
+                                                        chunks_count=options.chunks))
+    elif options.benchmark == 'logging':
+        _print_result(benchmark_data_path_logging(chunks_count=options.chunks))
+    else:
+        parser.print_help()
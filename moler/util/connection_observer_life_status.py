@@ -11,8 +11,10 @@ class ConnectionObserverLifeStatus(object):
         """
         Creates instance of ConnectionObserverLifeStatus class.
         """
-        self.inactivity_timeout = 0.0  # If positive value and no data are sent by connection in this time then method
-        #                                on_inactivity will be called.
+        self.timing_listener = None  # Callable called without parameters when timeout or inactivity_timeout is changed.
+        #                              For Runners only!
+        self._inactivity_timeout = 0.0  # If positive value and no data are sent by connection in this time then
+        #                                 method on_inactivity will be called.
         self.last_feed_time = None  # Time of last called data_received or on_inactivity.
         self.start_time = 0.0  # means epoch: 1970-01-01 00:00:00
         self.in_terminating = False  # Set True if ConnectionObserver object is just after __timeout but it can do
@@ -24,6 +26,29 @@ class ConnectionObserverLifeStatus(object):
         self.terminating_timeout = 0.0  # value for terminating connection_observer when it timeouts. Set positive value
         #                                 for command if they can do anything if timeout. Set 0 for observer or command
         #                                 if it cannot do anything if timeout.
-        self.timeout = 20.0  # default
+        self._timeout = 20.0  # default
         self.is_done = False
         self.is_cancelled = False
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self._timeout = value
+        self._notify_timing_listener()
+
+    @property
+    def inactivity_timeout(self):
+        return self._inactivity_timeout
+
+    @inactivity_timeout.setter
+    def inactivity_timeout(self, value):
+        self._inactivity_timeout = value
+        self._notify_timing_listener()
+
+    def _notify_timing_listener(self):
+        timing_listener = self.timing_listener
+        if timing_listener is not None:
+            timing_listener()
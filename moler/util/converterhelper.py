@@ -9,6 +9,11 @@ __email__ = 'marcin.usielski@nokia.com'
 
 import re
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # Batch conversions use pure python path.
+
 
 class ConverterHelper(object):
     _instance = None
@@ -43,6 +48,7 @@ class ConverterHelper(object):
         "us": 0.000001,
         "ns": 0.000000001,
     }
+    _numpy_min_values = 64  # Shorter columns are converted quicker without NumPy.
 
     def to_bytes(self, str_bytes, binary_multipliers=True):
         """
@@ -112,6 +118,104 @@ class ConverterHelper(object):
                     raise ex
         return ret_val
 
+    def to_bytes_list(self, values, binary_multipliers=True):
+        """
+        Method to convert many sizes with units (like column of table) to sizes in bytes.
+        Every distinct text and unit is parsed only once.
+        :param values: Iterable of strings with bytes and optional unit
+        :param binary_multipliers: If True then binary multipliers will be used, if False then decimal
+        :return: list of int values in bytes (the same as first value returned by to_bytes)
+        """
+        multipliers = ConverterHelper._binary_multipliers
+        if not binary_multipliers:
+            multipliers = ConverterHelper._dec_multipliers
+
+        def multiplier_of_unit(value_unit, str_bytes):
+            value_unit = value_unit.lower()
+            if value_unit not in multipliers:
+                raise ValueError("Unsupported unit '{}' in passed value: '{}'".format(value_unit, str_bytes))
+            return multipliers[value_unit]
+
+        values_in_units, units_multipliers = self._split_values_and_units(values, multiplier_of_unit)
+        return self._scale_values(values_in_units, units_multipliers, to_int=True)
+
+    def to_seconds_list(self, values):
+        """
+        Method to convert many string times with units (like column of table) to seconds.
+        Every distinct text and unit is parsed only once.
+        :param values: Iterable of strings with time and unit.
+        :return: list of float values in seconds (the same as first value returned by to_seconds_str)
+        """
+        def multiplier_of_unit(value_unit, str_time):
+            return self.to_seconds(1, value_unit)
+
+        values_in_units, units_multipliers = self._split_values_and_units(values, multiplier_of_unit)
+        return self._scale_values(values_in_units, units_multipliers, to_int=False)
+
+    def to_numbers(self, values, raise_exception=True):
+        """
+        Convert many numbers (like column of table) to int or float. Every distinct text is converted only once.
+
+        :param values: iterable of strings with number inside
+        :param raise_exception: if True then raise exception if cannot convert to number, If False then use 0.
+        :return: list of int or float values.
+        """
+        converted = dict()
+        numbers = list()
+        for value in values:
+            if value not in converted:
+                converted[value] = self.to_number(value, raise_exception=raise_exception)
+            numbers.append(converted[value])
+        return numbers
+
+    def _split_values_and_units(self, values, multiplier_of_unit):
+        """
+        Parse texts into numbers and multipliers of their units.
+        :param values: Iterable of strings with value and optional unit.
+        :param multiplier_of_unit: Callable(unit, text) returning multiplier of (not empty) unit.
+        :return: 2 lists: float values in units, multipliers (None when text has no unit).
+        """
+        parsed = dict()  # text -> (value in units, multiplier)
+        units = dict()  # unit -> multiplier
+        values_in_units = list()
+        units_multipliers = list()
+        for text in values:
+            if text not in parsed:
+                m = ConverterHelper._re_to_bytes.search(text)
+                value_unit = m.group("UNIT")
+                multiplier = None
+                if value_unit:
+                    if value_unit not in units:
+                        units[value_unit] = multiplier_of_unit(value_unit, text)
+                    multiplier = units[value_unit]
+                parsed[text] = (float(m.group("VALUE")), multiplier)
+            value_in_units, multiplier = parsed[text]
+            values_in_units.append(value_in_units)
+            units_multipliers.append(multiplier)
+        return values_in_units, units_multipliers
+
+    def _scale_values(self, values_in_units, units_multipliers, to_int):
+        """
+        Multiply values by multipliers of their units.
+        :param values_in_units: list of float values.
+        :param units_multipliers: list of multipliers (None means value without unit).
+        :param to_int: If True then results are truncated to int.
+        :return: list of scaled values.
+        """
+        if (numpy is not None) and (len(values_in_units) >= ConverterHelper._numpy_min_values):
+            multipliers = numpy.array([1 if multiplier is None else multiplier for multiplier in units_multipliers],
+                                      dtype=numpy.float64)
+            scaled = numpy.multiply(numpy.array(values_in_units, dtype=numpy.float64), multipliers)
+            if not to_int:
+                return scaled.tolist()
+            if numpy.all(numpy.abs(scaled) < 2 ** 63):
+                return numpy.trunc(scaled).astype(numpy.int64).tolist()
+        scaled = list()
+        for value_in_units, multiplier in zip(values_in_units, units_multipliers):
+            value = value_in_units if multiplier is None else multiplier * value_in_units
+            scaled.append(int(value) if to_int else value)
+        return scaled
+
     @staticmethod
     def get_converter_helper():
         if ConverterHelper._instance is None:
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Splitting of data received on connection into lines.
+
+Textual commands and events split every chunk of data into lines, check newline char(s) at the end of each line
+and strip them. With many observers on the same connection the same chunk was split by each of them.
+ReceivedText remembers its lines so chunk is split only once (per set of newline chars)
+and all observers share the result.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import six
+
+default_newline_chars = ("\n", "\r")  # New line chars on device, not system with script!
+
+
+class ReceivedText(six.text_type):
+    """
+    Text received on connection. Behaves as plain text for observers not aware of it.
+    Observers aware of it take already split lines via split_into_lines().
+    """
+
+    def __new__(cls, data):
+        text = super(ReceivedText, cls).__new__(cls, data)
+        text._lines = dict()  # newline chars -> tuple of lines
+        return text
+
+    def lines(self, newline_chars=default_newline_chars):
+        """
+        Return lines of text. Text is split only at first call for given newline chars.
+
+        :param newline_chars: new line chars on device.
+        :return: tuple of (chunk, line, is_full_line) - see split_into_lines().
+        """
+        try:
+            return self._lines[newline_chars]
+        except KeyError:
+            lines = _split(text=self, newline_chars=newline_chars)
+            self._lines[newline_chars] = lines
+            return lines
+        except TypeError:  # not hashable newline chars, can't be cached
+            return _split(text=self, newline_chars=newline_chars)
+
+
+def split_into_lines(data, newline_chars=default_newline_chars):
+    """
+    Split data into lines.
+
+    :param data: text (str or ReceivedText) to split.
+    :param newline_chars: new line chars on device.
+    :return: tuple of (chunk, line, is_full_line). Chunk is part of data with newline char(s), line is chunk
+     without newline char(s) and is_full_line is True if chunk has newline char(s) at the end.
+     If newline_chars are not single chars then line and is_full_line are None and observer has to check chunk itself.
+    """
+    if isinstance(data, ReceivedText):
+        return data.lines(newline_chars)
+    return _split(text=data, newline_chars=newline_chars)
+
+
+def _split(text, newline_chars):
+    chunks = text.splitlines(True)
+    if not _are_single_chars(newline_chars):
+        return tuple((chunk, None, None) for chunk in chunks)
+    chars_to_strip = "".join(newline_chars)
+    lines = list()
+    for chunk in chunks:
+        if chunk.endswith(newline_chars):
+            lines.append((chunk, chunk.rstrip(chars_to_strip), True))
+        else:
+            lines.append((chunk, chunk, False))
+    return tuple(lines)
+
+
+def _are_single_chars(newline_chars):
+    """
+    Line from previous chunks may be concatenated with next chunk only if newline chars are tuple of single chars.
+    Then new line at the end of concatenated line depends only on the last chunk.
+
+    :param newline_chars: new line chars on device.
+    :return: True if lines may be precomputed, False otherwise.
+    """
+    if not isinstance(newline_chars, tuple):
+        return False
+    for char in newline_chars:
+        if len(char) != 1:
+            return False
+    return True
@@ -18,6 +18,54 @@ def __dummy():
 
 
 _srcfile = os.path.normcase(__dummy.__code__.co_filename)
+_normcase_filenames = dict()  # filename of code -> its normalized form (os.path.normcase is costly on some OS)
+_unknown_caller = "(unknown file)", 0, "(unknown function)"
+_caller_lookup_settings = dict()  # logger name -> False if logger (and its children) logs without caller location
+_caller_lookup_of_logger = dict()  # cache: logger name -> True if caller location should be found
+
+
+def set_caller_lookup(logger_name, enabled=True):
+    """
+    Turn on/off finding caller location (file, line, function) of log records.
+    Finding caller walks stack frames for every record - switch it off for high volume loggers.
+
+    :param logger_name: name of logger, setting applies also to its children (i.e. 'moler.connection').
+    :param enabled: True to find caller location, False to log "(unknown file)".
+    :return: None
+    """
+    _caller_lookup_settings[logger_name] = enabled
+    _caller_lookup_of_logger.clear()
+
+
+def is_caller_lookup_enabled(logger_name):
+    """
+    Check if caller location should be found for records of logger.
+
+    :param logger_name: name of logger.
+    :return: True if caller location should be found, False otherwise.
+    """
+    try:
+        return _caller_lookup_of_logger[logger_name]
+    except KeyError:
+        enabled = True
+        parts = str(logger_name).split('.')
+        for nb_parts in range(len(parts), 0, -1):
+            name = '.'.join(parts[:nb_parts])
+            if name in _caller_lookup_settings:
+                enabled = _caller_lookup_settings[name]
+                break
+        _caller_lookup_of_logger[logger_name] = enabled
+        return enabled
+
+
+def _normcase_filename(code):
+    filename = code.co_filename
+    try:
+        return _normcase_filenames[filename]
+    except KeyError:
+        normcase_filename = os.path.normcase(filename)
+        _normcase_filenames[filename] = normcase_filename
+        return normcase_filename
 
 
 def find_caller(levels_to_go_up=0):
@@ -37,7 +85,7 @@ def find_caller(levels_to_go_up=0):
     rv = "(unknown file)", 0, "(unknown function)", None
     while hasattr(f, "f_code"):
         co = f.f_code
-        filename = os.path.normcase(co.co_filename)
+        filename = _normcase_filename(co)
         if filename == _srcfile:
             f = f.f_back
             continue
@@ -82,10 +130,13 @@ def log_into_logger(logger, level, msg, extra=None, levels_to_go_up=0):
     :return: None
     """
     if logger.isEnabledFor(level):
-        try:
-            fn, lno, func = find_caller(levels_to_go_up)
-        except ValueError:  # pragma: no cover
-            fn, lno, func = "(unknown file)", 0, "(unknown function)"
+        if is_caller_lookup_enabled(logger.name):
+            try:
+                fn, lno, func = find_caller(levels_to_go_up)
+            except ValueError:  # pragma: no cover
+                fn, lno, func = _unknown_caller
+        else:
+            fn, lno, func = _unknown_caller
         record = logger.makeRecord(logger.name, level, fn, lno, msg, [], None, func, extra)
         logger.handle(record)
 
@@ -162,6 +162,7 @@ class MolerTest(object):
                     err_msg += "  {}) {}{}\n".format(i, exc_traceback, repr(exc))
                 except AttributeError:
                     err_msg += repr(exc)
+        err_msg += MolerTest._prepare_dropped_exceptions_msg()
 
         if len(MolerTest._list_of_errors) > 0:
             err_msg += "Moler caught some error messages during execution:\n"
@@ -171,6 +172,14 @@ class MolerTest(object):
 
         return err_msg
 
+    @staticmethod
+    def _prepare_dropped_exceptions_msg():
+        dropped_exceptions = ConnectionObserver.get_dropped_unraised_exceptions_count(reset=True)
+        if dropped_exceptions > 0:
+            return "There were {} more unhandled exceptions not stored by Moler (too many).\n".format(
+                dropped_exceptions)
+        return ""
+
     @staticmethod
     def _check_exceptions_occured(caught_exception=None):
         err_msg = MolerTest._prepare_err_msg(caught_exception)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Measure throughput of command/event parsers.
+
+Samples of output documented inside modules of commands and events (COMMAND_OUTPUT/EVENT_OUTPUT) are found
+the same way as for documentation check (see moler.util.cmds_events_doc). Every sample is passed directly into
+data_received() of new command/event instance - without connection and its delays - so only parsing is measured.
+
+Usage:
+python -m moler.util.parser_benchmark --path moler/cmd --repeat 100 --output parsers.json
+python -m moler.util.parser_benchmark --path moler/events --classes Wait4prompt Ping --no-allocations
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+from argparse import ArgumentParser
+
+from moler.threaded_moler_connection import ThreadedMolerConnection
+from moler.util.cmds_events_doc import (check_cmd_or_event, _walk_moler_nonabstract_commands,
+                                        _retrieve_command_documentation, _get_doc_variant, _create_command)
+from moler.util.line_splitter import ReceivedText
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None  # For python 2
+
+
+def benchmark_parsers(path, repeat=100, classes=None, allocations=True):
+    """
+    Measure parsing of documented outputs of all commands/events found in path.
+
+    :param path: path to directory with commands or events (moler/cmd or moler/events).
+    :param repeat: how many times every output is parsed (every time by new instance).
+    :param classes: list of names of classes to measure or None to measure all found classes.
+    :param allocations: True to measure memory allocated while parsing (python 3 only).
+    :return: dict with measured values (may be dumped into json).
+    """
+    observer_type, base_class = check_cmd_or_event(path)
+    results = list()
+    errors = list()
+    for moler_module, moler_class in _walk_moler_nonabstract_commands(path=path, base_class=base_class):
+        if classes and moler_class.__name__ not in classes:
+            continue
+        test_data = _retrieve_command_documentation(moler_module, observer_type)
+        for variant in sorted(test_data):
+            if '{}_OUTPUT'.format(observer_type) not in test_data[variant]:
+                continue
+            class_name = "{}.{}".format(moler_module.__name__, moler_class.__name__)
+            try:
+                output, kwargs, _ = _get_doc_variant(test_data, variant, observer_type)
+                result = _benchmark_parser(moler_class=moler_class, kwargs=kwargs, output=output, repeat=repeat,
+                                           allocations=allocations)
+            except Exception as err:
+                errors.append({'class': class_name, 'variant': variant, 'error': str(err)})
+                continue
+            result['class'] = class_name
+            result['variant'] = variant
+            results.append(result)
+    return {
+        'date': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'path': path,
+        'repeat': repeat,
+        'results': results,
+        'errors': errors,
+    }
+
+
+def _benchmark_parser(moler_class, kwargs, output, repeat, allocations):
+    """
+    Measure parsing of one output by one class.
+
+    :param moler_class: class of command or event.
+    :param kwargs: parameters of constructor.
+    :param output: output to parse.
+    :param repeat: how many times output is parsed.
+    :param allocations: True to measure memory allocated while parsing.
+    :return: dict with measured values.
+    """
+    lines_count = len(output.splitlines())
+    parsing_time = 0.0
+    for _ in range(repeat):
+        observer = _create_observer(moler_class, kwargs)
+        data = ReceivedText(output)
+        start_time = time.time()
+        observer.data_received(data, datetime.datetime.now())
+        parsing_time += time.time() - start_time
+    result = {
+        'lines': lines_count,
+        'repeat': repeat,
+        'seconds': parsing_time,
+        'lines_per_sec': (lines_count * repeat / parsing_time) if parsing_time > 0 else None,
+        'allocated_blocks': None,
+        'allocated_bytes': None,
+    }
+    if allocations and tracemalloc is not None:
+        result['allocated_blocks'], result['allocated_bytes'] = _measure_allocations(moler_class, kwargs, output)
+    return result
+
+
+def _measure_allocations(moler_class, kwargs, output):
+    """
+    Measure memory allocated by single parsing of output (separately from time measurement since tracing is slow).
+
+    :return: tuple (number of memory blocks allocated, sum of their sizes in bytes).
+    """
+    observer = _create_observer(moler_class, kwargs)
+    data = ReceivedText(output)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        observer.data_received(data, datetime.datetime.now())
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    size = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    return blocks, size
+
+
+def _drop_sent_data(data):
+    pass  # parser may send data (like ctrl+c) - there is no device to get it
+
+
+def _create_observer(moler_class, kwargs):
+    moler_conn = ThreadedMolerConnection(how2send=_drop_sent_data, encoder=lambda data: data.encode("utf-8"),
+                                         decoder=lambda data: data.decode("utf-8"))
+    observer, _ = _create_command(moler_class, moler_conn, kwargs)
+    if hasattr(observer, 'command_string'):
+        _ = observer.command_string  # command string (and regex of its echo) is built when command is sent
+    return observer
+
+
+def _print_results(benchmark):
+    for result in sorted(benchmark['results'], key=lambda res: res['lines_per_sec'] or 0):
+        print("{:<70} {:>8} lines {:>12.0f} lines/s {!s:>10} blocks".format(
+            "{}{}".format(result['class'], result['variant']), result['lines'], result['lines_per_sec'] or 0,
+            result['allocated_blocks']))
+    for error in benchmark['errors']:
+        print("ERROR {}{}: {}".format(error['class'], error['variant'], error['error']))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Moler's parsers benchmark")
+    parser.add_argument('--path', required=True, help='directory with commands or events')
+    parser.add_argument('--repeat', type=int, default=100, help='how many times every output is parsed')
+    parser.add_argument('--classes', nargs='*', help='names of classes to measure (default: all)')
+    parser.add_argument('--no-allocations', action='store_true', help="don't measure memory allocations")
+    parser.add_argument('--output', help='json file to store results into')
+    options = parser.parse_args()
+
+    if not os.path.isdir(options.path):
+        print('\n{} is not a directory!\n'.format(options.path))
+        parser.print_help()
+        sys.exit(1)
+    benchmark_result = benchmark_parsers(path=os.path.abspath(options.path), repeat=options.repeat,
+                                         classes=options.classes, allocations=not options.no_allocations)
+    _print_results(benchmark_result)
+    if options.output:
+        with open(options.output, 'w') as output_file:
+            json.dump(benchmark_result, output_file, indent=2, sort_keys=True)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+r"""
+Matching of line against set of regular expressions.
+
+Most lines passed to events match none of their patterns. Every match of regular expression must contain
+literal parts of that expression (like 'Last login' in r'Last login:\s+(\S+)'). Checking if such literal is
+inside line (substring search) is much cheaper than running regular expression so regular expression runs
+only for lines containing its required literal.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import re
+import six
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse  # For python < 3.11
+
+
+class RegexSet(object):
+    """
+    Set of compiled regular expressions with prefilter based on required literals of each expression.
+    """
+
+    def __init__(self, patterns):
+        """
+        Create set of regular expressions.
+
+        :param patterns: list of compiled regular expressions.
+        """
+        self.patterns = list(patterns)
+        self._required_literals = dict()
+        for pattern in self.patterns:
+            self._required_literals[pattern] = required_literal(pattern)
+
+    def search_first(self, line, patterns=None):
+        """
+        Search for first pattern (in order of patterns) found in line.
+
+        :param line: line to search in.
+        :param patterns: list of patterns from this set to check or None to check all patterns of set.
+        :return: tuple (index of pattern in patterns, match object) or (None, None) if no pattern found.
+        """
+        if patterns is None:
+            patterns = self.patterns
+        for index, pattern in enumerate(patterns):
+            match = self._search(pattern, line)
+            if match:
+                return index, match
+        return None, None
+
+    def search_all(self, line):
+        """
+        Search for all patterns found in line.
+
+        :param line: line to search in.
+        :return: list of tuples (index of pattern, match object) of all patterns found in line.
+        """
+        found = list()
+        for index, pattern in enumerate(self.patterns):
+            match = self._search(pattern, line)
+            if match:
+                found.append((index, match))
+        return found
+
+    def search(self, pattern, line):
+        """
+        Search for single pattern from this set.
+
+        :param pattern: compiled pattern from this set.
+        :param line: line to search in.
+        :return: match object or None if pattern not found.
+        """
+        return self._search(pattern, line)
+
+    def _search(self, pattern, line):
+        literal = self._required_literals.get(pattern, None)
+        if literal is not None and literal not in line:
+            return None
+        return pattern.search(line)
+
+
+def required_literal(pattern):
+    """
+    Find the longest literal that every match of pattern must contain.
+
+    :param pattern: compiled regular expression.
+    :return: literal (the same type as pattern) or None if pattern has no required literal.
+    """
+    if not isinstance(pattern.pattern, six.text_type) or (pattern.flags & re.IGNORECASE):
+        return None
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:  # pragma: no cover - pattern is already compiled so should parse
+        return None
+    longest = []
+    current = []
+    for opcode, value in parsed:  # Only top level is concatenation - each top level literal is required.
+        if opcode == sre_parse.LITERAL:
+            current.append(six.unichr(value))
+            if len(current) > len(longest):
+                longest = current
+        else:
+            current = []
+    if not longest:
+        return None
+    return u"".join(longest)
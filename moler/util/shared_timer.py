@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Single thread calling scheduled callbacks at requested time.
+
+Used instead of many threads (or loops) each waking up periodically just to check
+if some deadline has passed.
+"""
+
+__author__ = 'Grzegorz Latuszek, Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'grzegorz.latuszek@nokia.com, marcin.usielski@nokia.com'
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+_process_timer = None
+_process_timer_lock = threading.Lock()
+
+
+def get_process_timer():
+    """
+    Get timer shared by all users inside process. Timer is started at first call.
+
+    :return: SharedTimer
+    """
+    global _process_timer
+    with _process_timer_lock:
+        if _process_timer is None:
+            _process_timer = SharedTimer(name="MolerProcessTimer")
+        return _process_timer
+
+
+class TimerHandle(object):
+    """Handle of callback scheduled inside SharedTimer - allows to cancel it."""
+
+    def __init__(self, when, callback, args, timer=None):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self.in_heap = False  # True while handle waits inside heap of timer
+        self._timer = timer
+
+    def cancel(self):
+        """
+        Cancel scheduled callback. Safe to call many times, also after callback was called.
+
+        :return: None
+        """
+        if self._timer is None:
+            self.cancelled = True
+        else:
+            self._timer._cancel(self)
+
+    def __str__(self):
+        return "TimerHandle(when={:.3f}, callback={}, cancelled={})".format(self.when, self.callback, self.cancelled)
+
+
+class SharedTimer(object):
+    """
+    Calls scheduled callbacks from single thread.
+    Thread sleeps till nearest deadline or till new (earlier) callback is scheduled - there is no periodic wakeup.
+    Callbacks should be short since they delay other callbacks.
+    Cancelled callbacks are only counted; heap is rebuilt without them when they are majority of heap.
+    """
+
+    _min_cancelled_to_rebuild = 64  # rebuilding small heap is not worth it
+
+    def __init__(self, name="MolerSharedTimer"):
+        """
+        Create timer and start its thread.
+
+        :param name: name of timer thread.
+        """
+        self.logger = logging.getLogger('moler.timer')
+        self._heap = list()
+        self._cancelled_in_heap = 0
+        self._counter = itertools.count()  # keeps FIFO order of callbacks with the same deadline
+        self._condition = threading.Condition()
+        self._request_end = False
+        self._thread = threading.Thread(target=self._loop, name=name)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def call_at(self, when, callback, *args):
+        """
+        Schedule callback to be called at given time.
+
+        :param when: time (as returned by time.time()) when callback should be called.
+        :param callback: callable to call.
+        :param args: arguments to pass to callback.
+        :return: TimerHandle
+        """
+        handle = TimerHandle(when=when, callback=callback, args=args, timer=self)
+        with self._condition:
+            heapq.heappush(self._heap, (when, next(self._counter), handle))
+            handle.in_heap = True
+            if self._heap[0][2] is handle:
+                self._condition.notify()  # new nearest deadline
+        return handle
+
+    def call_later(self, delay, callback, *args):
+        """
+        Schedule callback to be called after given delay.
+
+        :param delay: delay in seconds.
+        :param callback: callable to call.
+        :param args: arguments to pass to callback.
+        :return: TimerHandle
+        """
+        return self.call_at(time.time() + delay, callback, *args)
+
+    def call_soon(self, callback, *args):
+        """
+        Schedule callback to be called as soon as possible from timer thread.
+
+        :param callback: callable to call.
+        :param args: arguments to pass to callback.
+        :return: TimerHandle
+        """
+        return self.call_at(time.time(), callback, *args)
+
+    def pending_count(self):
+        """
+        :return: number of scheduled and not cancelled callbacks.
+        """
+        with self._condition:
+            return len(self._heap) - self._cancelled_in_heap
+
+    def request_stop(self):
+        """
+        Stop timer thread. Callbacks not called yet are dropped.
+
+        :return: None
+        """
+        with self._condition:
+            self._request_end = True
+            self._condition.notify()
+
+    def _cancel(self, handle):
+        """
+        Cancel handle scheduled inside this timer.
+
+        :param handle: TimerHandle to cancel.
+        :return: None
+        """
+        with self._condition:
+            if handle.cancelled:
+                return
+            handle.cancelled = True
+            if handle.in_heap:
+                self._cancelled_in_heap += 1
+                if (self._cancelled_in_heap >= SharedTimer._min_cancelled_to_rebuild) and (
+                        2 * self._cancelled_in_heap > len(self._heap)):
+                    self._remove_cancelled_handles()
+
+    def _remove_cancelled_handles(self):
+        """
+        Rebuild heap (inside held condition) without cancelled handles.
+
+        :return: None
+        """
+        for entry in self._heap:
+            if entry[2].cancelled:
+                entry[2].in_heap = False
+        self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+        heapq.heapify(self._heap)
+        self._cancelled_in_heap = 0
+
+    def _loop(self):
+        while True:
+            with self._condition:
+                handle = self._take_expired_handle()
+                if handle is None:
+                    return
+            if handle.cancelled:
+                continue
+            try:
+                handle.callback(*handle.args)
+            except Exception:
+                self.logger.exception(msg=r'Exception inside timer callback: {}'.format(handle))
+
+    def _take_expired_handle(self):
+        """
+        Wait (inside held condition) for nearest deadline.
+
+        :return: TimerHandle which deadline has passed or None if timer should stop.
+        """
+        while not self._request_end:
+            if not self._heap:
+                self._condition.wait()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                self._condition.wait(delay)
+                continue
+            handle = heapq.heappop(self._heap)[2]
+            handle.in_heap = False
+            if handle.cancelled:
+                self._cancelled_in_heap -= 1
+            return handle
+        return None
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Registry of exceptions set on connection observers but not raised yet (nobody called result() of observer).
+
+Exceptions are indexed so replacing exception of observer, removing raised one and checking if exception is still
+not raised take constant time. Registry keeps only newest exceptions (max_size) - long running tests with many
+failing background events don't make it grow without limit.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+from collections import OrderedDict
+
+
+class UnraisedExceptions(object):
+    """
+    Ordered (oldest first) registry of not raised exceptions. It is not thread safe - caller has to lock it.
+    """
+
+    def __init__(self, max_size=1000):
+        """
+        :param max_size: how many newest exceptions are kept. None means no limit.
+        """
+        self.max_size = max_size
+        self.dropped = 0  # number of exceptions removed to keep max_size
+        self._exceptions = OrderedDict()  # id(exception) -> (exception, connection name)
+
+    def add(self, exception, connection_name=None):
+        """
+        Add exception.
+
+        :param exception: exception not raised yet.
+        :param connection_name: name of connection (device) of observer which exception was set.
+        :return: None
+        """
+        self._exceptions.pop(id(exception), None)
+        self._exceptions[id(exception)] = (exception, connection_name)
+        if self.max_size is not None:
+            while len(self._exceptions) > self.max_size:
+                self._exceptions.popitem(last=False)
+                self.dropped += 1
+
+    def replace(self, old_exception, new_exception, connection_name=None):
+        """
+        Replace exception of observer by new one.
+
+        :param old_exception: previous exception of observer.
+        :param new_exception: new exception of observer.
+        :param connection_name: name of connection (device) of observer.
+        :return: True if old exception was found, False otherwise.
+        """
+        found = self.remove(old_exception)
+        self.add(new_exception, connection_name=connection_name)
+        return found
+
+    def remove(self, exception):
+        """
+        Remove exception (f.ex. when it is raised).
+
+        :param exception: exception to remove.
+        :return: True if exception was found, False otherwise.
+        """
+        if exception in self:
+            del self._exceptions[id(exception)]
+            return True
+        return False
+
+    def get(self, remove=False, connection_name=None):
+        """
+        Get exceptions.
+
+        :param remove: True to remove returned exceptions from registry.
+        :param connection_name: name of connection (device) to get only exceptions of its observers, None for all.
+        :return: list of exceptions, oldest first.
+        """
+        selected = [(key, exception) for key, (exception, name) in self._exceptions.items()
+                    if connection_name is None or name == connection_name]
+        if remove:
+            if connection_name is None:
+                self._exceptions = OrderedDict()
+            else:
+                for key, _ in selected:
+                    del self._exceptions[key]
+        return [exception for _, exception in selected]
+
+    def summary(self):
+        """
+        :return: one line description of registry content.
+        """
+        if not self._exceptions:
+            return "no not raised exceptions"
+        newest, _ = next(reversed(self._exceptions.values()))
+        return "{} not raised exception(s), {} dropped, newest: {!r}".format(len(self._exceptions), self.dropped,
+                                                                             newest)
+
+    def __contains__(self, exception):
+        entry = self._exceptions.get(id(exception))
+        return (entry is not None) and (entry[0] is exception)
+
+    def __len__(self):
+        return len(self._exceptions)
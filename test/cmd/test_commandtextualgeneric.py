@@ -19,6 +19,36 @@ def test_correct_closing_of_ctrl_c_broken_command(buffer_connection, textual_com
     assert not cmd.is_end_of_cmd_output(line="Xadb_shell@12345678 $")
 
 
+def test_streaming_command_passes_records_to_iterator(buffer_connection):
+    from moler.cmd.unix.tcpdump import Tcpdump, COMMAND_OUTPUT_vv
+    cmd = Tcpdump(connection=buffer_connection.moler_connection, options="-c 4 -vv")
+    cmd.enable_streaming(keep_last=0, iterable=True)
+    buffer_connection.remote_inject_response([COMMAND_OUTPUT_vv])
+    result = cmd()
+    packets = list(cmd.records())
+    assert [nr for nr, _ in packets] == ['1', '2', '3', '4']
+    assert packets[0][1]['Reference Timestamp'] == '0.000000000'
+    assert ['4'] == [key for key, value in result.items() if isinstance(value, dict)]  # last packet kept to parse it
+
+
+def test_streaming_command_passes_only_complete_records_to_callback(buffer_connection):
+    from moler.cmd.unix.tcpdump import Tcpdump, COMMAND_OUTPUT_vv, COMMAND_RESULT_vv
+    cmd = Tcpdump(connection=buffer_connection.moler_connection, options="-c 4 -vv")
+    packets = list()
+    cmd.enable_streaming(callback=lambda nr_and_packet: packets.append((nr_and_packet[0], dict(nr_and_packet[1]))),
+                         keep_last=0)
+    buffer_connection.remote_inject_response([COMMAND_OUTPUT_vv])
+    cmd()
+    assert packets == [(str(nr), COMMAND_RESULT_vv[str(nr)]) for nr in range(1, 5)]
+
+
+def test_streaming_needs_enabling_before_iterating(buffer_connection, textual_command_class):
+    from moler.exceptions import WrongUsage
+    cmd = textual_command_class(connection=buffer_connection.moler_connection)
+    with pytest.raises(WrongUsage):
+        next(cmd.records())
+
+
 @pytest.fixture()
 def textual_command_class():
     from moler.cmd.commandtextualgeneric import CommandTextualGeneric
@@ -30,6 +30,18 @@ def test_cat_raise_exception_wrong_path_exception(buffer_connection, command_out
         cat_cmd()
 
 
+def test_cat_in_streaming_mode_keeps_only_last_lines(buffer_connection):
+    from moler.cmd.unix.cat import COMMAND_OUTPUT_no_parms, COMMAND_RESULT_no_parms
+    buffer_connection.remote_inject_response([COMMAND_OUTPUT_no_parms])
+    cat_cmd = Cat(connection=buffer_connection.moler_connection, path="/etc/network/interfaces")
+    streamed_lines = list()
+    cat_cmd.enable_streaming(callback=streamed_lines.append, keep_last=2)
+    result = cat_cmd()
+    assert streamed_lines == COMMAND_RESULT_no_parms['LINES']
+    assert result['LINES'] == COMMAND_RESULT_no_parms['LINES'][-2:]
+    assert cat_cmd.streamed_records == len(COMMAND_RESULT_no_parms['LINES'])
+
+
 @pytest.fixture
 def command_output():
     data = """
@@ -244,19 +244,65 @@ def test_iperf_server_detects_all_multiport_records_of_interval(buffer_connectio
                      'Bandwidth': 123500,
                      'Lost_vs_Total_Datagrams': (0, 84),
                      'Bandwidth Raw': '988 Kbits/sec'}
-    iperf_cmd.current_ret['CONNECTIONS'][parallel_client_1] = [single_record]
-    iperf_cmd.current_ret['CONNECTIONS'][parallel_client_2] = [single_record]
-    assert iperf_cmd._all_multiport_records_of_interval(connection_name=parallel_client_2) is False
-    iperf_cmd.current_ret['CONNECTIONS'][parallel_client_3] = [single_record]
-    assert iperf_cmd._all_multiport_records_of_interval(connection_name=parallel_client_3) is True
+    summary_connection = ('multiport@192.168.44.1', '5016@192.168.44.130')
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_1, single_record)
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_2, single_record)
+    assert summary_connection not in iperf_cmd.current_ret['CONNECTIONS']
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_3, single_record)
+    assert len(iperf_cmd.current_ret['CONNECTIONS'][summary_connection]) == 1
     second_record = dict(single_record)
     second_record['Interval'] = (1.0, 2.0)
-    iperf_cmd.current_ret['CONNECTIONS'][parallel_client_1] = [second_record]
-    assert iperf_cmd._all_multiport_records_of_interval(connection_name=parallel_client_1) is False
-    iperf_cmd.current_ret['CONNECTIONS'][parallel_client_2] = [second_record]
-    assert iperf_cmd._all_multiport_records_of_interval(connection_name=parallel_client_2) is False
-    iperf_cmd.current_ret['CONNECTIONS'][parallel_client_3] = [second_record]
-    assert iperf_cmd._all_multiport_records_of_interval(connection_name=parallel_client_3) is True
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_1, second_record)
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_1, second_record)
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_2, second_record)
+    assert len(iperf_cmd.current_ret['CONNECTIONS'][summary_connection]) == 1
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_3, second_record)
+    assert len(iperf_cmd.current_ret['CONNECTIONS'][summary_connection]) == 2
+    assert iperf_cmd.current_ret['CONNECTIONS'][summary_connection][-1]['Interval'] == (1.0, 2.0)
+    assert iperf_cmd.current_ret['CONNECTIONS'][summary_connection][-1]['Transfer'] == 3 * 123904
+    assert iperf_cmd.current_ret['CONNECTIONS'][summary_connection][-1]['Lost_vs_Total_Datagrams'] == (0, 3 * 84)
+    assert iperf_cmd._multiport_summaries == {}
+
+
+def test_iperf_server_drops_multiport_summaries_of_intervals_not_reported_by_all_ports(buffer_connection):
+    from moler.cmd.unix import iperf2
+    from moler.exceptions import ParsingDone
+    iperf_cmd = iperf2.Iperf2(connection=buffer_connection.moler_connection,
+                              **iperf2.COMMAND_KWARGS_multiple_connections_udp_server)
+    client_connection_lines = [
+        "[  1] local 192.168.44.130 port 5016 connected with 192.168.44.1 port 51914",
+        "[  2] local 192.168.44.130 port 5016 connected with 192.168.44.1 port 51915",
+    ]
+    for line in client_connection_lines:
+        try:
+            iperf_cmd._parse_connection_name_and_id(line)
+        except ParsingDone:
+            pass
+    parallel_client_1 = ('51914@192.168.44.1', '5016@192.168.44.130')
+    parallel_client_2 = ('51915@192.168.44.1', '5016@192.168.44.130')
+    summary_connection = ('multiport@192.168.44.1', '5016@192.168.44.130')
+
+    def record_of_interval(start, end):
+        return {'Lost_Datagrams_ratio': '0%',
+                'Jitter': '1.2 ms',
+                'Transfer': 123904,
+                'Interval': (start, end),
+                'Transfer Raw': '121 KBytes',
+                'Bandwidth': 123500,
+                'Lost_vs_Total_Datagrams': (0, 84),
+                'Bandwidth Raw': '988 Kbits/sec'}
+
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_1, record_of_interval(0.0, 1.0))
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_1, record_of_interval(1.0, 2.0))
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_2, record_of_interval(1.0, 2.0))
+    assert iperf_cmd.current_ret['CONNECTIONS'][summary_connection][-1]['Interval'] == (1.0, 2.0)
+    assert iperf_cmd._multiport_summaries == {}  # (0.0, 1.0) won't be completed by port 51915
+
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_1, record_of_interval(2.0, 3.0))
+    assert len(iperf_cmd._multiport_summaries) == 1
+    iperf_cmd._update_current_ret(summary_connection, record_of_interval(0.0, 10.0))
+    iperf_cmd._parse_final_record(summary_connection)
+    assert iperf_cmd._multiport_summaries == {}
 
 
 def test_iperf_server_can_calculate_multiport_summary_record_of_interval(buffer_connection):
@@ -290,10 +336,9 @@ def test_iperf_server_can_calculate_multiport_summary_record_of_interval(buffer_
     second_record['Jitter'] = '0.98 ms'
     third_record = dict(first_record)
     third_record['Jitter'] = '1.48 ms'
-    iperf_cmd.current_ret['CONNECTIONS'][parallel_client_1] = [first_record]
-    iperf_cmd.current_ret['CONNECTIONS'][parallel_client_2] = [second_record]
-    iperf_cmd.current_ret['CONNECTIONS'][parallel_client_3] = [third_record]
-    iperf_cmd._calculate_multiport_summary_record_of_interval(parallel_client_3)
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_1, first_record)
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_2, second_record)
+    iperf_cmd._add_to_multiport_summary_record_of_interval(parallel_client_3, third_record)
     summary_connection = ('multiport@192.168.44.1', '5016@192.168.44.130')
     assert summary_connection in iperf_cmd.current_ret['CONNECTIONS']
     assert iperf_cmd.current_ret['CONNECTIONS'][summary_connection] == [{
@@ -308,6 +353,46 @@ def test_iperf_server_can_calculate_multiport_summary_record_of_interval(buffer_
     }]
 
 
+def test_iperf_stores_records_in_columns_when_requested(buffer_connection):
+    from moler.cmd.unix import iperf2
+    for variant in ['basic_server', 'multiple_connections_udp_server', 'multiple_connections_udp_client',
+                    'bidirectional_udp_server', 'tcp_ipv6_client']:
+        buffer_connection.remote_inject_response([getattr(iperf2, 'COMMAND_OUTPUT_{}'.format(variant))])
+        iperf_cmd = iperf2.Iperf2(connection=buffer_connection.moler_connection, columnar=True,
+                                  **getattr(iperf2, 'COMMAND_KWARGS_{}'.format(variant)))
+        ret = iperf_cmd()
+        records = [rec for rec in ret['CONNECTIONS'].values() if not isinstance(rec, dict)]
+        assert all(isinstance(rec, iperf2.Iperf2Records) for rec in records)
+        assert ret == getattr(iperf2, 'COMMAND_RESULT_{}'.format(variant))
+
+
+def test_iperf_records_build_record_dicts_on_request():
+    from moler.cmd.unix.iperf2 import Iperf2Records
+    tcp_record = {'Interval': (0.0, 1.0), 'Transfer': 1226833, 'Transfer Raw': '1.17 MBytes',
+                  'Bandwidth': 1230000, 'Bandwidth Raw': '9.84 Mbits/sec'}
+    udp_record = {'Interval': (1.0, 2.0), 'Transfer': 1237319, 'Transfer Raw': '1.18 MBytes',
+                  'Bandwidth': 1242500, 'Bandwidth Raw': '9.94 Mbits/sec', 'Jitter': '1.846 ms',
+                  'Lost_vs_Total_Datagrams': (5, 850), 'Lost_Datagrams_ratio': '0.59%', 'Extra': 'kept'}
+    records = Iperf2Records([tcp_record, udp_record])
+    assert len(records) == 2
+    assert records[0] == tcp_record
+    assert records[-1] == udp_record
+    assert records[:] == [tcp_record, udp_record]
+    assert records == [tcp_record, udp_record]
+
+
+def test_iperf_records_can_drop_oldest_records():
+    from moler.cmd.unix.iperf2 import Iperf2Records
+    all_records = [{'Interval': (float(sec), float(sec + 1)), 'Transfer': sec, 'Transfer Raw': '{} Bytes'.format(sec),
+                    'Bandwidth': sec, 'Bandwidth Raw': '{} bits/sec'.format(sec * 8)} for sec in range(5)]
+    records = Iperf2Records(all_records)
+    del records[:3]
+    assert records == all_records[3:]
+    records.append(all_records[0])
+    del records[1]
+    assert records == [all_records[3], all_records[0]]
+
+
 def test_iperf_correctly_parses_multiconnection_udp_server_output(buffer_connection):
     from moler.cmd.unix import iperf2
     buffer_connection.remote_inject_response([iperf2.COMMAND_OUTPUT_multiple_connections_udp_server])
@@ -77,6 +77,21 @@ def test_ls_throw_ResultNotAvailableYet(buffer_connection):
         ls_cmd.get_dirs()
 
 
+def test_ls_keeps_sizes_of_files_parsed_before_timeout(buffer_connection):
+    from moler.exceptions import CommandTimeout
+    output = """ls -lh
+-rwxr-xr-x 2 root  root  4.0K Nov 10  2016 file1
+-rwxr-xr-x 2 root  root  4.5M Nov 10  2016 file2
+"""
+    buffer_connection.remote_inject_response([output])
+    ls_cmd = Ls(connection=buffer_connection.moler_connection, options="-lh")
+    ls_cmd.terminating_timeout = 0
+    with pytest.raises(CommandTimeout):
+        ls_cmd(timeout=0.2)
+    assert ls_cmd.current_ret["files"]["file1"]["size_bytes"] == 4096
+    assert ls_cmd.current_ret["files"]["file2"]["size_bytes"] == 4718592
+
+
 @pytest.fixture
 def command_output_and_expected_result():
     data = """
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Netstat command test module.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+from moler.cmd.unix.netstat import Netstat
+
+
+def test_netstat_returns_proper_command_string(buffer_connection):
+    netstat_cmd = Netstat(connection=buffer_connection.moler_connection, options="-s")
+    assert "netstat -s" == netstat_cmd.command_string
+
+
+def test_netstat_finds_indented_header_of_active_sockets(buffer_connection):
+    output = """netstat
+  Active UNIX domain sockets (w/o servers)
+Proto RefCnt Flags       Type       State         I-Node   Path
+unix  2      [ ]         DGRAM                    15365    /var/cache/samba/msg/846
+host:~ # """
+    buffer_connection.remote_inject_response([output])
+    netstat_cmd = Netstat(connection=buffer_connection.moler_connection)
+    result = netstat_cmd()
+    assert [socket['path'] for socket in result['UNIX_SOCKETS']] == ['/var/cache/samba/msg/846']
+
+
+def test_netstat_groups_statistics_by_protocol(buffer_connection):
+    from moler.cmd.unix.netstat import COMMAND_OUTPUT_statistics, COMMAND_KWARGS_statistics
+    buffer_connection.remote_inject_response([COMMAND_OUTPUT_statistics])
+    netstat_cmd = Netstat(connection=buffer_connection.moler_connection, **COMMAND_KWARGS_statistics)
+    result = netstat_cmd()
+    assert result['STATISTICS']['UdpLite'] == []
+    assert result['STATISTICS']['IcmpMsg'][0] == 'InType3: 33'
@@ -37,3 +37,24 @@ def test_ps_command_aux(buffer_connection):
     assert ps_cmd.command_string == "ps -aux"
     result = ps_cmd()
     assert result == ps.COMMAND_RESULT_aux
+
+
+def test_ps_command_keeps_processes_parsed_before_timeout(buffer_connection):
+    import pytest
+    from moler.exceptions import CommandTimeout
+    output_without_prompt = ps.COMMAND_OUTPUT_aux[:ps.COMMAND_OUTPUT_aux.rindex("\n") + 1]
+    buffer_connection.remote_inject_response([output_without_prompt])
+    ps_cmd = ps.Ps(connection=buffer_connection.moler_connection, options='-aux')
+    ps_cmd.terminating_timeout = 0
+    with pytest.raises(CommandTimeout):
+        ps_cmd(timeout=0.2)
+    assert ps_cmd.current_ret == ps.COMMAND_RESULT_aux
+
+
+def test_ps_command_keeps_processes_parsed_before_cancel(buffer_connection):
+    ps_cmd = ps.Ps(connection=buffer_connection.moler_connection, options='-aux')
+    ps_cmd._cmd_output_started = True
+    for line in ps.COMMAND_OUTPUT_aux.splitlines()[1:-1]:
+        ps_cmd.on_new_line(line=line, is_full_line=True)
+    assert ps_cmd.cancel() is True
+    assert ps_cmd.current_ret == ps.COMMAND_RESULT_aux
@@ -13,3 +13,15 @@ from moler.cmd.unix.tcpdump import Tcpdump
 def test_tcpdump_returns_proper_command_string(buffer_connection):
     tcpdump_cmd = Tcpdump(buffer_connection, options="-c 4 -vv")
     assert "tcpdump -c 4 -vv" == tcpdump_cmd.command_string
+
+
+def test_tcpdump_in_streaming_mode_publishes_packets_with_their_numbers(buffer_connection):
+    from moler.cmd.unix.tcpdump import COMMAND_OUTPUT, COMMAND_KWARGS, COMMAND_RESULT
+    buffer_connection.remote_inject_response([COMMAND_OUTPUT])
+    tcpdump_cmd = Tcpdump(connection=buffer_connection.moler_connection, **COMMAND_KWARGS)
+    streamed_packets = list()
+    tcpdump_cmd.enable_streaming(callback=streamed_packets.append, keep_last=None)
+    tcpdump_cmd()
+    assert [number for (number, _) in streamed_packets] == ['1', '2', '3', '4']
+    for number, packet in streamed_packets:
+        assert packet == COMMAND_RESULT[number]
@@ -35,3 +35,22 @@ Usage:
 xyz@debian>"""
     result = dict()
     return output, result
+
+
+def test_top_splits_processes_list_by_whitespaces(buffer_connection):
+    output = """xyz@debian:~$ top -c n 1
+  PID USER      PR  NI    VIRT    RES    SHR S %CPU %MEM     TIME+ COMMAND
+ 2642 longusername  20   0 3322120 0.977g  18796 S  1.7 49.9 141:44.05 /usr/bin/java -Xmx1g -jar app.jar
+    1 root      20   0  138888   4500   3316 S  0.0  0.2   0:01.93 /sbin/init splash
+
+xyz@debian:~$"""
+    buffer_connection.remote_inject_response([output])
+    top_cmd = Top(connection=buffer_connection.moler_connection, options='-c')
+    result = top_cmd()
+    assert result['processes'] == [
+        {'PID': 2642, 'USER': 'longusername', 'PR': 20, 'NI': 0, 'VIRT': 3322120, 'RES': '0.977g', 'SHR': 18796,
+         'S': 'S', '%CPU': 1.7, '%MEM': 49.9, 'TIME+': '141:44.05', 'COMMAND': '/usr/bin/java'},
+        {'PID': 1, 'USER': 'root', 'PR': 20, 'NI': 0, 'VIRT': 138888, 'RES': 4500, 'SHR': 3316, 'S': 'S',
+         '%CPU': 0.0, '%MEM': 0.2, 'TIME+': '0:01.93', 'COMMAND': '/sbin/init'},
+        {},
+    ]
@@ -81,6 +81,27 @@ def test_device_unix_can_return_cd_command(configure_net_1_connection):
     )
 
 
+def test_device_unix_runs_batch_of_commands(buffer_connection):
+    from moler.device.unixlocal import UnixLocal
+    from moler.exceptions import CommandFailure
+
+    ux = UnixLocal(io_connection=buffer_connection)
+    ux.establish_connection()
+    moler_conn = buffer_connection.moler_connection
+
+    def inject_batch_output(data, **kwargs):
+        pipeline_line = data.strip()
+        markers = [part.split()[1].replace("''", "") for part in pipeline_line.split("; ") if part.startswith("echo ")]
+        output = "\n".join([pipeline_line, markers[0], "ute", markers[1],
+                            "ls: cannot access /no/such: No such file or directory", markers[2], "moler_bash# "])
+        buffer_connection.remote_inject_line(output, add_newline=False)
+
+    moler_conn.send = inject_batch_output
+    results = ux.run_batch(['whoami', ('ls', {'options': '/no/such'})], timeout=2)
+    assert results[0] == {"USER": "ute"}
+    assert isinstance(results[1], CommandFailure)
+
+
 # --------------------------- resources ---------------------------
 
 
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import datetime
+import re
+import pytest
+from moler.events.unix.wait4prompts import Wait4prompts
+
+
+@pytest.mark.parametrize("prompts", [
+    {r'#': "STATE_HASH", r'host:~': "STATE_HOST", r'^user@\S+>': "STATE_USER"},
+    {r'#': "STATE_HASH", re.compile(r'host:~', re.I): "STATE_HOST", r'^user@\S+>': "STATE_USER"},  # no alternation
+])
+def test_event_wait4prompts_resolves_state_in_order_of_prompts(buffer_connection, prompts):
+    event = Wait4prompts(connection=buffer_connection.moler_connection, prompts=prompts)
+    lines_states = [
+        ("host:~ #", "STATE_HASH"),  # prompt found later in line but sorted first wins
+        ("host:~ >", "STATE_HOST"),
+        ("host:~ user@host01:~>", "STATE_HOST"),  # ^ anchored prompt not at start of line
+        ("user@host01:~>", "STATE_USER"),
+    ]
+    for line, state in lines_states:
+        event.data_received("{}\n".format(line), datetime.datetime.now())
+        occurrence = event.get_last_occurrence()
+        assert occurrence['state'] == state
+        assert occurrence['line'] == line
+    occurrences = len(event._occurred)
+    event.data_received("no prompt in this line\n", datetime.datetime.now())
+    assert len(event._occurred) == occurrences
+
+
+def test_event_wait4prompts_checks_all_prompts_with_one_regex(buffer_connection):
+    event = Wait4prompts(connection=buffer_connection.moler_connection,
+                         prompts={r'#': "STATE_HASH", r'host:~': "STATE_HOST"})
+    assert event._all_prompts_regex is not None
+    event.compiled_prompts_regex = event._compile_prompts_patterns({r'(a)\1': "STATE_A", r'b': "STATE_B"})
+    assert event._all_prompts_regex is None  # numbered backreference is broken by alternation
+    event.data_received("aa\n", datetime.datetime.now())
+    assert event.get_last_occurrence()['state'] == "STATE_A"
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Testing reactor serving many external-IO connections in single thread.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import socket
+import threading
+import time
+import pytest
+
+
+def test_reactor_calls_callback_only_of_readable_connection(reactor):
+    received = dict()
+    sockets = [socket.socketpair() for _ in range(5)]
+    for idx, (_, reader) in enumerate(sockets):
+        reactor.register(reader, _reading_callback(reader, idx, received))
+    assert reactor.registered_count() == 5
+
+    sockets[3][0].send(b'data for 3')
+    time.sleep(0.1)
+    assert received == {3: b'data for 3'}
+
+    for _, reader in sockets:
+        reactor.unregister(reader)
+    assert reactor.registered_count() == 0
+    sockets[1][0].send(b'data for 1')
+    time.sleep(0.1)
+    assert 1 not in received
+    _close_sockets(sockets)
+
+
+def test_reactor_doesnt_call_callback_after_unregister_returned(reactor):
+    writer, reader = socket.socketpair()
+    calls = list()
+    in_callback = threading.Event()
+
+    def slow_callback():
+        reader.recv(100)
+        in_callback.set()
+        time.sleep(0.2)
+        calls.append(time.time())
+
+    reactor.register(reader, slow_callback)
+    writer.send(b'x')
+    in_callback.wait(timeout=1)
+    reactor.unregister(reader)  # waits for callback to finish
+    unregistered_time = time.time()
+    writer.send(b'y')
+    time.sleep(0.1)
+    assert len(calls) == 1
+    assert calls[0] <= unregistered_time
+    _close_sockets([(writer, reader)])
+
+
+def test_connection_unregisters_from_reactor_when_remote_end_closed(reactor):
+    from moler.io.raw.tcp import ReactorTcp
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('localhost', 0))
+    server.listen(1)
+    received = list()
+
+    def on_data(data, recv_time):
+        received.append(data)
+
+    def on_closed():
+        pass
+
+    moler_conn = ThreadedMolerConnection()
+    moler_conn.subscribe(observer=on_data, connection_closed_handler=on_closed)
+    connection = ReactorTcp(moler_connection=moler_conn, port=server.getsockname()[1], reactor=reactor)
+    with connection.open():
+        client, _ = server.accept()
+        client.send(b'hello')
+        time.sleep(0.1)
+        assert reactor.registered_count() == 1
+        client.close()
+        time.sleep(0.1)
+        assert reactor.registered_count() == 0
+    server.close()
+    moler_conn.shutdown()
+    assert received == [b'hello']
+
+
+def _reading_callback(reader, idx, received):
+    def callback():
+        received[idx] = reader.recv(100)
+    return callback
+
+
+def _close_sockets(sockets):
+    for writer, reader in sockets:
+        writer.close()
+        reader.close()
+
+
+@pytest.yield_fixture()
+def reactor():
+    from moler.io.raw.reactor import SelectorReactor
+    reactor = SelectorReactor()
+    reactor.start()
+    yield reactor
+    reactor.stop()
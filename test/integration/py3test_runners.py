@@ -685,9 +685,9 @@ def is_python36_or_above():
 
 # bg_runners may be called from both 'async def' and raw 'def' functions
 available_bg_runners = []  # 'runner.ThreadPoolExecutorRunner']
-available_bg_runners = ['runner.ThreadPoolExecutorRunner']
+available_bg_runners = ['runner.ThreadPoolExecutorRunner', 'event_driven_runner.EventDrivenRunner']
 # standalone_runners may run without giving up control to some event loop (since they create own thread(s))
-available_standalone_runners = ['runner.ThreadPoolExecutorRunner']
+available_standalone_runners = ['runner.ThreadPoolExecutorRunner', 'event_driven_runner.EventDrivenRunner']
 # async_runners may be called only from 'async def' functions and require already running events-loop
 available_async_runners = []
 if is_python36_or_above():
@@ -11,7 +11,9 @@ __copyright__ = 'Copyright (C) 2020, Nokia'
 __email__ = 'grzegorz.latuszek@nokia.com'
 
 
+import sys
 import time
+import socket
 import importlib
 import pytest
 import mock
@@ -599,6 +601,7 @@ def test_active_connection_with_unexpected_exception_inside_pull_thread_should_a
     with connection.open():
         time.sleep(0.1)
         with mock.patch("moler.io.raw.sshshell.SshShell._recv", exc_raiser):
+            connection.moler_connection.send(data="\n")  # ReactorSshShell reads only when data arrives
             time.sleep(0.5)
 
     assert connection._shell_channel is None
@@ -616,6 +619,7 @@ def test_active_connection_with_unexpected_exception_inside_pull_thread_should_a
         time.sleep(0.1)
         with mock.patch.object(logger, "handle", log_handler):
             with mock.patch("moler.io.raw.sshshell.SshShell._recv", exc_raiser):
+                connection.moler_connection.send(data="\n")
                 time.sleep(0.5)
     assert logging_records
     print(logging_records[0])
@@ -744,6 +748,150 @@ def test_changing_connection_name_switches_logger_if_default_logger_used(active_
     assert connection.sshshell.logger.name == "moler.connection.DEF.io"
 
 
+def test_send_doesnt_resend_data_when_channel_window_is_full(passive_sshshell_connection_class):
+    connection = passive_sshshell_connection_class(host='localhost', port=22,
+                                                   username='molerssh', password='moler_password')
+    connection.await_ready_tick_resolution = 0.001
+    channel = mock.Mock()
+    channel.send_ready.side_effect = [True, False, False, True]
+    channel.send.side_effect = [4, 6]  # first chunk partially sent, rest after window opens
+    connection._shell_channel = channel
+
+    connection.send(b"0123456789", timeout=0.5)
+
+    assert channel.send.call_args_list == [mock.call(b"0123456789"), mock.call(b"456789")]
+
+
+def test_active_connection_can_send_data_via_write_queue(active_sshshell_connection_class):
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+    moler_conn = ThreadedMolerConnection()
+    connection = active_sshshell_connection_class(moler_connection=moler_conn, host='localhost',
+                                                  queued_send=True)
+    sent_data = []
+    channel_window_opened = threading.Event()
+
+    def send_when_window_opened(data):
+        channel_window_opened.wait()
+        sent_data.append(data)
+        return len(data)
+
+    channel = mock.Mock()
+    channel.send_ready.return_value = True
+    channel.send.side_effect = send_when_window_opened
+    connection.sshshell._shell_channel = channel
+
+    connection.send(b"first line\n", timeout=1)  # returns without waiting for channel
+    second_sending = connection.send_async(b"second line\n", timeout=1)
+    assert not second_sending.done()
+    channel_window_opened.set()
+
+    assert second_sending.result(timeout=1) == 12
+    assert sent_data == [b"first line\n", b"second line\n"]
+    connection._stop_writer()
+
+
+def test_active_connection_queued_send_passes_errors_via_future(active_sshshell_connection_class):
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+    from moler.io.io_exceptions import RemoteEndpointNotConnected
+    connection = active_sshshell_connection_class(moler_connection=ThreadedMolerConnection(), host='localhost',
+                                                  logger_name=None)
+
+    sending = connection.send_async(b"data", timeout=1)  # channel not opened
+
+    with pytest.raises(RemoteEndpointNotConnected):
+        sending.result(timeout=1)
+    connection._stop_writer()
+
+
+def test_active_connection_closes_on_failed_queued_send(active_sshshell_connection_class):
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+    connection = active_sshshell_connection_class(moler_connection=ThreadedMolerConnection(), host='localhost',
+                                                  queued_send=True)
+    connection_lost = threading.Event()
+    connection.subscribe_on_connection_lost(subscriber=lambda conn: connection_lost.set())
+    channel = mock.Mock()
+    channel.send_ready.return_value = True
+    channel.send.side_effect = socket.error("Connection reset by peer")
+    connection.sshshell._shell_channel = channel
+    logged_records = []
+
+    def log_record_receiver(logger, log_record):
+        logged_records.append(log_record)
+
+    with mock.patch.object(connection.logger.__class__, "handle", new=log_record_receiver):
+        connection.send(b"data", timeout=1)
+        assert connection_lost.wait(timeout=1)
+
+    assert connection._shell_channel is None
+    errors = [record.msg for record in logged_records if record.levelname == "ERROR"]
+    assert errors[0].startswith("Can't send b'data'")
+
+
+def test_transport_pool_logins_once_per_host_port_and_username(mocked_ssh_client_class):
+    from moler.io.raw.sshshell import SshTransportPool
+    pool = SshTransportPool(max_channels_per_transport=2)
+
+    client1 = pool.acquire(host='localhost', port=22, username='molerssh', password='moler_password')
+    client2 = pool.acquire(host='localhost', port=22, username='molerssh', password='moler_password')
+    client3 = pool.acquire(host='localhost', port=22, username='molerssh', password='moler_password')
+    other_user_client = pool.acquire(host='localhost', port=22, username='other', password='other_password')
+
+    assert client1 is client2  # channels on same transport
+    assert client3 is not client1  # max channels per transport reached
+    assert other_user_client not in [client1, client3]
+    assert pool.transports_count(host='localhost', port=22, username='molerssh') == 2
+    client1.connect.assert_called_once_with('localhost', port=22, username='molerssh', password='moler_password')
+    pool.close_all()
+
+
+def test_transport_pool_closes_transport_after_idle_timeout(mocked_ssh_client_class):
+    from moler.io.raw.sshshell import SshTransportPool
+    pool = SshTransportPool(idle_timeout=0.2)
+
+    client = pool.acquire(host='localhost', port=22, username='molerssh', password='moler_password')
+    pool.release(client)
+    assert pool.acquire(host='localhost', port=22, username='molerssh', password='moler_password') is client
+    pool.release(client)
+    time.sleep(0.4)
+
+    assert client.close.called
+    assert pool.transports_count() == 0
+
+
+def test_transport_pool_drops_broken_transport(mocked_ssh_client_class):
+    from moler.io.raw.sshshell import SshTransportPool
+    pool = SshTransportPool()
+
+    client = pool.acquire(host='localhost', port=22, username='molerssh', password='moler_password')
+    client.get_transport.return_value.is_active.return_value = False
+    new_client = pool.acquire(host='localhost', port=22, username='molerssh', password='moler_password')
+
+    assert new_client is not client
+    assert client.close.called
+    assert pool.transports_count() == 1
+    pool.close_all()
+
+
+def test_sshshell_takes_transport_from_pool_and_gives_it_back_on_close(passive_sshshell_connection_class,
+                                                                        mocked_ssh_client_class):
+    from moler.io.raw.sshshell import SshTransportPool
+    pool = SshTransportPool(idle_timeout=60)
+    connection1 = passive_sshshell_connection_class(host='localhost', port=22, username='molerssh',
+                                                    password='moler_password', transport_pool=pool)
+    connection2 = passive_sshshell_connection_class(host='localhost', port=22, username='molerssh',
+                                                    password='moler_password', transport_pool=pool)
+    connection1.open()
+    connection2.open()
+    assert connection1.ssh_client is connection2.ssh_client
+    assert connection1.ssh_client.connect.call_count == 1
+
+    connection1.close()
+    connection2.close()
+    assert not connection1.ssh_client.close.called  # idle transport is kept for next connections
+    assert pool.transports_count() == 1
+    pool.close_all()
+
+
 def test_connection_factory_has_sshshell_constructor_active_by_default():
     from moler.connection_factory import get_connection
 
@@ -810,13 +958,18 @@ def passive_sshshell_connection_class(request):
 # Connection like ThreadedSshShell is active connections - pushes data by itself (same model as asyncio, Twisted, etc)
 # uses data_received() API which delivers data to embedded moler_connection
 ######################################################################################################################
-@pytest.fixture(params=['io.raw.sshshell.ThreadedSshShell'])
+active_sshshell_connection_classes = ['io.raw.sshshell.ThreadedSshShell']
+if sys.version_info >= (3,):
+    active_sshshell_connection_classes.append('io.raw.sshshell.ReactorSshShell')  # reactor uses python3 selectors
+
+
+@pytest.fixture(params=active_sshshell_connection_classes)
 def active_sshshell_connection_class(request):
     connection_class = import_class('moler.' + request.param)
     return connection_class
 
 
-@pytest.fixture(params=['io.raw.sshshell.SshShell', 'io.raw.sshshell.ThreadedSshShell'])
+@pytest.fixture(params=['io.raw.sshshell.SshShell'] + active_sshshell_connection_classes)
 def sshshell_connection(request):
     from moler.threaded_moler_connection import ThreadedMolerConnection
     connection_class = import_class('moler.' + request.param)
@@ -824,7 +977,7 @@ def sshshell_connection(request):
     # SshShell and ThreadedSshShell differ in API - ThreadedSshShell gets moler_connection
     # Why - see comment in sshshell.py
     ######################################################################################
-    if "Threaded" in request.param:
+    if "Threaded" in request.param or "Reactor" in request.param:
         moler_conn = ThreadedMolerConnection(decoder=lambda data: data.decode("utf-8"),
                                              encoder=lambda data: data.encode("utf-8"))
         connection = connection_class(moler_connection=moler_conn,
@@ -845,6 +998,19 @@ def active_sshshell_connection(active_sshshell_connection_class):
     return connection
 
 
+@pytest.fixture
+def mocked_ssh_client_class():
+    def create_client():
+        client = mock.Mock()
+        client.get_transport.return_value.is_active.return_value = True
+        client.get_transport.return_value.is_authenticated.return_value = True
+        client.invoke_shell.return_value.get_transport.return_value = client.get_transport.return_value
+        return client
+
+    with mock.patch("paramiko.SSHClient", side_effect=create_client) as ssh_client_class:
+        yield ssh_client_class
+
+
 @pytest.fixture
 def mocked_logger():
     import logging
@@ -8,6 +8,7 @@ __copyright__ = 'Copyright (C) 2018-2019, Nokia'
 __email__ = 'marcin.usielski@nokia.com, michal.ernst@nokia.com'
 
 import getpass
+import sys
 
 import pytest
 
@@ -17,6 +18,11 @@ from moler.cmd.unix.whoami import Whoami
 from moler.cmd.unix.lsof import Lsof
 from moler.exceptions import CommandTimeout
 from moler.io.raw.terminal import ThreadedTerminal
+from moler.io.raw.terminal import ReactorTerminal
+
+terminal_classes = [ThreadedTerminal]
+if sys.version_info >= (3,):
+    terminal_classes.append(ReactorTerminal)  # reactor uses python3 selectors module
 
 
 def test_terminal_cmd_whoami_during_ping(terminal_connection):
@@ -83,12 +89,12 @@ def test_terminal_lsof(terminal_connection):
     assert ret["NUMBER"] > 1
 
 
-@pytest.yield_fixture()
-def terminal_connection():
+@pytest.yield_fixture(params=terminal_classes)
+def terminal_connection(request):
     from moler.threaded_moler_connection import ThreadedMolerConnection
 
     moler_conn = ThreadedMolerConnection()
-    terminal = ThreadedTerminal(moler_connection=moler_conn)
+    terminal = request.param(moler_connection=moler_conn)
 
     with terminal.open() as connection:
         yield connection.moler_connection
@@ -11,6 +11,7 @@ __copyright__ = 'Copyright (C) 2018-2019, Nokia'
 __email__ = 'grzegorz.latuszek@nokia.com, marcin.usielski@nokia.com'
 
 
+import sys
 import time
 import importlib
 import pytest
@@ -118,7 +119,12 @@ def _wait_for_last_message(tcp_server_pipe, last_message="Client disconnected",
     return dialog_with_server
 
 
-@pytest.fixture(params=['io.raw.tcp.ThreadedTcp'])
+tcp_connection_classes = ['io.raw.tcp.ThreadedTcp']
+if sys.version_info >= (3,):
+    tcp_connection_classes.append('io.raw.tcp.ReactorTcp')  # reactor uses python3 selectors module
+
+
+@pytest.fixture(params=tcp_connection_classes)
 def tcp_connection_class(request):
     module_name, class_name = request.param.rsplit('.', 1)
     module = importlib.import_module('moler.{}'.format(module_name))
@@ -72,6 +72,23 @@ def test_timeout_before_command_sent(buffer_connection, command_output_and_expec
     assert ping_ret == expected_result
 
 
+def test_queued_commands_do_not_occupy_threads(buffer_connection):
+    import threading
+    from moler.cmd.unix.uptime import Uptime
+    commands = [Uptime(connection=buffer_connection.moler_connection, prompt="host:.*#") for _ in range(21)]
+    commands[0].start(timeout=2)
+    time.sleep(0.05)
+    threads_before = threading.active_count()
+    for cmd in commands[1:]:
+        cmd.start(timeout=2)
+    assert all(CommandScheduler.is_waiting_for_execution(connection_observer=cmd) for cmd in commands[1:])
+    assert threading.active_count() - threads_before < 5
+    commands[0].cancel()  # slot is handed over to next command at once
+    assert CommandScheduler.is_waiting_for_execution(connection_observer=commands[1]) is False
+    assert CommandScheduler.is_waiting_for_execution(connection_observer=commands[2]) is True
+    EventAwaiter.cancel_all_events(commands)
+
+
 @pytest.fixture
 def command_output_and_expected_result_ping():
     data = (
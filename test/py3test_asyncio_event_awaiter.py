@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import asyncio
+import datetime
+import time
+
+from moler.events.unix.wait4prompt import Wait4prompt
+from moler.asyncio_event_awaiter import AsyncioEventAwaiter
+from moler.event_awaiter import EventAwaiter
+from moler.threaded_moler_connection import ThreadedMolerConnection
+
+
+def _started_events(connection, patterns):
+    events = list()
+    for pattern in patterns:
+        event = Wait4prompt(connection=connection, till_occurs_times=1, prompt=pattern)
+        event.start()
+        events.append(event)
+    return events
+
+
+def test_asyncio_events_all_wakes_up_on_last_done_event():
+    connection = ThreadedMolerConnection()
+    events = _started_events(connection, ("aaa", "bbb"))
+
+    async def feed_and_wait():
+        loop = asyncio.get_event_loop()
+        loop.call_later(0.1, connection.data_received, "aaa bbb", datetime.datetime.now())
+        return await AsyncioEventAwaiter.wait_for_all(timeout=10, events=events)
+
+    start_time = time.time()
+    assert asyncio.get_event_loop().run_until_complete(feed_and_wait()) is True
+    assert time.time() - start_time < 5
+    EventAwaiter.cancel_all_events(events)
+
+
+def test_asyncio_events_any_timeout():
+    connection = ThreadedMolerConnection()
+    events = _started_events(connection, ("aaa", "bbb"))
+    assert asyncio.get_event_loop().run_until_complete(
+        AsyncioEventAwaiter.wait_for_any(timeout=0.1, events=events)) is False
+    EventAwaiter.cancel_all_events(events)
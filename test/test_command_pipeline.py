@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Testing of pipelined execution of commands.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import pytest
+
+
+def _pipeline_output(pipeline, outputs):
+    lines = ["host:~ # {}".format(pipeline.command_string), pipeline._markers[0]]
+    for output, marker in zip(outputs, pipeline._markers[1:]):
+        lines.extend(output)
+        lines.append(marker)
+    lines.append("host:~ # ")
+    return "\n".join(lines)
+
+
+def test_pipeline_passes_output_of_every_command_to_its_parser(buffer_connection):
+    from moler.command_pipeline import CommandPipeline
+    from moler.cmd.unix.whoami import Whoami
+    from moler.cmd.unix.hostname import Hostname
+    from moler.cmd.unix.ls import Ls
+    from moler.exceptions import CommandFailure
+    connection = buffer_connection.moler_connection
+    whoami = Whoami(connection=connection)
+    hostname = Hostname(connection=connection)
+    ls = Ls(connection=connection, options="/no/such")
+    pipeline = CommandPipeline(connection=connection, commands=[whoami, hostname, ls])
+    assert "MOLER''_PIPELINE" in pipeline.command_string
+    buffer_connection.remote_inject_response([_pipeline_output(pipeline, [
+        ["ute"],
+        ["cp009-nj"],
+        ["ls: cannot access /no/such: No such file or directory"],
+    ])])
+    results = pipeline(timeout=2)
+    assert results[0] == {"USER": "ute"}
+    assert results[1] == {"hostname": "cp009-nj"}
+    assert isinstance(results[2], CommandFailure)
+    assert whoami.result() == {"USER": "ute"}
+    with pytest.raises(CommandFailure):
+        ls.result()
+
+
+def test_pipeline_command_without_output_fails_like_in_serial_mode(buffer_connection):
+    from moler.command_pipeline import CommandPipeline
+    from moler.cmd.unix.whoami import Whoami
+    from moler.cmd.unix.hostname import Hostname
+    from moler.exceptions import CommandTimeout
+    connection = buffer_connection.moler_connection
+    whoami = Whoami(connection=connection)
+    hostname = Hostname(connection=connection)
+    pipeline = CommandPipeline(connection=connection, commands=[whoami, hostname])
+    buffer_connection.remote_inject_response([_pipeline_output(pipeline, [[], ["cp009-nj"]])])
+    results = pipeline(timeout=2)
+    assert isinstance(results[0], CommandTimeout)
+    assert results[1] == {"hostname": "cp009-nj"}
+
+
+def test_pipeline_accepts_only_not_started_unix_commands(buffer_connection):
+    from moler.command_pipeline import CommandPipeline
+    from moler.cmd.unix.whoami import Whoami
+    from moler.exceptions import WrongUsage
+    connection = buffer_connection.moler_connection
+    with pytest.raises(WrongUsage):
+        CommandPipeline(connection=connection, commands=[])
+    with pytest.raises(WrongUsage):
+        CommandPipeline(connection=connection, commands=[Whoami(connection=None)])
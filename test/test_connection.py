@@ -10,6 +10,7 @@ from moler.util.moler_test import MolerTest
 
 import pytest
 import datetime
+import time
 
 
 def do_nothing_func():
@@ -500,6 +501,161 @@ def test_garbage_collected_subscriber_is_not_notified():
     MolerTest.sleep(1, True)  # Processing in separate thread so have to wait.
     assert len(received_data) == 1
 
+
+def test_pool_dispatch_notifies_each_observer_in_order_of_data():
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+    from moler.observer_dispatcher import ObserverDispatcher
+    import mock
+
+    class TheObserver(object):
+        def __init__(self):
+            self.received_data = []
+
+        def on_new_data(self, data, time_recv):
+            self.received_data.append(data)
+
+    observers = [TheObserver() for _ in range(10)]
+    moler_conn = ThreadedMolerConnection(observers_dispatch='pool')
+    dispatcher = ObserverDispatcher(workers=3)
+    with mock.patch.object(moler_conn, "_get_dispatcher", return_value=dispatcher):
+        for observer in observers:
+            moler_conn.subscribe(observer=observer.on_new_data, connection_closed_handler=do_nothing_func)
+    for cnt in range(100):
+        moler_conn.data_received("data {}".format(cnt), datetime.datetime.now())
+    MolerTest.sleep(1, True)  # Processing in separate thread so have to wait.
+    dispatcher.request_stop()
+
+    expected_data = ["data {}".format(cnt) for cnt in range(100)]
+    for observer in observers:
+        assert observer.received_data == expected_data
+    assert dispatcher.dispatched_chunks == 1000
+
+
+def test_pool_dispatch_isolates_exception_in_observer():
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+    from moler.observer_dispatcher import ObserverDispatcher
+    import mock
+
+    received_data = []
+
+    def failing_observer(data, time_recv):
+        raise Exception("Fail inside observer")
+
+    def observer(data, time_recv):
+        received_data.append(data)
+
+    moler_conn = ThreadedMolerConnection(observers_dispatch='pool')
+    dispatcher = ObserverDispatcher(workers=1)
+    with mock.patch.object(moler_conn, "_get_dispatcher", return_value=dispatcher):
+        moler_conn.subscribe(observer=failing_observer, connection_closed_handler=do_nothing_func)
+        moler_conn.subscribe(observer=observer, connection_closed_handler=do_nothing_func)
+    moler_conn.data_received("data 1", datetime.datetime.now())
+    moler_conn.data_received("data 2", datetime.datetime.now())
+    MolerTest.sleep(1, True)  # Processing in separate thread so have to wait.
+    dispatcher.request_stop()
+
+    assert received_data == ["data 1", "data 2"]
+    assert dispatcher.workers_count == 1
+
+
+def test_pool_dispatch_doesnt_create_thread_per_observer():
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+    import moler.config.connections as conn_cfg
+    import threading
+    import mock
+
+    class TheObserver(object):
+        def on_new_data(self, data, time_recv):
+            pass
+
+    observers = [TheObserver() for _ in range(20)]
+    with mock.patch.object(conn_cfg, "observers_dispatch", {'mode': 'pool', 'workers': 2, 'scope': 'connection'}):
+        moler_conn = ThreadedMolerConnection()
+        for observer in observers:
+            moler_conn.subscribe(observer=observer.on_new_data, connection_closed_handler=do_nothing_func)
+        dispatcher_name = "ObserverDispatcher-{}".format(moler_conn.name)
+        dispatcher_threads = [thread for thread in threading.enumerate() if thread.name.startswith(dispatcher_name)]
+        moler_conn.shutdown()
+    assert len(moler_conn._observer_wrappers) == 20
+    assert len(dispatcher_threads) == 2
+
+
+def test_notifying_observer_doesnt_build_trace_message_when_trace_is_off():
+    from moler.observer_thread_wrapper import ObserverWrapper
+    import mock
+
+    received_data = []
+
+    def on_new_data(data, time_recv):
+        received_data.append(data)
+
+    logger = mock.Mock()
+    logger.isEnabledFor.return_value = False
+    wrapper = ObserverWrapper(observer=on_new_data, observer_self=None, logger=logger)
+    wrapper._notify_observer("data 1", datetime.datetime.now())
+    assert received_data == ["data 1"]
+    assert logger.log.call_count == 0
+    logger.isEnabledFor.return_value = True
+    wrapper._notify_observer("data 2", datetime.datetime.now())
+    assert received_data == ["data 1", "data 2"]
+    assert logger.log.call_count == 1
+
+
+def test_data_path_logging_metadata_is_not_created_per_chunk():
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+    import mock
+
+    moler_conn = ThreadedMolerConnection()
+    with mock.patch.object(moler_conn, "_log_data") as log_data:
+        moler_conn.data_received("data 1", datetime.datetime.now())
+        moler_conn.data_received("data 2", datetime.datetime.now())
+    all_extras = [call_kwargs['extra'] for (_, call_kwargs) in log_data.call_args_list]
+    assert len(all_extras) == 4
+    assert all(extra is all_extras[0] for extra in all_extras)
+    assert all_extras[0]['transfer_direction'] == '<'
+
+
+def test_coalescing_passes_first_data_after_idle_without_delay():
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+
+    moler_conn = ThreadedMolerConnection(coalesce_window=0.5)
+    dispatched = list()
+    moler_conn.notify_observers = lambda data, recv_time: dispatched.append(data)
+    moler_conn.data_received("prompt$ ", datetime.datetime.now())
+    assert dispatched == ["prompt$ "]
+
+
+def test_coalescing_merges_reads_arriving_within_window():
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+
+    moler_conn = ThreadedMolerConnection(coalesce_window=0.05)
+    dispatched = list()
+    moler_conn.notify_observers = lambda data, recv_time: dispatched.append(data)
+    for chunk in ["f", "ir", "st\n", "sec", "ond\n"]:
+        moler_conn.data_received(chunk, datetime.datetime.now())
+    assert dispatched == ["f"]
+    time.sleep(0.2)
+    assert dispatched == ["f", "irst\nsecond\n"]
+
+
+def test_coalescing_dispatches_collected_data_on_max_bytes_and_shutdown():
+    from moler.config import connections as conn_cfg
+    from moler.threaded_moler_connection import ThreadedMolerConnection
+
+    conn_cfg.set_data_coalescing(window=10, max_bytes=4)
+    try:
+        moler_conn = ThreadedMolerConnection()
+    finally:
+        conn_cfg.clear()
+    dispatched = list()
+    moler_conn.notify_observers = lambda data, recv_time: dispatched.append(data)
+    for chunk in [b"a", b"bc", b"de", b"f"]:
+        moler_conn.data_received(chunk, datetime.datetime.now())
+    assert dispatched == [b"a", b"bcde"]
+    moler_conn.shutdown()
+    assert dispatched == [b"a", b"bcde", b"f"]
+
+
 # --------------------------- resources ---------------------------
 
 
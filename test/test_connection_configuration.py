@@ -157,6 +157,37 @@ def test_can_select_connection_loaded_from_dict_as_positional_args(moler_config,
     assert conn.port == 2344
 
 
+def test_can_select_observers_dispatch_loaded_from_config(moler_config):
+    import moler.config.connections as conn_cfg
+
+    moler_config.load_config(config={'OBSERVERS_DISPATCH': {'MODE': 'pool', 'WORKERS': 2, 'SCOPE': 'connection'}})
+
+    assert conn_cfg.observers_dispatch == {'mode': 'pool', 'workers': 2, 'scope': 'connection'}
+
+
+def test_cannot_select_unknown_observers_dispatch_mode(connections_config):
+    from moler.exceptions import MolerException
+
+    with pytest.raises(MolerException) as err:
+        connections_config.set_observers_dispatch(mode='process_per_observer')
+    assert "Unknown observers dispatch mode 'process_per_observer'" in str(err.value)
+
+
+def test_sshshell_connections_share_transport_pool_loaded_from_config(moler_config):
+    from moler.connection_factory import get_connection
+    from moler.io.raw.sshshell import get_ssh_transport_pool
+
+    moler_config.load_config(config={'SSH_TRANSPORT_POOL': {'MAX_CHANNELS': 5, 'IDLE_TIMEOUT': 30}})
+
+    conn1 = get_connection(io_type='sshshell', variant='threaded', host='localhost', username='moler')
+    conn2 = get_connection(io_type='sshshell', variant='threaded', host='localhost', username='moler')
+    pool = get_ssh_transport_pool()
+    assert conn1.sshshell.transport_pool is pool
+    assert conn2.sshshell.transport_pool is pool
+    assert pool.max_channels_per_transport == 5
+    assert pool.idle_timeout == 30.0
+
+
 def test_load_config_checks_env_variable_existence(moler_config):
     with pytest.raises(KeyError) as err:
         moler_config.load_config(from_env_var="MOLER_CONFIG", config_type='yaml')
@@ -178,8 +209,10 @@ def moler_config():
 
     with mock.patch.object(conn_cfg, "default_variant", empty_default_variant):
         with mock.patch.object(conn_cfg, "named_connections", empty_named_connections):
-            with mock.patch.object(moler_cfg, "loaded_config", empty_loaded_config):
-                yield moler_cfg
+            with mock.patch.object(conn_cfg, "observers_dispatch", dict(conn_cfg.observers_dispatch)):
+                with mock.patch.object(conn_cfg, "ssh_transport_pool", dict(conn_cfg.ssh_transport_pool)):
+                    with mock.patch.object(moler_cfg, "loaded_config", empty_loaded_config):
+                        yield moler_cfg
 
 
 @pytest.yield_fixture
@@ -189,7 +222,8 @@ def connections_config():
 
     with mock.patch.object(conn_cfg, "default_variant", {}):
         with mock.patch.object(conn_cfg, "named_connections", {}):
-            yield conn_cfg
+            with mock.patch.object(conn_cfg, "observers_dispatch", dict(conn_cfg.observers_dispatch)):
+                yield conn_cfg
 
 
 @pytest.yield_fixture
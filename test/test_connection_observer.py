@@ -485,6 +485,36 @@ def test_connection_observer_exception_do_not_remove():
     assert 0 == len(none_exceptions)
 
 
+def test_done_callback_is_called_when_connection_observer_becomes_done(
+        do_nothing_connection_observer__for_major_base_class):
+    connection_observer = do_nothing_connection_observer__for_major_base_class
+    called_for = []
+    connection_observer.add_done_callback(called_for.append)
+    assert called_for == []
+    connection_observer.set_result(result=1)
+    assert called_for == [connection_observer]
+    connection_observer.set_end_of_life()
+    assert called_for == [connection_observer]  # called only once
+
+
+def test_done_callback_is_called_immediately_for_done_connection_observer(
+        do_nothing_connection_observer__for_major_base_class):
+    connection_observer = do_nothing_connection_observer__for_major_base_class
+    called_for = []
+    connection_observer.cancel()
+    connection_observer.add_done_callback(called_for.append)
+    assert called_for == [connection_observer]
+
+
+def test_removed_done_callback_is_not_called(do_nothing_connection_observer__for_major_base_class):
+    connection_observer = do_nothing_connection_observer__for_major_base_class
+    called_for = []
+    connection_observer.add_done_callback(called_for.append)
+    assert connection_observer.remove_done_callback(called_for.append) is True
+    connection_observer.set_exception(Exception("failed"))
+    assert called_for == []
+
+
 # --------------------------- resources ---------------------------
 
 
@@ -174,6 +174,26 @@ def test_event_unicode_error(buffer_connection):
     assert occurrence == dict_output
 
 
+def test_lineevent_any_reports_first_matching_pattern():
+    event = LineEvent(connection=None, detect_patterns=[r'Last login: (?P<day>\w+)', r'login', r'(\d+) error'])
+    event.data_received("no match here\nLast login: Thu Nov 23\n3 errors\n", datetime.datetime.now())
+    occurrences = event._occurred
+    assert len(occurrences) == 2
+    assert occurrences[0]['matched'] == "Last login: Thu"
+    assert occurrences[0]['named_groups'] == {'day': 'Thu'}
+    assert occurrences[1]['matched'] == "3 error"
+    assert occurrences[1]['groups'] == (3,)
+
+
+def test_lineevent_all_catches_each_pattern_once_in_cycle():
+    event = LineEvent(connection=None, detect_patterns=[r'first', r'second'], match='all')
+    event.data_received("second\nsecond\nfirst second\n", datetime.datetime.now())
+    occurrences = event._occurred
+    assert len(occurrences) == 1
+    assert [ret['line'] for ret in occurrences[0]] == ["second", "first second"]
+    assert [ret['matched'] for ret in occurrences[0]] == ["second", "first"]
+
+
 def test_get_not_supported_parser():
     le = LineEvent(connection=None, detect_patterns=['Sample pattern'], match='not_supported_value')
     le._get_parser()
@@ -87,3 +87,35 @@ def test_events_false_any():
     assert 0 == len(done)
     assert 2 == len(not_done)
     EventAwaiter.cancel_all_events(events)
+
+
+def test_events_all_wakes_up_on_last_done_event_without_waiting_for_timeout():
+    import threading
+    import time
+    connection = ThreadedMolerConnection()
+    events = list()
+    patterns = ("aaa", "bbb")
+    for pattern in patterns:
+        event = Wait4prompt(connection=connection, till_occurs_times=1, prompt=pattern)
+        event.start()
+        events.append(event)
+    connection.data_received(patterns[0], datetime.datetime.now())
+    feeder = threading.Timer(0.1, connection.data_received, args=(patterns[1], datetime.datetime.now()))
+    start_time = time.time()
+    feeder.start()
+    assert EventAwaiter.wait_for_all(timeout=10, events=events) is True
+    assert time.time() - start_time < 5
+    feeder.join()
+    EventAwaiter.cancel_all_events(events)
+
+
+def test_events_any_polls_objects_without_done_callbacks():
+    class DoneFlag(object):
+        def __init__(self, done):
+            self._done = done
+
+        def done(self):
+            return self._done
+
+    assert EventAwaiter.wait_for_any(timeout=0.1, events=[DoneFlag(False), DoneFlag(True)]) is True
+    assert EventAwaiter.wait_for_any(timeout=0.01, events=[DoneFlag(False)]) is False
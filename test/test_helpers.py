@@ -88,6 +88,65 @@ def test_converterhelper_seconds_wrong_unit():
         converter.to_seconds_str("3UU")
 
 
+def test_converterhelper_converts_list_of_bytes_as_single_values():
+    from moler.util.converterhelper import ConverterHelper
+    converter = ConverterHelper.get_converter_helper()
+    values = ["2.5K", ".3m", "12", "4.0K", "2.5K", "1 MBytes", "7 G"]
+    for binary_multipliers in (True, False):
+        expected = [converter.to_bytes(value, binary_multipliers)[0] for value in values]
+        assert converter.to_bytes_list(values, binary_multipliers) == expected
+
+
+def test_converterhelper_converts_long_list_of_bytes_with_numpy():
+    pytest.importorskip("numpy")
+    from moler.util.converterhelper import ConverterHelper
+    converter = ConverterHelper.get_converter_helper()
+    values = ["{}.5K".format(number) for number in range(100)] + ["1j"]
+    expected = [converter.to_bytes(value)[0] for value in values]
+    assert converter.to_bytes_list(values) == expected
+    assert converter.to_bytes_list(values[:-1]) == expected[:-1]
+
+
+def test_converterhelper_converts_long_list_of_bytes_without_numpy(monkeypatch):
+    import moler.util.converterhelper
+    from moler.util.converterhelper import ConverterHelper
+    converter = ConverterHelper.get_converter_helper()
+    values = ["{}.5K".format(number) for number in range(100)] + ["3", "1.5s"]
+    monkeypatch.setattr(moler.util.converterhelper, "numpy", None)
+    assert converter.to_bytes_list(values[:-1]) == [converter.to_bytes(value)[0] for value in values[:-1]]
+    assert converter.to_seconds_list(["3", "1.5s"] * 50) == [3.0, 1.5] * 50
+
+
+def test_converterhelper_list_of_bytes_wrong_unit():
+    from moler.util.converterhelper import ConverterHelper
+    converter = ConverterHelper.get_converter_helper()
+    with pytest.raises(ValueError):
+        converter.to_bytes_list(["3K", "3UU"], False)
+
+
+def test_converterhelper_converts_list_of_seconds_as_single_values():
+    from moler.util.converterhelper import ConverterHelper
+    converter = ConverterHelper.get_converter_helper()
+    values = ["3m", "2h", "0.5s", "17"]
+    assert converter.to_seconds_list(values) == [converter.to_seconds_str(value)[0] for value in values]
+    with pytest.raises(ValueError):
+        converter.to_seconds_list(["3UU"])
+
+
+def test_converterhelper_converts_list_of_numbers():
+    from moler.util.converterhelper import ConverterHelper
+    converter = ConverterHelper.get_converter_helper()
+    assert converter.to_numbers(["1", "0.1", "1"]) == [1, 0.1, 1]
+    assert converter.to_numbers(["1", "abc"], raise_exception=False) == [1, 0]
+    with pytest.raises(ValueError):
+        converter.to_numbers(["1", "abc"])
+
+
+def test_convert_to_numbers():
+    from moler.helpers import convert_to_numbers
+    assert convert_to_numbers(["12", "1.5", "", "abc", "12"]) == [12, 1.5, "", "abc", 12]
+
+
 def test_copy_list():
     from moler.helpers import copy_list
     src = [1]
@@ -187,6 +187,80 @@ def test_raw_logger_can_log_binary_raw_data(monkeypatch):
         os.remove(filename)
 
 
+def test_async_logging_writes_text_and_binary_raw_data_after_flush(monkeypatch):
+    import os
+    import moler.config.loggers as m_logger
+
+    binary_msg = b"1 0.000000000    127.0.0.1 \xe2\x86\x92 127.0.0.1    ICMP 98 Echo (ping) request"
+    monkeypatch.setattr(m_logger, 'raw_logs_active', True)
+    monkeypatch.setattr(m_logger, 'async_logging', {'active': True, 'queue_size': 10})
+    monkeypatch.setattr(m_logger, '_async_log_writer', None)
+    device_data_logger = m_logger.configure_device_logger(connection_name='Linux_xyz_async', propagate=False)
+    for handler in device_data_logger.handlers:
+        assert isinstance(handler, m_logger.AsyncLogHandler)
+    for cnt in range(30):  # more than queue size - log call waits for writer
+        device_data_logger.info("message %d", cnt)
+    device_data_logger.log(level=m_logger.RAW_DATA, msg=binary_msg, extra={'transfer_direction': '<'})
+    m_logger.flush_async_logging()
+    created_files = []
+    for hndl in device_data_logger.handlers:
+        created_files.append(hndl.baseFilename)
+        if isinstance(hndl.target, m_logger.RawFileHandler):
+            if not isinstance(hndl.formatter, m_logger.RawTraceFormatter):
+                with open(hndl.baseFilename, mode='rb') as logfh:
+                    assert logfh.read() == binary_msg
+        else:
+            with open(hndl.baseFilename) as logfh:
+                content = logfh.read()
+            assert "message 0" in content
+            assert "message 29" in content
+        hndl.close()
+    m_logger._async_log_writer.stop()
+    for filename in created_files:
+        os.remove(filename)
+
+
+def test_async_log_writer_writes_records_put_after_request_to_stop():
+    import logging
+    import moler.config.loggers as m_logger
+
+    class ListHandler(logging.Handler):
+        def __init__(self):
+            super(ListHandler, self).__init__()
+            self.messages = list()
+
+        def emit(self, record):
+            self.messages.append(record.msg)
+
+        def flush_written(self):
+            pass
+
+    def make_record(msg):
+        return logging.LogRecord("async", logging.INFO, __file__, 1, msg, None, None)
+
+    writer = m_logger.AsyncLogWriter(queue_size=100)
+    handler = ListHandler()
+    writer._queue.put((None, None))  # request to stop put just before record
+    writer.put(handler, make_record("before stop"))
+    writer.stop()
+    writer.put(handler, make_record("after stop"))
+    assert handler.messages == ["before stop", "after stop"]
+
+
+def test_async_log_handler_passes_formatter_to_target():
+    import logging
+    import moler.config.loggers as m_logger
+
+    target = logging.StreamHandler()
+    initial_formatter = logging.Formatter("%(message)s")
+    target.setFormatter(initial_formatter)
+    handler = m_logger.AsyncLogHandler(target=target, writer=None)
+    assert handler.formatter is initial_formatter
+    new_formatter = logging.Formatter("%(levelname)s %(message)s")
+    handler.setFormatter(new_formatter)
+    assert target.formatter is new_formatter
+
+
 def test_raw_logger_can_log_decoded_binary_raw_data(monkeypatch):
     import os
     import moler.config.loggers as m_logger
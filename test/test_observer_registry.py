@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Testing index of observers available in packages.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import os
+import sys
+import time
+
+import mock
+import pytest
+
+
+def test_registry_finds_observers_of_package(observers_package):
+    from moler import observer_registry
+    observers = observer_registry.get_observers_of_package(observers_package)
+    assert observers == {'my_cmd': '{}.my_module.MyCmd'.format(observers_package)}
+
+
+def test_registry_scans_package_only_once(observers_package):
+    from moler import observer_registry
+    with mock.patch.object(observer_registry, "_scan_module", wraps=observer_registry._scan_module) as scan:
+        first = observer_registry.get_observers_of_package(observers_package)
+        second = observer_registry.get_observers_of_package(observers_package)
+    assert first == second
+    assert scan.call_count == 1
+
+
+def test_registry_takes_observers_from_cache_file_of_not_changed_package(observers_package, cache_file):
+    from moler import observer_registry
+    observer_registry.set_cache_file(cache_file)
+    observers = observer_registry.get_observers_of_package(observers_package)
+    assert os.path.exists(cache_file)
+
+    observer_registry.clear()
+    with mock.patch.object(observer_registry, "_scan_module", side_effect=AssertionError("scanned")):
+        assert observer_registry.get_observers_of_package(observers_package) == observers
+
+
+def test_registry_scans_changed_package_again(observers_package, cache_file):
+    from moler import observer_registry
+    observer_registry.set_cache_file(cache_file)
+    observer_registry.get_observers_of_package(observers_package)
+
+    observer_registry.clear()
+    module_path = os.path.join(os.path.dirname(sys.modules[observers_package].__file__), "my_module.py")
+    modification_time = os.path.getmtime(module_path) + 10
+    os.utime(module_path, (modification_time, modification_time))
+    with mock.patch.object(observer_registry, "_scan_module", wraps=observer_registry._scan_module) as scan:
+        observer_registry.get_observers_of_package(observers_package)
+    assert scan.call_count == 1
+
+
+# --------------------------- resources ---------------------------
+
+@pytest.fixture
+def observers_package(tmpdir):
+    from moler import observer_registry
+    package_name = "registry_pkg_{}".format(int(time.time() * 1000000))
+    package_dir = tmpdir.mkdir(package_name)
+    package_dir.join("__init__.py").write("")
+    package_dir.join("my_module.py").write(
+        "from moler.command import Command\n\n\nclass MyCmd(Command):\n    pass\n\n\nclass Helper(object):\n    pass\n")
+    sys.path.insert(0, str(tmpdir))
+    observer_registry.clear()
+    yield package_name
+    observer_registry.set_cache_file(None)
+    observer_registry.clear()
+    sys.path.remove(str(tmpdir))
+
+
+@pytest.fixture
+def cache_file(tmpdir):
+    return str(tmpdir.join("observers.json"))
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Testing parsing of table rows by ColumnLayout learned from headers.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+
+def test_column_layout_cuts_rows_by_positions_of_headers():
+    from moler.parser.column_layout import ColumnLayout
+    layout = ColumnLayout.from_header("UID        PID  PPID  C STIME TTY          TIME CMD")
+
+    row = layout.parse("root      3598  3597  0 Mar09 ?        00:00:00 avahi-autoipd: [ens4] callout dispatcher")
+
+    assert row == {'UID': 'root', 'PID': 3598, 'PPID': 3597, 'C': 0, 'STIME': 'Mar09', 'TTY': '?',
+                   'TIME': '00:00:00', 'CMD': 'avahi-autoipd: [ens4] callout dispatcher'}
+
+
+def test_column_layout_handles_values_wider_than_headers():
+    from moler.parser.column_layout import ColumnLayout
+    layout = ColumnLayout.from_header("  PID USER      PR  NI    VIRT S  %CPU COMMAND")
+
+    row = layout.parse("23091 root      20   0   46668 R   6.2 top")
+
+    assert row == {'PID': 23091, 'USER': 'root', 'PR': 20, 'NI': 0, 'VIRT': 46668, 'S': 'R', '%CPU': 6.2,
+                   'COMMAND': 'top'}
+
+
+def test_column_layout_uses_converters_of_columns():
+    from moler.parser.column_layout import ColumnLayout
+    layout = ColumnLayout.from_header("NAME   SIZE", converters={'NAME': str, 'SIZE': lambda value: value + "B"})
+
+    assert layout.parse("007    12") == {'NAME': '007', 'SIZE': '12B'}
+
+
+def test_column_layout_converts_whole_columns_of_rows():
+    from moler.parser.column_layout import ColumnLayout
+    converted_sizes = list()
+
+    def size_converter(value):
+        converted_sizes.append(value)
+        return int(value[:-1]) * 1024
+
+    layout = ColumnLayout.from_header("NAME   SIZE  USER", converters={'SIZE': size_converter})
+    rows = layout.parse_rows(["a      4K    root", "b      8K    root", "c      4K    user"])
+
+    assert rows == [{'NAME': 'a', 'SIZE': 4096, 'USER': 'root'}, {'NAME': 'b', 'SIZE': 8192, 'USER': 'root'},
+                    {'NAME': 'c', 'SIZE': 4096, 'USER': 'user'}]
+    assert converted_sizes == ['4K', '8K']
+
+
+def test_column_layout_converts_columns_of_numbers_as_single_rows():
+    from moler.parser.column_layout import ColumnLayout
+    layout = ColumnLayout.from_header("  PID  %CPU STAT  VSZ CMD")
+    lines = ["    1   0.0 Ss     - init", "   10   1.5 S   1664 [kthread]", "  100    2. R      0 top"]
+
+    rows = layout.parse_rows(lines)
+
+    assert rows == [layout.parse(line) for line in lines]
+    assert [row['%CPU'] for row in rows] == [0.0, 1.5, 2.0]
+    assert [row['VSZ'] for row in rows] == ['-', 1664, 0]
+
+
+def test_convert_value_recognizes_numbers_without_exceptions():
+    from moler.parser.column_layout import convert_value
+    assert convert_value("-12") == -12
+    assert convert_value("0.5") == 0.5
+    assert convert_value(".5") == 0.5
+    assert convert_value("1e3") == "1e3"
+    assert convert_value("1.5e3") == 1500.0
+    assert convert_value("00:00:45") == "00:00:45"
+    assert convert_value("") == ""
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Testing dispatching of lines by LineRules.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import re
+
+import pytest
+
+
+def test_line_rule_takes_required_literal_from_regex():
+    from moler.parser.line_rules import LineRule
+    rule = LineRule(regex=r"(?P<PCKT>\d+)\s+packets captured", handler='_parse_packets')
+    assert rule.literal == "packets captured"
+    rule = LineRule(regex=r"(?P<GROUP>captured|dropped)", handler='_parse_packets', literal='packets')
+    assert rule.literal == "packets"
+
+
+def test_line_rules_call_handler_of_first_matching_rule_only(parser):
+    assert parser.rules.dispatch(parser, "5 packets captured") is True
+    assert parser.calls == [('_parse_packets', '5')]
+
+
+def test_line_rules_report_not_handled_line_without_exception(parser):
+    assert parser.rules.dispatch(parser, "nothing to parse here") is False
+    assert parser.calls == []
+
+
+def test_line_rules_check_next_rule_when_handler_rejects_line(parser):
+    parser.accept_header = False
+    assert parser.rules.dispatch(parser, "Header: x") is True
+    assert parser.calls == [('_parse_header', 'x'), ('_parse_any_line', None)]
+
+
+def test_line_rules_skip_rule_not_valid_for_state_of_parser(parser):
+    parser.active = False
+    assert parser.rules.dispatch(parser, "Header: x") is False
+    assert parser.calls == []
+
+
+def test_line_rules_need_handler_given_as_method_name():
+    from moler.parser.line_rules import LineRule, LineRules
+    from moler.exceptions import WrongUsage
+    with pytest.raises(WrongUsage):
+        LineRules([LineRule(regex=r"x", handler=lambda line, match: None)])
+
+
+# --------------------------- resources ---------------------------
+
+@pytest.fixture
+def parser():
+    from moler.parser.line_rules import LineRule, LineRules
+
+    class Parser(object):
+        rules = LineRules([
+            LineRule(regex=re.compile(r"(?P<PCKT>\d+)\s+packets captured"), handler='_parse_packets'),
+            LineRule(regex=r"Header:\s+(?P<VALUE>\S+)", handler='_parse_header', starts_with='Header',
+                     when=lambda parser: parser.active),
+            LineRule(handler='_parse_any_line', when=lambda parser: parser.active),
+        ])
+
+        def __init__(self):
+            self.calls = list()
+            self.active = True
+            self.accept_header = True
+
+        def _parse_packets(self, line, match):
+            self.calls.append(('_parse_packets', match.group("PCKT")))
+
+        def _parse_header(self, line, match):
+            self.calls.append(('_parse_header', match.group("VALUE")))
+            return self.accept_header
+
+        def _parse_any_line(self, line, match):
+            if line.startswith("Header"):
+                self.calls.append(('_parse_any_line', match))
+                return True
+            return False
+
+    return Parser()
@@ -153,13 +153,90 @@ def test_ThreadPoolExecutorRunner_logs_about_reused_executor():
     external_executor.shutdown()
 
 
+def test_EventDrivenRunner_returns_from_wait_for_as_soon_as_observer_is_done(connection_observer):
+    from moler.event_driven_runner import EventDrivenRunner
+    import datetime
+
+    with EventDrivenRunner() as runner:
+        connection_observer.runner = runner
+        connection_observer.start(timeout=5.0)
+        connection_observer.connection.data_received("ping: sendmsg: Network is unreachable",
+                                                     datetime.datetime.now())
+        runner.wait_for(connection_observer, connection_observer._future)
+        when_returned = time.time()
+        assert connection_observer.done()
+        assert when_returned - connection_observer.result() < 0.5
+        assert connection_observer._future.done()
+
+
+def test_EventDrivenRunner_times_out_observer_without_thread_per_observer():
+    from moler.event_driven_runner import EventDrivenRunner
+    import threading
+
+    with EventDrivenRunner() as runner:
+        observers = [NetworkDownDetector(connection=ThreadedMolerConnection(), runner=runner) for _ in range(10)]
+        threads_before = threading.active_count()
+        for observer in observers:
+            observer.start(timeout=0.3)
+        for observer in observers:
+            observer.life_status.terminating_timeout = 0.0
+        threads_started = threading.active_count() - threads_before
+        time.sleep(0.5)
+        for observer in observers:
+            assert observer.done()
+            assert observer.life_status.was_on_timeout_called
+            assert observer._future.done()
+    assert threads_started <= 10  # just observer threads of connections, no runner threads
+
+
+def test_EventDrivenRunner_tracks_shortening_timeout_of_observer(connection_observer):
+    from moler.event_driven_runner import EventDrivenRunner
+    from moler.exceptions import ConnectionObserverTimeout
+
+    with EventDrivenRunner() as runner:
+        connection_observer.runner = runner
+        connection_observer.start(timeout=10.0)
+        connection_observer.timeout = 0.2
+        start_time = time.time()
+        with pytest.raises(ConnectionObserverTimeout):
+            connection_observer.await_done()
+        assert time.time() - start_time < 1.0
+
+
+def test_EventDrivenRunner_calls_on_inactivity(connection_observer):
+    from moler.event_driven_runner import EventDrivenRunner
+
+    inactivity_calls = []
+    connection_observer.on_inactivity = lambda: inactivity_calls.append(time.time())
+    connection_observer.life_status.inactivity_timeout = 0.1
+    with EventDrivenRunner() as runner:
+        connection_observer.runner = runner
+        connection_observer.start(timeout=0.55)
+        time.sleep(0.5)
+    assert 3 <= len(inactivity_calls) <= 5
+
+
+def test_EventDrivenRunners_share_process_timer():
+    from moler.event_driven_runner import EventDrivenRunner
+    from moler.util.shared_timer import get_process_timer
+
+    with EventDrivenRunner() as runner1:
+        with EventDrivenRunner() as runner2:
+            assert runner1._timer is get_process_timer()
+            assert runner2._timer is runner1._timer
+    assert get_process_timer()._thread.is_alive()
+
+
 # --------------------------- resources ---------------------------
 
 
-@pytest.fixture()
-def observer_runner():
-    from moler.runner import ThreadPoolExecutorRunner
-    runner = ThreadPoolExecutorRunner()
+@pytest.fixture(params=['runner.ThreadPoolExecutorRunner', 'event_driven_runner.EventDrivenRunner'])
+def observer_runner(request):
+    import importlib
+    module_name, class_name = request.param.rsplit('.', 1)
+    module = importlib.import_module('moler.{}'.format(module_name))
+    runner_class = getattr(module, class_name)
+    runner = runner_class()
     return runner
 
 
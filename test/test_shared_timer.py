@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Testing SharedTimer
+"""
+
+__author__ = 'Grzegorz Latuszek, Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'grzegorz.latuszek@nokia.com, marcin.usielski@nokia.com'
+
+import time
+import pytest
+
+
+def test_timer_calls_callbacks_in_order_of_deadlines(shared_timer):
+    called = []
+    shared_timer.call_later(0.2, called.append, "second")
+    shared_timer.call_later(0.1, called.append, "first")
+    shared_timer.call_later(0.3, called.append, "third")
+    time.sleep(0.5)
+    assert called == ["first", "second", "third"]
+
+
+def test_timer_calls_callback_not_before_its_deadline(shared_timer):
+    called = []
+    start_time = time.time()
+    shared_timer.call_later(0.2, lambda: called.append(time.time()))
+    time.sleep(0.4)
+    assert len(called) == 1
+    assert called[0] - start_time >= 0.2
+
+
+def test_timer_doesnt_call_cancelled_callback(shared_timer):
+    called = []
+    handle = shared_timer.call_later(0.1, called.append, "cancelled")
+    shared_timer.call_later(0.1, called.append, "active")
+    handle.cancel()
+    time.sleep(0.3)
+    assert called == ["active"]
+    assert shared_timer.pending_count() == 0
+
+
+def test_timer_drops_cancelled_callbacks_before_their_deadlines(shared_timer):
+    handles = [shared_timer.call_later(3600, lambda: None) for _ in range(1000)]
+    active_handle = shared_timer.call_later(3600, lambda: None)
+    for handle in handles:
+        handle.cancel()
+        handle.cancel()
+    assert shared_timer.pending_count() == 1
+    assert len(shared_timer._heap) < 2 * shared_timer._min_cancelled_to_rebuild
+    assert active_handle.in_heap
+
+
+def test_exception_inside_callback_doesnt_break_timer(shared_timer):
+    called = []
+
+    def failing_callback():
+        raise Exception("Fail inside callback")
+
+    shared_timer.call_soon(failing_callback)
+    shared_timer.call_later(0.1, called.append, "after failure")
+    time.sleep(0.3)
+    assert called == ["after failure"]
+
+
+# --------------------------- resources ---------------------------
+
+
+@pytest.yield_fixture
+def shared_timer():
+    from moler.util.shared_timer import SharedTimer
+    timer = SharedTimer()
+    yield timer
+    timer.request_stop()
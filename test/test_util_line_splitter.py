@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for splitting data received on connection into lines.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import datetime
+
+
+def test_split_into_lines_strips_newline_chars():
+    from moler.util.line_splitter import split_into_lines
+
+    lines = split_into_lines("first\r\nsecond\nthird\rfour")
+    assert lines == (("first\r\n", "first", True), ("second\n", "second", True), ("third\r", "third", True),
+                     ("four", "four", False))
+
+
+def test_received_text_is_split_only_once_per_newline_chars():
+    from moler.util.line_splitter import ReceivedText, split_into_lines
+
+    data = ReceivedText("first\r\nsecond")
+    assert data == "first\r\nsecond"
+    lines = split_into_lines(data)
+    assert split_into_lines(data) is lines
+    lines_for_lf_only = split_into_lines(data, newline_chars=("\n",))
+    assert lines_for_lf_only is not lines
+    assert lines_for_lf_only == (("first\r\n", "first\r", True), ("second", "second", False))
+
+
+def test_split_into_lines_doesnt_precompute_lines_for_multi_char_newline():
+    from moler.util.line_splitter import ReceivedText, split_into_lines
+
+    lines = split_into_lines(ReceivedText("first\r\nsecond"), newline_chars=("\r\n",))
+    assert lines == (("first\r\n", None, None), ("second", None, None))
+
+
+def test_observers_with_different_newline_chars_get_proper_lines_from_shared_data(buffer_connection):
+    from moler.events.textualevent import TextualEvent
+    from moler.util.line_splitter import ReceivedText
+
+    class LinesCollector(TextualEvent):
+        def __init__(self, newline_chars):
+            super(LinesCollector, self).__init__(connection=buffer_connection.moler_connection)
+            self._newline_chars = newline_chars
+            self.lines = list()
+
+        def on_new_line(self, line, is_full_line):
+            self.lines.append((line, is_full_line))
+
+    default_collector = LinesCollector(newline_chars=("\n", "\r"))
+    lf_collector = LinesCollector(newline_chars=("\n",))
+    crlf_collector = LinesCollector(newline_chars=("\r\n",))
+    recv_time = datetime.datetime.now()
+    for chunk in ["fir", "st\r\nsec", "ond\n"]:
+        data = ReceivedText(chunk)
+        for collector in [default_collector, lf_collector, crlf_collector]:
+            collector.data_received(data, recv_time)
+
+    assert default_collector.lines == [("fir", False), ("first", True), ("sec", False), ("second", True)]
+    assert lf_collector.lines == [("fir", False), ("first\r", True), ("sec", False), ("second", True)]
+    assert crlf_collector.lines == [("fir", False), ("first", True), ("sec", False), ("second\n", False)]
@@ -119,3 +119,46 @@ def test_passing_extra_param_into_helper_logging_functions():
         fun_using_helper_logging()
 
     assert logged_record[0].transfer_direction == "<"
+
+
+def test_caller_code_location_lookup_can_be_switched_off_for_logger_and_its_children():
+    import logging
+    from moler.util import loghelper
+
+    connection_logger = logging.getLogger('moler.connection.device_1')
+    other_logger = logging.getLogger('moler.device_1')
+    logged_record = []
+
+    def log_record_receiver(logger, log_record):
+        logged_record.append(log_record)
+
+    with mock.patch.object(loghelper, "_caller_lookup_settings", dict()):
+        with mock.patch.object(loghelper, "_caller_lookup_of_logger", dict()):
+            loghelper.set_caller_lookup(logger_name='moler.connection', enabled=False)
+            with mock.patch.object(connection_logger.__class__, "handle", new=log_record_receiver):
+                loghelper.warning_into_logger(connection_logger, "no caller")
+                loghelper.warning_into_logger(other_logger, "with caller")
+
+    assert logged_record[0].funcName == "(unknown function)"
+    assert logged_record[0].lineno == 0
+    assert logged_record[1].funcName == "test_caller_code_location_lookup_can_be_switched_off_for_logger_and_its_children"
+
+
+def test_logging_into_mocked_logger_doesnt_hang_on_caller_lookup():
+    import logging
+    from moler.util import loghelper
+
+    mocked_logger = mock.MagicMock()
+    loghelper.log_into_logger(mocked_logger, level=logging.DEBUG, msg="into mock")
+
+    assert mocked_logger.handle.called
+
+
+def test_caller_lookup_caches_filenames_not_code_objects():
+    from moler.util import loghelper
+
+    with mock.patch.object(loghelper, "_normcase_filenames", dict()):
+        for nb in range(3):
+            code = compile("x = {}".format(nb), "generated_code.py", "exec")
+            loghelper._normcase_filename(code)
+        assert list(loghelper._normcase_filenames.keys()) == ["generated_code.py"]
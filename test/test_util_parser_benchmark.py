@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for benchmark of command/event parsers.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import json
+import os
+
+
+def test_parser_benchmark_measures_every_documented_output_of_class():
+    from moler.util.parser_benchmark import benchmark_parsers
+    import moler.cmd.unix.cat as cat_module
+
+    cmd_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "moler", "cmd")
+    benchmark = benchmark_parsers(path=cmd_path, repeat=2, classes=['Cat'])
+    documented_variants = [name[len('COMMAND_OUTPUT'):] for name in dir(cat_module) if
+                           name.startswith('COMMAND_OUTPUT')]
+    assert sorted(result['variant'] for result in benchmark['results']) == sorted(documented_variants)
+    assert benchmark['errors'] == []
+    for result in benchmark['results']:
+        assert result['class'] == 'moler.cmd.unix.cat.Cat'
+        assert result['lines'] > 0
+        assert result['lines_per_sec'] > 0
+    assert json.loads(json.dumps(benchmark)) == benchmark
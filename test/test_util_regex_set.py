@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for matching line against set of regular expressions.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+import re
+import pytest
+
+
+@pytest.mark.parametrize("pattern, literal", [
+    (r'Last login:\s+(\S+)', "Last login:"),
+    (r'^abc\d+defghi', "defghi"),
+    (r'host:.*#', "host:"),
+    (r'error|failure', None),  # alternation at top level - no literal is required
+    (r'(?i)error', None),  # case insensitive
+    (r'\d+', None),
+])
+def test_required_literal_of_pattern(pattern, literal):
+    from moler.util.regex_set import required_literal
+
+    assert required_literal(re.compile(pattern)) == literal
+
+
+def test_regex_set_finds_the_same_as_regular_expressions():
+    from moler.util.regex_set import RegexSet
+
+    patterns = [re.compile(pattern) for pattern in [r'Last login:\s+(\S+)', r'error|failure', r'(?i)LOGIN']]
+    regex_set = RegexSet(patterns)
+    lines = ["Last login: Thu", "Last login:", "no failure", "login", "nothing"]
+    for line in lines:
+        expected = [(index, pattern.search(line).group(0)) for index, pattern in enumerate(patterns)
+                    if pattern.search(line)]
+        assert [(index, match.group(0)) for index, match in regex_set.search_all(line)] == expected
+        first_index, first_match = regex_set.search_first(line)
+        if expected:
+            assert (first_index, first_match.group(0)) == expected[0]
+        else:
+            assert first_match is None
+    assert regex_set.search_first("no failure", patterns=patterns[2:]) == (None, None)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for registry of not raised exceptions.
+"""
+
+__author__ = 'Marcin Usielski'
+__copyright__ = 'Copyright (C) 2020, Nokia'
+__email__ = 'marcin.usielski@nokia.com'
+
+
+def test_unraised_exceptions_keeps_order_and_replaces_in_place_of_newest():
+    from moler.util.unraised_exceptions import UnraisedExceptions
+
+    registry = UnraisedExceptions(max_size=None)
+    exc1, exc2, exc3 = ValueError("1"), ValueError("2"), ValueError("3")
+    registry.add(exc1)
+    registry.add(exc2)
+    assert registry.replace(exc1, exc3) is True
+    assert exc1 not in registry
+    assert registry.get(remove=False) == [exc2, exc3]
+    assert registry.replace(exc1, exc1) is False
+    assert registry.remove(exc2) is True
+    assert registry.remove(exc2) is False
+    assert registry.get(remove=True) == [exc3, exc1]
+    assert len(registry) == 0
+
+
+def test_unraised_exceptions_equal_but_not_same_exception_is_not_in_registry():
+    from moler.util.unraised_exceptions import UnraisedExceptions
+
+    class EqualException(Exception):
+        def __eq__(self, other):
+            return True
+
+        __hash__ = Exception.__hash__
+
+    registry = UnraisedExceptions()
+    registry.add(EqualException())
+    assert EqualException() not in registry
+
+
+def test_unraised_exceptions_drops_oldest_over_max_size():
+    from moler.util.unraised_exceptions import UnraisedExceptions
+
+    registry = UnraisedExceptions(max_size=3)
+    exceptions = [ValueError(str(nr)) for nr in range(5)]
+    for exc in exceptions:
+        registry.add(exc)
+    assert registry.get(remove=False) == exceptions[2:]
+    assert registry.dropped == 2
+    assert "3 not raised exception(s), 2 dropped" in registry.summary()
+
+
+def test_unraised_exceptions_selected_by_connection_name():
+    from moler.util.unraised_exceptions import UnraisedExceptions
+
+    registry = UnraisedExceptions()
+    exc_a1, exc_b, exc_a2 = ValueError("a1"), ValueError("b"), ValueError("a2")
+    registry.add(exc_a1, connection_name="A")
+    registry.add(exc_b, connection_name="B")
+    registry.add(exc_a2, connection_name="A")
+    assert registry.get(remove=True, connection_name="A") == [exc_a1, exc_a2]
+    assert registry.get(remove=False, connection_name="A") == []
+    assert registry.get(remove=True) == [exc_b]